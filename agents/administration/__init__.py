@@ -1,5 +1,54 @@
 """Administration agent package."""
 
-from .agent import AdministrationAgent
+from __future__ import annotations
 
-__all__ = ["AdministrationAgent"]
+from typing import TYPE_CHECKING, Any
+
+# Declared here rather than in ``agent.py`` so routers can compile a matcher for
+# this agent and index it for semantic routing without importing its
+# implementation.
+KEYWORDS = frozenset(
+    {
+        "schedule",
+        "schedules",
+        "scheduled",
+        "scheduling",
+        "reschedule",
+        "rescheduled",
+        "rescheduling",
+        "meeting",
+        "meetings",
+        "appointment",
+        "appointments",
+        "remind",
+        "reminds",
+        "reminded",
+        "reminding",
+        "reminder",
+        "reminders",
+        "due date",
+        "due dates",
+        "deadline",
+        "deadlines",
+        "calendar",
+        "calendars",
+    }
+)
+
+DESCRIPTION = (
+    "Assists with appointments, reminders, and general admin logistics: booking, "
+    "arranging and moving visits and calls on the agenda so nothing is forgotten."
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .agent import AdministrationAgent
+
+__all__ = ["DESCRIPTION", "KEYWORDS", "AdministrationAgent"]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "AdministrationAgent":
+        from .agent import AdministrationAgent
+
+        return AdministrationAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
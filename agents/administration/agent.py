@@ -2,29 +2,20 @@
 
 from __future__ import annotations
 
-from core import AgentQuery, AgentResult, BaseAgent
+from core import AgentQuery, AgentResult, KeywordAgent
 
+from . import DESCRIPTION, KEYWORDS
 
-class AdministrationAgent(BaseAgent):
+
+class AdministrationAgent(KeywordAgent):
     """Assists with appointments, reminders, and general admin logistics."""
 
-    KEYWORDS = {
-        "schedule",
-        "meeting",
-        "appointment",
-        "remind",
-        "due date",
-        "deadline",
-        "calendar",
-    }
+    KEYWORDS = KEYWORDS
+    DESCRIPTION = DESCRIPTION
 
     def __init__(self) -> None:
         super().__init__(name="administration")
 
-    def can_handle(self, query: AgentQuery) -> bool:
-        lower = query.text.lower()
-        return any(keyword in lower for keyword in self.KEYWORDS)
-
     def handle(self, query: AgentQuery) -> AgentResult:
         response = (
             "It sounds like you have an administrative task. "
@@ -1,5 +1,19 @@
 """Croaked social deduction game package."""
 
-from .game import CroakedGame, CroakedOutcome
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .game import CroakedGame, CroakedOutcome
 
 __all__ = ["CroakedGame", "CroakedOutcome"]
+
+
+def __getattr__(name: str) -> Any:
+    # The game pulls in the OpenAI client, so it is only imported on demand.
+    if name in __all__:
+        from . import game
+
+        return getattr(game, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,9 +4,30 @@ from __future__ import annotations
 
 import random
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from core.llm import LanguageResponderError, OpenAIResponder
+from core.llm import (
+    CLIENT_POOL,
+    LanguageResponderError,
+    OpenAIResponder,
+    ResponseCacheMiss,
+)
+from core.llm_cache import ResponseCache
+from core.llm_prompt import Prompt, PromptLayout
+from core.llm_resilience import HedgePolicy
+
+
+# Receives transcript text as it is produced, including partial streamed lines.
+Echo = Callable[[str], None]
+
+# Counters in ``CroakedAgent.prompt_usage`` and ``CroakedGame.prompt_usage()``.
+PROMPT_USAGE_KEYS = (
+    "calls",
+    "input_tokens",
+    "prefix_tokens",
+    "cacheable_tokens",
+    "history_dropped",
+)
 
 
 @dataclass(slots=True)
@@ -30,6 +51,7 @@ class CroakedAgent:
         defensive_lines: Sequence[str],
         guilty_lines: Sequence[str],
         responder: Optional[OpenAIResponder] = None,
+        layout: Optional[PromptLayout] = None,
     ) -> None:
         self.name = name
         self.persona = persona
@@ -47,6 +69,30 @@ class CroakedAgent:
             "Did you catch how {target} dodged that detail? It's our leverage.",
         )
         self._last_whisper_round = 0
+        # Set by the game while this agent speaks so streamed text is echoed live.
+        self.live: Optional[_LiveLine] = None
+        self.layout = layout or PromptLayout(max_input_tokens=2000)
+        self.last_prompt: Optional[Prompt] = None
+        self.prompt_usage: Dict[str, int] = dict.fromkeys(PROMPT_USAGE_KEYS, 0)
+
+    def _generate(self, task: str) -> str:
+        if not self._responder:
+            raise LanguageResponderError("LLM responder not available.")
+        prompt = self._prompt(task)
+        if self.live is None:
+            return self._responder.generate(
+                system_prompt=prompt.system_prompt, user_prompt=prompt.user_prompt
+            )
+        stream = self._responder.generate_stream(
+            system_prompt=prompt.system_prompt, user_prompt=prompt.user_prompt
+        )
+        try:
+            for delta in stream:
+                self.live.write(delta)
+        except LanguageResponderError:
+            self.live.interrupt()
+            raise
+        return stream.text
 
     # ------------------------------------------------------------------ prompts
     def context_prompt(self, round_number: int) -> str:
@@ -72,12 +118,6 @@ class CroakedAgent:
         if len(self.memory) > 24:
             del self.memory[: len(self.memory) - 24]
 
-    def _history_snippet(self) -> str:
-        if not self.memory:
-            return "No meaningful conversation yet."
-        recent = self.memory[-10:]
-        return "\n".join(recent)
-
     def _system_prompt(self) -> str:
         alignment = (
             "You are secretly the murderer. Conceal your identity while bending suspicion toward others."
@@ -89,6 +129,43 @@ class CroakedAgent:
             f"{alignment} Speak vividly but concisely."
         )
 
+    def _rules(self) -> Tuple[str, ...]:
+        # Identical for every call this agent makes, so it belongs in the cached prefix.
+        if self.is_murderer:
+            answer = "Deflect suspicion gracefully without confessing."
+            whisper = "Guide the whisper to frame someone else subtly."
+        else:
+            answer = "Give a vivid, believable answer that reinforces your alibi."
+            whisper = "Conspire with your ally to expose the likely culprit."
+        return (
+            "Reply with one line of dialogue. Do not prefix it with your name and never mention being an AI.",
+            "Questions: one probing question (<= 25 words) that exposes contradictions through "
+            "sensory detail or emotional pressure. End with a question mark.",
+            f"Answers: a single dramatic sentence (<= 28 words). {answer}",
+            "Whispers: a secretive whisper (<= 20 words) that explicitly names the target and hints "
+            f"at a coordinated move. {whisper} Keep it tense and dramatic.",
+            "Accusations: one bold sentence (<= 22 words) that contains the exact phrase 'I accuse' "
+            "followed by the suspect's name. Do not confess even if you are guilty.",
+        )
+
+    def _prompt(self, task: str) -> Prompt:
+        """Assemble a prompt with the stable prefix first and ``task`` last."""
+
+        prompt = self.layout.build(
+            system=self._system_prompt(),
+            rules=self._rules(),
+            history=self.memory[-10:],
+            task=task,
+        )
+        self.last_prompt = prompt
+        usage = self.prompt_usage
+        usage["calls"] += 1
+        usage["input_tokens"] += prompt.input_tokens
+        usage["prefix_tokens"] += prompt.prefix_tokens
+        usage["cacheable_tokens"] += prompt.cacheable_tokens
+        usage["history_dropped"] += prompt.history_dropped
+        return prompt
+
     # ----------------------------------------------------------- interrogation
     def choose_target(
         self, roster: Iterable["CroakedAgent"], rng: random.Random
@@ -112,7 +189,12 @@ class CroakedAgent:
         """Generate a question directed at the chosen target."""
 
         if self._responder:
-            return self._llm_question(target, round_number)
+            try:
+                return self._llm_question(target, round_number)
+            except ResponseCacheMiss:
+                raise
+            except LanguageResponderError:
+                pass  # The call failed for good; speak scripted lines instead.
 
         line = rng.choice(self._inquisitive_lines)
         suspicion = self.suspicion.get(target.name, 0)
@@ -132,16 +214,9 @@ class CroakedAgent:
             raise LanguageResponderError("LLM responder not available.")
 
         suspicion = self.suspicion.get(target.name, 0)
-        prompt = (
-            f"Round {round_number}. You must interrogate {target.name}. "
-            f"Your suspicion score for them is {suspicion} on a scale where 4 means certain guilt.\n"
-            f"Recent transcript:\n{self._history_snippet()}\n\n"
-            "Compose a single probing question (<= 25 words) to expose contradictions. "
-            "Invoke sensory detail or emotional pressure. Do not prefix with your name. End with a question mark."
-        )
-        question = self._responder.generate(
-            system_prompt=self._system_prompt(),
-            user_prompt=prompt,
+        question = self._generate(
+            f"Round {round_number}. Interrogate {target.name} with a question. "
+            f"Your suspicion score for them is {suspicion} on a scale where 4 means certain guilt."
         )
         question = question.strip()
         if not question.endswith("?"):
@@ -155,9 +230,7 @@ class CroakedAgent:
         rng: random.Random,
     ) -> Optional["CroakedAgent"]:
         candidates = [
-            agent
-            for agent in roster
-            if agent.name not in {self.name, partner.name}
+            agent for agent in roster if agent.name not in {self.name, partner.name}
         ]
         if not candidates:
             return None
@@ -196,21 +269,9 @@ class CroakedAgent:
             template = rng.choice(self._whisper_templates)
             message = template.format(target=target_name)
         else:
-            stance = (
-                "You are the murderer. Guide the whisper to frame someone else subtly."
-                if self.is_murderer
-                else "You are innocent. Conspire with your ally to expose the likely culprit."
-            )
-            prompt = (
-                f"Round {round_number}. You lean toward {partner.name} and whisper. {stance}\n"
-                f"You want to set up {target_name} without drawing attention.\n"
-                f"Recent transcript:\n{self._history_snippet()}\n\n"
-                "Craft a secretive whisper (<= 20 words) that explicitly names {target_name} "
-                "and hints at a coordinated move. Keep it tense and dramatic."
-            )
-            message = self._responder.generate(
-                system_prompt=self._system_prompt(),
-                user_prompt=prompt.format(target_name=target_name),
+            message = self._generate(
+                f"Round {round_number}. Lean toward {partner.name} and whisper. "
+                f"Set up {target_name} without drawing attention."
             ).strip()
 
         if not message:
@@ -227,9 +288,15 @@ class CroakedAgent:
         """Formulate a response after being questioned."""
 
         if self._responder:
-            reply = self._llm_answer()
-            self.memory.append(reply)
-            return reply
+            try:
+                reply = self._llm_answer()
+            except ResponseCacheMiss:
+                raise
+            except LanguageResponderError:
+                pass
+            else:
+                self.memory.append(reply)
+                return reply
 
         source = self._guilty_lines if self.is_murderer else self._defensive_lines
         reply = rng.choice(source)
@@ -240,20 +307,7 @@ class CroakedAgent:
         if not self._responder:
             raise LanguageResponderError("LLM responder not available.")
 
-        stance = (
-            "You are the murderer. Deflect suspicion gracefully without confessing."
-            if self.is_murderer
-            else "You are innocent. Provide a vivid, believable answer reinforcing your alibi."
-        )
-        prompt = (
-            f"The latest question is directed at you. {stance}\n"
-            f"Recent transcript:\n{self._history_snippet()}\n\n"
-            "Respond in a single dramatic sentence (<= 28 words). Do not mention being an AI."
-        )
-        reply = self._responder.generate(
-            system_prompt=self._system_prompt(),
-            user_prompt=prompt,
-        )
+        reply = self._generate("The latest question is directed at you. Answer it.")
         return reply.strip()
 
     # ----------------------------------------------------------- suspicion math
@@ -316,16 +370,12 @@ class CroakedAgent:
         if not self._responder:
             return f"I accuse {suspect} of the murder!"
 
-        prompt = (
-            f"Round {round_number}. You are about to accuse {suspect}.\n"
-            f"Recent transcript:\n{self._history_snippet()}\n\n"
-            "Deliver one bold sentence (<= 22 words) that contains the exact phrase 'I accuse' followed by the suspect's name. "
-            "Do not confess even if you are guilty."
-        )
-        line = self._responder.generate(
-            system_prompt=self._system_prompt(),
-            user_prompt=prompt,
-        )
+        try:
+            line = self._generate(f"Round {round_number}. Accuse {suspect}.")
+        except ResponseCacheMiss:
+            raise
+        except LanguageResponderError:
+            return f"I accuse {suspect} of the murder!"
 
         cleaned = line.strip()
         if "I accuse" not in cleaned:
@@ -333,8 +383,37 @@ class CroakedAgent:
         return cleaned
 
 
+class _LiveLine:
+    """Forwards one speaker's streamed text to the game's echo."""
+
+    def __init__(self, echo: Echo) -> None:
+        self.echo = echo
+        self.streamed = False
+
+    def write(self, delta: str) -> None:
+        self.streamed = True
+        self.echo(delta)
+
+    def interrupt(self) -> None:
+        """Mark a stream that broke off, so the fallback line is echoed after it."""
+
+        if self.streamed:
+            self.echo(" [...] ")
+        self.streamed = False
+
+
 class CroakedGame:
-    """Coordinator that runs a full Croaked session and captures the transcript."""
+    """Coordinator that runs a full Croaked session and captures the transcript.
+
+    With ``echo`` set, every transcript line is passed to it as soon as it
+    exists. With ``stream`` as well, LLM lines are forwarded delta by delta
+    while they stream; the echoed text is then the model's raw output, while
+    the transcript keeps the cleaned-up line. Streamed calls are retried but
+    never hedged or coalesced, so streaming is opt-in.
+
+    A call that fails for good makes the speaker fall back to a scripted
+    line; only a replay-mode cache miss stops the game.
+    """
 
     def __init__(
         self,
@@ -342,12 +421,25 @@ class CroakedGame:
         seed: int | None = None,
         model: str = "gpt-5-mini",
         force_offline: bool = False,
+        cache: Optional[ResponseCache] = None,
+        echo: Optional[Echo] = None,
+        stream: bool = False,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
     ) -> None:
         self._rng = random.Random(seed)
+        self._echo = echo
+        self._stream = stream
         responder: Optional[OpenAIResponder] = None
         if not force_offline:
             try:
-                candidate = OpenAIResponder(model=model)
+                candidate = CLIENT_POOL.responder(
+                    model,
+                    cache=cache,
+                    hedge=HedgePolicy(),
+                    api_key=api_key,
+                    base_url=base_url,
+                )
                 if candidate.available:
                     responder = candidate
             except LanguageResponderError:
@@ -359,6 +451,7 @@ class CroakedGame:
                 "Set OPENAI_API_KEY or run with force_offline=True/--offline."
             )
 
+        self.responder = responder
         self.agents = self._bootstrap_agents(responder)
         self.murderer = self._rng.choice(self.agents)
         self.murderer.is_murderer = True
@@ -457,24 +550,26 @@ class CroakedGame:
 
         alive = list(self.agents)
         for round_number in range(1, max_rounds + 1):
-            self.transcript.append(f"--- Round {round_number} ---")
+            self._log(f"--- Round {round_number} ---")
 
             for agent in alive:
                 context = agent.context_prompt(round_number)
                 entry = f"[Context] {agent.name}: {context}"
-                self.transcript.append(entry)
+                self._log(entry)
                 for observer in alive:
                     observer.observe(entry)
 
             for agent in alive:
                 target = agent.choose_target(alive, self._rng)
-                question = agent.craft_question(target, self._rng, round_number)
+                question = self._say(
+                    agent, lambda: agent.craft_question(target, self._rng, round_number)
+                )
                 q_entry = f"{agent.name}: {question}"
                 self.transcript.append(q_entry)
                 for observer in alive:
                     observer.observe(q_entry)
 
-                answer = target.answer_question(self._rng)
+                answer = self._say(target, lambda: target.answer_question(self._rng))
                 a_entry = f"{target.name}: {answer}"
                 self.transcript.append(a_entry)
                 for observer in alive:
@@ -484,7 +579,9 @@ class CroakedGame:
 
                 suspect = agent.maybe_accuse(round_number)
                 if suspect:
-                    accusation = agent.llm_accusation(suspect, round_number)
+                    accusation = self._say(
+                        agent, lambda: agent.llm_accusation(suspect, round_number)
+                    )
                     acc_entry = f"{agent.name}: {accusation}"
                     self.transcript.append(acc_entry)
                     for observer in alive:
@@ -494,7 +591,7 @@ class CroakedGame:
                         return outcome
 
         # If the loop ends without a conclusive accusation, the murderer wins by attrition.
-        self.transcript.append(
+        self._log(
             "No decisive accusation was made. The murderer silently claims victory."
         )
         return CroakedOutcome(
@@ -504,11 +601,44 @@ class CroakedGame:
             transcript=tuple(self.transcript),
         )
 
+    def prompt_usage(self) -> Dict[str, int]:
+        """Return estimated prompt tokens summed over every agent's LLM calls."""
+
+        return {
+            key: sum(agent.prompt_usage[key] for agent in self.agents)
+            for key in PROMPT_USAGE_KEYS
+        }
+
+    def _log(self, entry: str) -> None:
+        self.transcript.append(entry)
+        if self._echo is not None:
+            self._echo(entry + "\n")
+
+    def _say(self, speaker: CroakedAgent, produce: Callable[[], str]) -> str:
+        """Run ``produce`` for ``speaker``, echoing the line, live if streaming."""
+
+        if self._echo is None:
+            return produce()
+        if not self._stream:
+            text = produce()
+            self._echo(f"{speaker.name}: {text}\n")
+            return text
+        self._echo(f"{speaker.name}: ")
+        live = speaker.live = _LiveLine(self._echo)
+        try:
+            text = produce()
+        finally:
+            speaker.live = None
+        if not live.streamed:
+            self._echo(text)
+        self._echo("\n")
+        return text
+
     def _resolve_accusation(self, accuser: str, accused: str) -> CroakedOutcome | None:
         """Resolve the accusation and determine whether the game ends."""
 
         if accused == self.murderer.name:
-            self.transcript.append(
+            self._log(
                 f"The room gasps—{accused} was the murderer all along. "
                 f"{accuser} saves the night."
             )
@@ -520,13 +650,13 @@ class CroakedGame:
             )
 
         self.failed_accusations += 1
-        self.transcript.append(
+        self._log(
             f"The accusation against {accused} fizzles. "
             f"False alarms so far: {self.failed_accusations}."
         )
 
         if self.failed_accusations >= 3:
-            self.transcript.append(
+            self._log(
                 "With the third failed accusation, dread sinks in—"
                 f"{self.murderer.name} eliminates the rest in the chaos."
             )
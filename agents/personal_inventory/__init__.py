@@ -1,5 +1,48 @@
 """Personal inventory assistant implementation."""
 
-from .agent import PersonalInventoryAgent
+from __future__ import annotations
 
-__all__ = ["PersonalInventoryAgent"]
+from typing import TYPE_CHECKING, Any
+
+# Declared here rather than in ``agent.py`` so routers can compile a matcher for
+# this agent and index it for semantic routing without importing its
+# implementation.
+KEYWORDS = frozenset(
+    {
+        "key",
+        "keys",
+        "keychain",
+        "keychains",
+        "keyring",
+        "keyrings",
+        "wallet",
+        "wallets",
+        "phone",
+        "phones",
+        "smartphone",
+        "smartphones",
+        "cellphone",
+        "cellphones",
+        "glasses",
+        "eyeglasses",
+        "sunglasses",
+    }
+)
+
+DESCRIPTION = (
+    "Suggests strategies to locate misplaced personal items: finding lost or "
+    "missing belongings by retracing where they were last left."
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .agent import PersonalInventoryAgent
+
+__all__ = ["DESCRIPTION", "KEYWORDS", "PersonalInventoryAgent"]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "PersonalInventoryAgent":
+        from .agent import PersonalInventoryAgent
+
+        return PersonalInventoryAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
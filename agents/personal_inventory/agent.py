@@ -2,21 +2,20 @@
 
 from __future__ import annotations
 
-from core import AgentQuery, AgentResult, BaseAgent
+from core import AgentQuery, AgentResult, KeywordAgent
 
+from . import DESCRIPTION, KEYWORDS
 
-class PersonalInventoryAgent(BaseAgent):
+
+class PersonalInventoryAgent(KeywordAgent):
     """Suggests strategies to locate misplaced personal items."""
 
-    KEYWORDS = {"key", "keys", "wallet", "phone", "glasses"}
+    KEYWORDS = KEYWORDS
+    DESCRIPTION = DESCRIPTION
 
     def __init__(self) -> None:
         super().__init__(name="personal_inventory")
 
-    def can_handle(self, query: AgentQuery) -> bool:
-        lower = query.text.lower()
-        return any(keyword in lower for keyword in self.KEYWORDS)
-
     def handle(self, query: AgentQuery) -> AgentResult:
         suggestions = [
             "Retrace your steps over the last few rooms visited.",
@@ -25,8 +24,7 @@ class PersonalInventoryAgent(BaseAgent):
             "Use Bluetooth trackers or smart-home routines if you have them configured.",
         ]
 
-        response = (
-            "Here are a few ideas to help locate your keys:\n"
-            + "\n".join(f"- {item}" for item in suggestions)
+        response = "Here are a few ideas to help locate your keys:\n" + "\n".join(
+            f"- {item}" for item in suggestions
         )
         return AgentResult(text=response)
@@ -1,5 +1,61 @@
 """Research agent package."""
 
-from .agent import ResearchAgent
+from __future__ import annotations
 
-__all__ = ["ResearchAgent"]
+from typing import TYPE_CHECKING, Any
+
+# Declared here rather than in ``agent.py`` so routers can compile a matcher for
+# this agent and index it for semantic routing without importing its
+# implementation.
+KEYWORDS = frozenset(
+    {
+        "research",
+        "researched",
+        "researcher",
+        "researchers",
+        "researches",
+        "researching",
+        "investigate",
+        "investigated",
+        "investigates",
+        "investigating",
+        "investigation",
+        "investigations",
+        "background",
+        "backgrounds",
+        "learn about",
+        "learning about",
+        "learned about",
+        "learnt about",
+        "study",
+        "studies",
+        "studied",
+        "studying",
+        "compare",
+        "compared",
+        "compares",
+        "comparing",
+        "comparison",
+        "comparisons",
+        "analysis",
+        "analyses",
+    }
+)
+
+DESCRIPTION = (
+    "Performs background research and information gathering: explaining topics, "
+    "how things work, their history and causes, with facts and sources."
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .agent import ResearchAgent
+
+__all__ = ["DESCRIPTION", "KEYWORDS", "ResearchAgent"]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "ResearchAgent":
+        from .agent import ResearchAgent
+
+        return ResearchAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,29 +2,20 @@
 
 from __future__ import annotations
 
-from core import AgentQuery, AgentResult, BaseAgent
+from core import AgentQuery, AgentResult, KeywordAgent
 
+from . import DESCRIPTION, KEYWORDS
 
-class ResearchAgent(BaseAgent):
+
+class ResearchAgent(KeywordAgent):
     """Performs background research and information gathering."""
 
-    KEYWORDS = {
-        "research",
-        "investigate",
-        "background",
-        "learn about",
-        "study",
-        "compare",
-        "analysis",
-    }
+    KEYWORDS = KEYWORDS
+    DESCRIPTION = DESCRIPTION
 
     def __init__(self) -> None:
         super().__init__(name="research")
 
-    def can_handle(self, query: AgentQuery) -> bool:
-        lower = query.text.lower()
-        return any(keyword in lower for keyword in self.KEYWORDS)
-
     def handle(self, query: AgentQuery) -> AgentResult:
         response = (
             "I'll gather relevant information, sources, and comparisons for your topic. "
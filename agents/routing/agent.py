@@ -2,33 +2,57 @@
 
 from __future__ import annotations
 
-from core import AgentQuery, AgentResult, RoutingAgent
+from typing import Any
 
-from agents.administration import AdministrationAgent
-from agents.personal_inventory import PersonalInventoryAgent
-from agents.research import ResearchAgent
+from core import RoutingAgent
+from core.lazy import resolve_target
+
+from agents import administration, personal_inventory, research
+
+# (name, import path, keyword spec) in routing priority order.
+SPECIALISTS = (
+    (
+        "personal_inventory",
+        "agents.personal_inventory.agent:PersonalInventoryAgent",
+        personal_inventory.KEYWORDS,
+        personal_inventory.DESCRIPTION,
+    ),
+    (
+        "administration",
+        "agents.administration.agent:AdministrationAgent",
+        administration.KEYWORDS,
+        administration.DESCRIPTION,
+    ),
+    (
+        "research",
+        "agents.research.agent:ResearchAgent",
+        research.KEYWORDS,
+        research.DESCRIPTION,
+    ),
+)
 
 
 class RoutingCoordinator(RoutingAgent):
-    """Routes the incoming query to one of the specialist agents."""
+    """Routes the incoming query to one of the specialist agents.
+
+    Specialists are registered lazily by default: their modules are imported
+    and the agents built the first time a query is routed to them. Pass
+    ``lazy=False`` to construct them up front. Other keyword options (``cache``
+    and friends) are forwarded to :class:`RoutingAgent`.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, *, lazy: bool = True, **options: Any) -> None:
         super().__init__(
             name="router",
-            agents=[
-                PersonalInventoryAgent(),
-                AdministrationAgent(),
-                ResearchAgent(),
-            ],
-        )
-
-    def handle(self, query: AgentQuery) -> AgentResult:
-        result = super().handle(query)
-        if result.routed_to is None:
+            agents=[],
             # Default to the research agent when no direct match is found.
-            research = self.registry["research"]
-            result = research.handle(query)
-            result.routed_to = research.name
-            result.debug.setdefault("router", self.name)
-            result.debug["fallback"] = True
-        return result
+            fallback="research",
+            **options,
+        )
+        for name, target, keywords, description in SPECIALISTS:
+            if lazy:
+                self.registry.register_lazy(
+                    name, target, keywords, description=description
+                )
+            else:
+                self.registry.register(resolve_target(target)())
@@ -0,0 +1 @@
+"""Benchmarks for the routing hot path."""
@@ -0,0 +1,120 @@
+"""Synthetic agents and query corpora for routing benchmarks."""
+
+from __future__ import annotations
+
+import random
+from typing import Iterator, List, Tuple
+
+from core import AgentQuery, AgentResult, KeywordAgent
+
+# Filler vocabulary chosen to avoid every built-in specialist keyword.
+FILLER = (
+    "please",
+    "could",
+    "you",
+    "tell",
+    "me",
+    "about",
+    "the",
+    "latest",
+    "quarterly",
+    "numbers",
+    "for",
+    "our",
+    "team",
+    "tomorrow",
+    "morning",
+    "quickly",
+    "draft",
+    "notes",
+    "on",
+    "project",
+)
+
+
+# Requests for the built-in specialists phrased without any of their keywords,
+# labelled with the agent that should answer. Small talk and general questions
+# belong to the research fallback. Used to calibrate the semantic threshold.
+PARAPHRASES: Tuple[Tuple[str, str], ...] = (
+    ("where did I leave my purse", "personal_inventory"),
+    ("I can't locate my car fob anywhere", "personal_inventory"),
+    ("help me track down my lost earbuds", "personal_inventory"),
+    ("my mobile has gone missing again", "personal_inventory"),
+    ("I lost my passport and need to find it", "personal_inventory"),
+    ("can't remember where I put my headphones", "personal_inventory"),
+    ("help me locate misplaced things", "personal_inventory"),
+    ("my watch disappeared from the nightstand", "personal_inventory"),
+    ("where could my umbrella have gone", "personal_inventory"),
+    ("book a slot with the dentist next week", "administration"),
+    ("set up a call with the landlord on Friday", "administration"),
+    ("I need some admin logistics sorted", "administration"),
+    ("put the quarterly review on my agenda", "administration"),
+    ("arrange a catch-up with Sam for Tuesday", "administration"),
+    ("move my doctor visit to Thursday afternoon", "administration"),
+    ("don't let me forget to renew the car insurance", "administration"),
+    ("book an appointmnt with the dentist", "administration"),
+    ("plan the logistics for the team offsite", "administration"),
+    ("what is the history of the printing press", "research"),
+    ("tell me how photosynthesis works", "research"),
+    ("gather information on electric car batteries", "research"),
+    ("explain the causes of inflation", "research"),
+    ("summarize what is known about black holes", "research"),
+    ("who invented the telephone", "research"),
+    ("give me an overview of renewable energy policy", "research"),
+    ("explain chess clocks", "research"),
+    ("what are the health effects of coffee", "research"),
+    ("find sources about medieval trade routes", "research"),
+    ("tell me a joke", "research"),
+    ("good morning", "research"),
+    ("thanks, that was great", "research"),
+    ("what is seven times eight", "research"),
+    ("translate hello into French", "research"),
+    ("write a short poem about the sea", "research"),
+)
+
+
+def synthetic_keyword(agent_index: int, keyword_index: int) -> str:
+    return f"zq{agent_index}x{keyword_index}"
+
+
+class SyntheticAgent(KeywordAgent):
+    """Keyword agent with generated vocabulary and a trivial response."""
+
+    def __init__(self, index: int, keywords_per_agent: int) -> None:
+        super().__init__(name=f"synthetic_{index}")
+        self.KEYWORDS = frozenset(
+            synthetic_keyword(index, keyword) for keyword in range(keywords_per_agent)
+        )
+
+    def handle(self, query: AgentQuery) -> AgentResult:
+        return AgentResult(text=self.name)
+
+
+def make_agents(count: int, keywords_per_agent: int = 8) -> List[SyntheticAgent]:
+    return [SyntheticAgent(index, keywords_per_agent) for index in range(count)]
+
+
+def generate_queries(
+    count: int,
+    *,
+    agents: int,
+    keywords_per_agent: int = 8,
+    hit_rate: float = 0.5,
+    words: int = 12,
+    seed: int = 0,
+) -> Iterator[AgentQuery]:
+    """Yield ``count`` queries lazily so corpora of any size fit in memory.
+
+    With probability ``hit_rate`` a query embeds one synthetic keyword from a
+    random agent; the rest only contain filler and end at the fallback.
+    """
+
+    rng = random.Random(seed)
+    for _ in range(count):
+        tokens = [rng.choice(FILLER) for _ in range(words)]
+        if agents and rng.random() < hit_rate:
+            keyword = synthetic_keyword(
+                rng.randrange(agents), rng.randrange(keywords_per_agent)
+            )
+            tokens[rng.randrange(words)] = keyword
+        yield AgentQuery(text=" ".join(tokens))
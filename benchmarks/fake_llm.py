@@ -0,0 +1,515 @@
+"""Local stand-in for the OpenAI Responses API, for offline tests and benchmarks.
+
+``FakeLLMServer`` serves ``POST /v1/responses`` (plain and streaming) and
+``GET /v1/models`` on a local port. Point a responder at it with
+``CLIENT_POOL.responder(model, api_key="fake", base_url=server.base_url)``, or
+set ``OPENAI_BASE_URL``, and the real client, connection pool, retries and
+stream parsing all run as they would against the network. Replies, latency
+and failures come from a :class:`FakeLLMBackend`.
+
+Run ``python -m benchmarks.fake_llm --games 8 --latency lognormal:0.2:0.6
+--error-rate 0.05`` to benchmark Croaked games against it, or ``--serve`` to
+keep it running for other processes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Union
+
+from core.llm_prompt import estimate_tokens
+from core.llm_resilience import LatencyWindow
+
+# A scripted step: reply with this text, or fail with this HTTP status.
+Step = Union[str, int]
+
+DEFAULT_REPLIES = (
+    "Where were you when the lights went out?",
+    "I was in the greenhouse, and the mud on my boots proves it.",
+    "Then why did the cellar door creak right after you left?",
+    "I accuse Bram of the murder, and his shaking hands agree with me.",
+)
+
+_WORD = re.compile(r"\S+\s*")
+
+
+@dataclass(frozen=True, slots=True)
+class Latency:
+    """Distribution of the delay before a reply starts, in seconds.
+
+    ``constant:a`` waits ``a``; ``uniform:a:b`` draws from ``[a, b]``;
+    ``exponential:a`` has mean ``a``; ``lognormal:a:b`` has median ``a`` and
+    shape ``b``, which gives the long tail real model APIs show.
+    """
+
+    kind: str = "constant"
+    a: float = 0.0
+    b: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.kind not in ("constant", "uniform", "exponential", "lognormal"):
+            raise ValueError(f"unknown latency distribution {self.kind!r}")
+        if self.a < 0 or self.b < 0:
+            raise ValueError("latency parameters must not be negative")
+
+    @classmethod
+    def parse(cls, spec: str) -> Latency:
+        kind, *params = spec.split(":")
+        values = [float(param) for param in params] + [0.0, 0.0]
+        return cls(kind, values[0], values[1])
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(self.a, max(self.a, self.b))
+        if self.kind == "exponential":
+            return rng.expovariate(1.0 / self.a) if self.a else 0.0
+        if self.kind == "lognormal":
+            return rng.lognormvariate(math.log(self.a), self.b) if self.a else 0.0
+        return self.a
+
+
+@dataclass(slots=True)
+class _Reply:
+    status: int
+    text: str
+    delay: float
+    fail_stream: bool = False
+
+
+@dataclass
+class FakeLLMBackend:
+    """Decides what the fake server answers.
+
+    ``script`` entries are used in order before anything else: a string is
+    the reply text and an int fails that request with the HTTP status. After
+    the script, ``reply(request)`` supplies the text (by default ``replies``
+    are cycled), and each request fails with probability ``error_rate``
+    (``error_status``, with a ``Retry-After`` of ``retry_after`` for 429 and
+    503). ``stream_failure_rate`` makes streams break off halfway with a
+    ``response.failed`` event. Every reply waits a ``latency`` sample, and
+    streamed deltas are ``delta_interval`` seconds apart; the delay quantiles
+    in :meth:`stats` cover the last ``delay_window`` of them. ``seed`` makes
+    the random choices repeatable.
+    """
+
+    latency: Latency = field(default_factory=Latency)
+    delta_interval: float = 0.0
+    replies: Sequence[str] = DEFAULT_REPLIES
+    reply: Optional[Callable[[Dict[str, Any]], str]] = None
+    script: Sequence[Step] = ()
+    error_rate: float = 0.0
+    error_status: int = 500
+    retry_after: float = 0.0
+    stream_failure_rate: float = 0.0
+    seed: Optional[int] = None
+    delay_window: int = 10_000
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.seed)
+        self._script: Iterator[Step] = iter(self.script)
+        self._replies = itertools.cycle(self.replies or DEFAULT_REPLIES)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.requests = 0
+        self.streams = 0
+        self.errors = 0
+        self.delays = LatencyWindow(self.delay_window)
+
+    def next_id(self) -> int:
+        with self._lock:
+            return next(self._ids)
+
+    def decide(self, request: Dict[str, Any]) -> _Reply:
+        with self._lock:
+            self.requests += 1
+            self.streams += bool(request.get("stream"))
+            delay = self.latency.sample(self._rng)
+            self.delays.record(delay)
+            step = next(self._script, None)
+            if step is None:
+                if self.error_rate and self._rng.random() < self.error_rate:
+                    step = self.error_status
+                else:
+                    step = self.reply(request) if self.reply else next(self._replies)
+            if isinstance(step, int):
+                self.errors += 1
+                return _Reply(step, "", delay)
+            fail = (
+                bool(self.stream_failure_rate)
+                and self._rng.random() < self.stream_failure_rate
+            )
+            return _Reply(200, step, delay, fail_stream=fail)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request, stream and error counts and recent injected delay quantiles."""
+
+        return {
+            "requests": self.requests,
+            "streams": self.streams,
+            "errors": self.errors,
+            "p50_delay_s": self.delays.quantile(0.5) or 0.0,
+            "p95_delay_s": self.delays.quantile(0.95) or 0.0,
+        }
+
+
+def response_body(
+    request: Dict[str, Any], text: str, response_id: int
+) -> Dict[str, Any]:
+    """Return a completed Responses API object carrying ``text``."""
+
+    messages = request.get("input") or ()
+    prompt = " ".join(
+        str(message.get("content", ""))
+        for message in messages
+        if isinstance(message, dict)
+    )
+    input_tokens = estimate_tokens(prompt)
+    output_tokens = estimate_tokens(text)
+    return {
+        "id": f"resp_fake_{response_id}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "status": "completed",
+        "model": request.get("model", "fake-model"),
+        "output": [
+            {
+                "id": f"msg_fake_{response_id}",
+                "type": "message",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        ],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": {
+            "input_tokens": input_tokens,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens": output_tokens,
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": input_tokens + output_tokens,
+        },
+    }
+
+
+def stream_events(
+    request: Dict[str, Any], text: str, response_id: int, *, fail: bool = False
+) -> Iterator[Dict[str, Any]]:
+    """Yield the Responses API stream events for a reply of ``text``."""
+
+    final = response_body(request, text, response_id)
+    started = dict(final, status="in_progress", output=[])
+    item_id = final["output"][0]["id"]
+    sequence = itertools.count()
+    yield {
+        "type": "response.created",
+        "sequence_number": next(sequence),
+        "response": started,
+    }
+    words = _WORD.findall(text)
+    for index, word in enumerate(words):
+        if fail and index == len(words) // 2:
+            failed = dict(
+                started,
+                status="failed",
+                error={"code": "server_error", "message": "Injected stream failure."},
+            )
+            yield {
+                "type": "response.failed",
+                "sequence_number": next(sequence),
+                "response": failed,
+            }
+            return
+        yield {
+            "type": "response.output_text.delta",
+            "sequence_number": next(sequence),
+            "item_id": item_id,
+            "output_index": 0,
+            "content_index": 0,
+            "delta": word,
+        }
+    yield {
+        "type": "response.output_text.done",
+        "sequence_number": next(sequence),
+        "item_id": item_id,
+        "output_index": 0,
+        "content_index": 0,
+        "text": text,
+    }
+    yield {
+        "type": "response.completed",
+        "sequence_number": next(sequence),
+        "response": final,
+    }
+
+
+class FakeLLMServer:
+    """Threaded local HTTP server speaking the subset of the OpenAI API we use."""
+
+    def __init__(
+        self,
+        backend: Optional[FakeLLMBackend] = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.backend = backend or FakeLLMBackend()
+        self._server = ThreadingHTTPServer((host, port), _handler(self.backend))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host = self._server.server_address[0]
+        if isinstance(host, bytes):
+            host = host.decode("ascii")
+        return f"http://{host}:{self._server.server_port}/v1"
+
+    def start(self) -> FakeLLMServer:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, name="fake-llm", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve on the calling thread until :meth:`close` or an interrupt."""
+
+        self._server.serve_forever()
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> FakeLLMServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _handler(backend: FakeLLMBackend) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        # HTTP/1.1 keeps connections alive, so client connection pooling is exercised too.
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            if self.path.rstrip("/") != "/v1/models":
+                self._send(404, _error("Not found.", "not_found"))
+                return
+            model = {
+                "id": "fake-model",
+                "object": "model",
+                "created": 0,
+                "owned_by": "fake",
+            }
+            self._send(200, {"object": "list", "data": [model]})
+
+        def do_POST(self) -> None:  # noqa: N802 - http.server naming
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(request, dict):
+                    raise ValueError("body must be a JSON object")
+            except ValueError as exc:
+                self._send(
+                    400, _error(f"Invalid request: {exc}", "invalid_request_error")
+                )
+                return
+            if self.path.rstrip("/") != "/v1/responses":
+                self._send(404, _error("Not found.", "not_found"))
+                return
+
+            reply = backend.decide(request)
+            time.sleep(reply.delay)
+            if reply.status != 200:
+                headers = {}
+                if reply.status in (429, 503):
+                    headers["Retry-After"] = f"{backend.retry_after:g}"
+                message = f"Injected failure with status {reply.status}."
+                self._send(reply.status, _error(message, "server_error"), headers)
+                return
+            response_id = backend.next_id()
+            if not request.get("stream"):
+                self._send(200, response_body(request, reply.text, response_id))
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            events = stream_events(
+                request, reply.text, response_id, fail=reply.fail_stream
+            )
+            for index, event in enumerate(events):
+                if (
+                    index
+                    and event["type"] == "response.output_text.delta"
+                    and backend.delta_interval
+                ):
+                    time.sleep(backend.delta_interval)
+                frame = f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+                self.wfile.write(frame.encode("utf-8"))
+                self.wfile.flush()
+
+        def _send(
+            self,
+            status: int,
+            payload: Dict[str, Any],
+            headers: Optional[Dict[str, str]] = None,
+        ) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            return
+
+    return Handler
+
+
+def _error(message: str, kind: str) -> Dict[str, Any]:
+    return {"error": {"message": message, "type": kind, "param": None, "code": kind}}
+
+
+def run_games(
+    backend: FakeLLMBackend, *, games: int = 4, rounds: int = 4, stream: bool = False
+) -> Dict[str, Any]:
+    """Play ``games`` LLM-backed Croaked games in parallel against a fake server.
+
+    Agents speak scripted lines when a call fails for good; a game that
+    still raises counts as failed instead of stopping the benchmark.
+    """
+
+    from agents.croaked import CroakedGame
+    from core.llm import LanguageResponderError
+
+    with FakeLLMServer(backend) as server:
+
+        def play(seed: int) -> CroakedGame:
+            return CroakedGame(
+                seed=seed,
+                model="fake-model",
+                api_key="fake",
+                base_url=server.base_url,
+                echo=(lambda text: None) if stream else None,
+                stream=stream,
+            )
+
+        def finish(game: CroakedGame) -> bool:
+            try:
+                game.play(max_rounds=rounds)
+            except LanguageResponderError:
+                return False
+            return True
+
+        played = [play(seed) for seed in range(games)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=games) as pool:
+            completed = sum(pool.map(finish, played))
+        elapsed = time.perf_counter() - started
+
+    responder = played[0].responder if played else None
+    calls = sum(game.prompt_usage()["calls"] for game in played)
+    return {
+        "games": games,
+        "failed_games": games - completed,
+        "wall_s": elapsed,
+        "llm_calls": calls,
+        "calls_per_s": calls / elapsed if elapsed else 0.0,
+        "backend": backend.stats(),
+        "responder": responder.stats() if responder else None,
+    }
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Fake OpenAI Responses API for offline runs."
+    )
+    parser.add_argument(
+        "--serve", action="store_true", help="Only serve until interrupted."
+    )
+    parser.add_argument(
+        "--port", type=int, default=8765, help="Port for --serve (default: 8765)."
+    )
+    parser.add_argument(
+        "--games", type=int, default=4, help="Croaked games to play in parallel."
+    )
+    parser.add_argument("--rounds", type=int, default=4)
+    parser.add_argument(
+        "--stream", action="store_true", help="Play games through the streaming path."
+    )
+    parser.add_argument(
+        "--latency",
+        type=Latency.parse,
+        default=Latency(),
+        help="e.g. constant:0.1, lognormal:0.2:0.6",
+    )
+    parser.add_argument(
+        "--delta-interval",
+        type=float,
+        default=0.0,
+        help="Seconds between stream deltas.",
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Probability a request fails."
+    )
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--stream-failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
+    backend = FakeLLMBackend(
+        latency=args.latency,
+        delta_interval=args.delta_interval,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        stream_failure_rate=args.stream_failure_rate,
+        seed=args.seed,
+    )
+    if args.serve:
+        server = FakeLLMServer(backend, port=args.port)
+        print(f"Serving fake Responses API at {server.base_url}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+        return 0
+
+    report = run_games(
+        backend, games=args.games, rounds=args.rounds, stream=args.stream
+    )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+"""Routing throughput benchmark with JSON baselines and regression checks.
+
+Run ``python -m benchmarks.routing --sizes 1000 100000 --agents 10 300`` to
+measure, ``--output baseline.json`` to save the results, and
+``--compare baseline.json`` to fail (exit code 1) on regressions.
+``--calibrate-semantic`` reports how well the semantic stage places the
+keyword-free paraphrases of :data:`benchmarks.corpus.PARAPHRASES` at a range
+of thresholds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import itertools
+import json
+import math
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from agents.routing import RoutingCoordinator
+from benchmarks.corpus import PARAPHRASES, generate_queries, make_agents
+from core import AgentQuery
+
+
+class LatencyHistogram:
+    """Log-scale histogram (about 2% resolution) with constant memory."""
+
+    RATIO = 1.02
+
+    def __init__(self) -> None:
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+
+    def observe(self, nanoseconds: int) -> None:
+        bucket = int(math.log(max(nanoseconds, 1), self.RATIO))
+        self._counts[bucket] = self._counts.get(bucket, 0) + 1
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Return the ``q`` quantile in microseconds."""
+
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bucket in sorted(self._counts):
+            seen += self._counts[bucket]
+            if seen >= rank:
+                return self.RATIO ** (bucket + 1) / 1000.0
+        return 0.0
+
+
+@dataclass(slots=True)
+class BenchmarkResult:
+    name: str
+    mode: str
+    queries: int
+    agents: int
+    hit_rate: float
+    seconds: float
+    throughput_qps: float
+    p50_us: float
+    p99_us: float
+    peak_memory_kb: int
+
+
+def build_router(agents: int, keywords_per_agent: int) -> RoutingCoordinator:
+    """Return a coordinator extended with ``agents`` synthetic specialists."""
+
+    coordinator = RoutingCoordinator(lazy=False)
+    for agent in make_agents(agents, keywords_per_agent):
+        coordinator.registry.register(agent)
+    return coordinator
+
+
+def run_case(
+    *,
+    queries: int,
+    agents: int,
+    hit_rate: float,
+    mode: str = "handle",
+    keywords_per_agent: int = 8,
+    batch_size: int = 1000,
+    trace_memory: bool = False,
+    seed: int = 0,
+) -> BenchmarkResult:
+    """Route one synthetic corpus and collect throughput and latency numbers.
+
+    Peak memory comes from ``tracemalloc`` when ``trace_memory`` is set (exact
+    but several times slower), otherwise from the process' max RSS.
+    """
+
+    router = build_router(agents, keywords_per_agent)
+    corpus = generate_queries(
+        queries,
+        agents=agents,
+        keywords_per_agent=keywords_per_agent,
+        hit_rate=hit_rate,
+        seed=seed,
+    )
+    latencies = LatencyHistogram()
+
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+    # Only time spent inside the router is counted, not corpus generation.
+    clock = time.perf_counter_ns
+    routing_ns = 0
+    if mode == "handle":
+        handle = router.handle
+        for query in corpus:
+            before = clock()
+            handle(query)
+            spent = clock() - before
+            routing_ns += spent
+            latencies.observe(spent)
+    elif mode == "handle_many":
+        while True:
+            batch = list(itertools.islice(corpus, batch_size))
+            if not batch:
+                break
+            before = clock()
+            router.handle_many(batch)
+            spent = clock() - before
+            routing_ns += spent
+            for _ in batch:
+                latencies.observe(spent // len(batch))
+    else:
+        raise ValueError(f"unknown mode {mode!r}")
+    elapsed = routing_ns / 1e9
+
+    if trace_memory:
+        peak_kb = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+    else:
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return BenchmarkResult(
+        name=f"{mode}-q{queries}-a{agents}-h{hit_rate:g}",
+        mode=mode,
+        queries=queries,
+        agents=agents,
+        hit_rate=hit_rate,
+        seconds=elapsed,
+        throughput_qps=queries / elapsed if elapsed else 0.0,
+        p50_us=latencies.quantile(0.5),
+        p99_us=latencies.quantile(0.99),
+        peak_memory_kb=peak_kb,
+    )
+
+
+def calibrate_semantic(thresholds: Iterable[float]) -> Dict[float, float]:
+    """Return the share of :data:`PARAPHRASES` routed correctly at each threshold."""
+
+    from core.semantic import SemanticRouter
+
+    queries = [AgentQuery(text=text) for text, _ in PARAPHRASES]
+    accuracy: Dict[float, float] = {}
+    for threshold in thresholds:
+        coordinator = RoutingCoordinator(semantic=SemanticRouter(threshold=threshold))
+        routed = [result.routed_to for result in coordinator.handle_many(queries)]
+        hits = sum(agent == label for agent, (_, label) in zip(routed, PARAPHRASES))
+        accuracy[threshold] = hits / len(PARAPHRASES)
+    return accuracy
+
+
+def compare(
+    results: Iterable[BenchmarkResult], baseline: Dict[str, dict], tolerance: float
+) -> List[str]:
+    """Return human-readable regressions against ``baseline``."""
+
+    regressions: List[str] = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if not previous:
+            continue
+        if result.throughput_qps < previous["throughput_qps"] * (1 - tolerance):
+            regressions.append(
+                f"{result.name}: throughput {result.throughput_qps:.0f} q/s "
+                f"< baseline {previous['throughput_qps']:.0f} q/s"
+            )
+        if result.p99_us > previous["p99_us"] * (1 + tolerance):
+            regressions.append(
+                f"{result.name}: p99 {result.p99_us:.1f} us > baseline {previous['p99_us']:.1f} us"
+            )
+    return regressions
+
+
+def load_baseline(path: Path) -> Dict[str, dict]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {entry["name"]: entry for entry in data.get("results", [])}
+
+
+def write_baseline(path: Path, results: Sequence[BenchmarkResult]) -> None:
+    payload = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": [asdict(result) for result in results],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark RoutingCoordinator throughput."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 100_000],
+        help="Corpus sizes (up to 10M).",
+    )
+    parser.add_argument(
+        "--agents",
+        type=int,
+        nargs="+",
+        default=[10, 300],
+        help="Synthetic agent counts.",
+    )
+    parser.add_argument(
+        "--hit-rates",
+        type=float,
+        nargs="+",
+        default=[0.8],
+        help="Fraction of queries with a keyword.",
+    )
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=("handle", "handle_many"),
+        default=["handle"],
+        help="Routing entry points to measure.",
+    )
+    parser.add_argument("--keywords-per-agent", type=int, default=8)
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Measure peak memory with tracemalloc.",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=None, help="Write results to this JSON baseline."
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        default=None,
+        help="Baseline JSON to check for regressions.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.15,
+        help="Allowed relative slowdown (default: 0.15).",
+    )
+    parser.add_argument(
+        "--calibrate-semantic",
+        action="store_true",
+        help="Print semantic routing accuracy on the paraphrase corpus per threshold.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
+    if args.calibrate_semantic:
+        thresholds = [step / 100 for step in range(0, 21)]
+        for threshold, share in calibrate_semantic(thresholds).items():
+            print(f"threshold {threshold:.2f}  accuracy {share:.0%}")
+        return 0
+    results: List[BenchmarkResult] = []
+    for mode, size, agents, hit_rate in itertools.product(
+        args.modes, args.sizes, args.agents, args.hit_rates
+    ):
+        result = run_case(
+            queries=size,
+            agents=agents,
+            hit_rate=hit_rate,
+            mode=mode,
+            keywords_per_agent=args.keywords_per_agent,
+            trace_memory=args.trace_memory,
+        )
+        results.append(result)
+        print(
+            f"{result.name:<36} {result.throughput_qps:>12,.0f} q/s  "
+            f"p50 {result.p50_us:>8.1f} us  p99 {result.p99_us:>8.1f} us  "
+            f"peak {result.peak_memory_kb:>8,} KiB"
+        )
+
+    if args.output:
+        write_baseline(args.output, results)
+
+    if args.compare:
+        regressions = compare(results, load_baseline(args.compare), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
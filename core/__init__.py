@@ -1,14 +1,31 @@
 """Core primitives for the Codex multi-agent sample."""
 
 from .contexts import AgentQuery, AgentResult
-from .base import BaseAgent
+from .admission import AdmissionPolicy, AgentLimit
+from .base import BaseAgent, KeywordAgent
+from .cache import RoutingCache, RoutingDecision
+from .intents import IntentSplitter
+from .lazy import LazyAgent
+from .metrics import RoutingMetrics
 from .registry import AgentRegistry
 from .router import RoutingAgent
+from .session import SessionAffinity
+from .speculative import SpeculationPolicy
 
 __all__ = [
+    "AdmissionPolicy",
+    "AgentLimit",
     "AgentQuery",
     "AgentResult",
     "BaseAgent",
+    "KeywordAgent",
+    "IntentSplitter",
     "AgentRegistry",
+    "LazyAgent",
     "RoutingAgent",
+    "RoutingCache",
+    "RoutingDecision",
+    "RoutingMetrics",
+    "SessionAffinity",
+    "SpeculationPolicy",
 ]
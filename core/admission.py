@@ -0,0 +1,262 @@
+"""Per-agent concurrency limits, request deadlines and load shedding."""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Optional
+
+from .contexts import AgentQuery
+
+if (
+    TYPE_CHECKING
+):  # pragma: no cover - asyncio is imported lazily to keep cold start cheap
+    import asyncio
+
+# Shedding reasons, also reported in ``debug["shed"]["reason"]``.
+QUEUE_FULL = "queue_full"
+DEADLINE = "deadline"
+
+
+@dataclass(slots=True)
+class AgentLimit:
+    """How many queries one agent may run at once and how many may wait."""
+
+    concurrency: int = 8
+    queue: int = 0
+
+    def __post_init__(self) -> None:
+        if self.concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if self.queue < 0:
+            raise ValueError("queue must not be negative")
+
+
+@dataclass(slots=True)
+class AdmissionPolicy:
+    """Opt-in admission control for a router's agents.
+
+    ``limits`` maps agent names to an :class:`AgentLimit`; other agents use
+    ``default`` (unlimited when None). A query's deadline comes from its
+    metadata: ``deadline`` as an absolute ``time.time()`` timestamp and/or
+    ``timeout`` in seconds from arrival, whichever is earlier. Queries that
+    find a full queue or run out of time are shed to ``shed_to`` (the router's
+    fallback when None), or rejected if that agent is unavailable too.
+    """
+
+    limits: Dict[str, AgentLimit] = field(default_factory=dict)
+    default: Optional[AgentLimit] = None
+    shed_to: Optional[str] = None
+    deadline_key: str = "deadline"
+    timeout_key: str = "timeout"
+
+
+class _Waiter:
+    __slots__ = ("granted", "_wake")
+
+    def __init__(self, wake: Callable[[], None]) -> None:
+        self.granted = False
+        self._wake = wake
+
+    def grant(self) -> None:
+        self.granted = True
+        self._wake()
+
+
+class _Gate:
+    """Counting semaphore with a bounded FIFO queue, usable from threads and loops."""
+
+    def __init__(self, limit: AgentLimit) -> None:
+        self.limit = limit
+        self.active = 0
+        self.shed = 0
+        self.waiters: Deque[_Waiter] = deque()
+        self.lock = threading.Lock()
+
+    def try_enter(self) -> bool:
+        with self.lock:
+            if self.active < self.limit.concurrency and not self.waiters:
+                self.active += 1
+                return True
+            return False
+
+    def enqueue(self, wake: Callable[[], None]) -> Optional[_Waiter]:
+        """Take a slot (returns None) or queue a waiter; raise if the queue is full."""
+
+        with self.lock:
+            if self.active < self.limit.concurrency and not self.waiters:
+                self.active += 1
+                return None
+            if len(self.waiters) >= self.limit.queue:
+                self.shed += 1
+                raise _Shed(QUEUE_FULL)
+            waiter = _Waiter(wake)
+            self.waiters.append(waiter)
+            return waiter
+
+    def abandon(self, waiter: _Waiter) -> bool:
+        """Withdraw ``waiter``; return True if it was granted a slot meanwhile."""
+
+        with self.lock:
+            if waiter.granted:
+                return True
+            self.waiters.remove(waiter)
+            self.shed += 1
+            return False
+
+    def leave(self) -> None:
+        with self.lock:
+            if self.waiters:
+                # Hand the slot straight to the oldest waiter; ``active`` is unchanged.
+                self.waiters.popleft().grant()
+            else:
+                self.active -= 1
+
+
+class _Shed(Exception):
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionControl:
+    """Applies an :class:`AdmissionPolicy` on behalf of one router."""
+
+    def __init__(self, policy: AdmissionPolicy) -> None:
+        self.policy = policy
+        self._gates: Dict[str, _Gate] = {}
+        self._lock = threading.Lock()
+
+    def deadline(self, query: AgentQuery) -> Optional[float]:
+        """Return the query's deadline on the ``time.monotonic()`` clock, if any."""
+
+        metadata = query.metadata
+        budgets = []
+        deadline = _seconds(metadata.get(self.policy.deadline_key))
+        if deadline is not None:
+            budgets.append(deadline - time.time())
+        timeout = _seconds(metadata.get(self.policy.timeout_key))
+        if timeout is not None:
+            budgets.append(timeout)
+        if not budgets:
+            return None
+        return time.monotonic() + min(budgets)
+
+    def acquire(self, agent: str, deadline: Optional[float]) -> Optional[str]:
+        """Wait for a slot on ``agent``; return None once admitted, else the shed reason."""
+
+        gate = self._gate(agent)
+        if gate is None:
+            return None
+        if deadline is not None and deadline <= time.monotonic():
+            return self._expired(gate)
+        event = threading.Event()
+        try:
+            waiter = gate.enqueue(event.set)
+        except _Shed as shed:
+            return shed.reason
+        if waiter is None:
+            return None
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+        event.wait(timeout)
+        return None if gate.abandon(waiter) else DEADLINE
+
+    async def aacquire(self, agent: str, deadline: Optional[float]) -> Optional[str]:
+        """Async variant of :meth:`acquire` that waits without blocking the loop."""
+
+        import asyncio
+
+        gate = self._gate(agent)
+        if gate is None:
+            return None
+        if deadline is not None and deadline <= time.monotonic():
+            return self._expired(gate)
+        loop = asyncio.get_running_loop()
+        ready: asyncio.Future[None] = loop.create_future()
+
+        def wake() -> None:
+            loop.call_soon_threadsafe(_resolve, ready)
+
+        try:
+            waiter = gate.enqueue(wake)
+        except _Shed as shed:
+            return shed.reason
+        if waiter is None:
+            return None
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+        try:
+            await asyncio.wait((ready,), timeout=timeout)
+        except BaseException:
+            if gate.abandon(waiter):
+                gate.leave()
+            raise
+        return None if gate.abandon(waiter) else DEADLINE
+
+    def try_acquire(self, agent: str) -> bool:
+        """Take a slot on ``agent`` only if one is free right now."""
+
+        gate = self._gate(agent)
+        return gate is None or gate.try_enter()
+
+    def release(self, agent: str) -> None:
+        gate = self._gate(agent)
+        if gate is not None:
+            gate.leave()
+
+    def record_shed(self, agent: str) -> None:
+        """Count a query shed after admission, e.g. for running past its deadline."""
+
+        gate = self._gate(agent)
+        if gate is not None:
+            with gate.lock:
+                gate.shed += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return active, waiting and shed counts for every limited agent seen so far."""
+
+        with self._lock:
+            gates = dict(self._gates)
+        return {
+            name: {
+                "active": gate.active,
+                "waiting": len(gate.waiters),
+                "shed": gate.shed,
+            }
+            for name, gate in gates.items()
+        }
+
+    def _gate(self, agent: str) -> Optional[_Gate]:
+        gate = self._gates.get(agent)
+        if gate is None:
+            limit = self.policy.limits.get(agent, self.policy.default)
+            if limit is None:
+                return None
+            with self._lock:
+                gate = self._gates.setdefault(agent, _Gate(limit))
+        return gate
+
+    @staticmethod
+    def _expired(gate: _Gate) -> str:
+        with gate.lock:
+            gate.shed += 1
+        return DEADLINE
+
+
+def _seconds(value: Any) -> Optional[float]:
+    """Parse a caller-supplied time budget; malformed values are ignored."""
+
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return None
+    return seconds if math.isfinite(seconds) else None
+
+
+def _resolve(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
@@ -0,0 +1,107 @@
+"""Lazily computed text views shared by every agent that inspects a query."""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    """Split casefolded ``text`` into word tokens, dropping punctuation."""
+
+    return tuple(_TOKEN_RE.findall(text.casefold()))
+
+
+# Keyword phrases come from a small, fixed vocabulary, so their tokens are memoised.
+_phrase_tokens = lru_cache(maxsize=4096)(tokenize)
+
+
+class QueryAnalysis:
+    """Normalised views of a query's text, each computed at most once.
+
+    Phrases are matched on whole tokens, so ``"key"`` matches "my key" and
+    "key," but not "monkey", and ``"due date"`` needs both words adjacent.
+    """
+
+    __slots__ = (
+        "text",
+        "_casefolded",
+        "_tokens",
+        "_token_set",
+        "_bigrams",
+        "_positions",
+    )
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._casefolded: Optional[str] = None
+        self._tokens: Optional[Tuple[str, ...]] = None
+        self._token_set: Optional[FrozenSet[str]] = None
+        self._bigrams: Optional[FrozenSet[Tuple[str, str]]] = None
+        self._positions: Dict[str, Tuple[int, ...]] = {}
+
+    @property
+    def casefolded(self) -> str:
+        if self._casefolded is None:
+            self._casefolded = self.text.casefold()
+        return self._casefolded
+
+    @property
+    def tokens(self) -> Tuple[str, ...]:
+        if self._tokens is None:
+            self._tokens = tuple(_TOKEN_RE.findall(self.casefolded))
+        return self._tokens
+
+    @property
+    def normalized(self) -> str:
+        """Tokens joined by single spaces; equal for texts that match alike."""
+
+        return " ".join(self.tokens)
+
+    @property
+    def token_set(self) -> FrozenSet[str]:
+        if self._token_set is None:
+            self._token_set = frozenset(self.tokens)
+        return self._token_set
+
+    @property
+    def bigrams(self) -> FrozenSet[Tuple[str, str]]:
+        if self._bigrams is None:
+            tokens = self.tokens
+            self._bigrams = frozenset(zip(tokens, tokens[1:]))
+        return self._bigrams
+
+    def phrase_positions(self, phrase: str) -> Tuple[int, ...]:
+        """Return the token offsets where ``phrase`` starts, cached per phrase."""
+
+        positions = self._positions.get(phrase)
+        if positions is None:
+            words = _phrase_tokens(phrase)
+            tokens = self.tokens
+            size = len(words)
+            if not words:
+                positions = ()
+            else:
+                positions = tuple(
+                    start
+                    for start in range(len(tokens) - size + 1)
+                    if tokens[start : start + size] == words
+                )
+            self._positions[phrase] = positions
+        return positions
+
+    def contains(self, phrase: str) -> bool:
+        """Return True if ``phrase`` occurs as a run of whole tokens."""
+
+        words = _phrase_tokens(phrase)
+        if len(words) == 1:
+            return words[0] in self.token_set
+        if len(words) == 2:
+            return (words[0], words[1]) in self.bigrams
+        return bool(words) and bool(self.phrase_positions(phrase))
+
+    def contains_any(self, phrases: Iterable[str]) -> bool:
+        return any(self.contains(phrase) for phrase in phrases)
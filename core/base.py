@@ -3,15 +3,25 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Final
+from concurrent.futures import Executor
+from typing import AbstractSet, ClassVar, Final, List, Optional, Sequence
 
 from .contexts import AgentQuery, AgentResult
 
 
 class BaseAgent(ABC):
-    """Common interface that all concrete agents must implement."""
+    """Common interface that all concrete agents must implement.
+
+    Subclasses only have to provide the synchronous methods. The async
+    counterparts default to adapters: ``acan_handle`` calls ``can_handle``
+    inline (matchers are expected to be cheap) and ``ahandle`` runs ``handle``
+    on ``executor`` so a blocking agent never stalls the event loop. Agents
+    backed by async clients should override ``ahandle`` directly.
+    """
 
     name: Final[str]
+    #: Thread pool used by the default ``ahandle``; ``None`` means the loop's default.
+    executor: ClassVar[Optional[Executor]] = None
 
     def __init__(self, name: str) -> None:
         self.name = name
@@ -23,3 +33,43 @@ class BaseAgent(ABC):
     @abstractmethod
     def handle(self, query: AgentQuery) -> AgentResult:
         """Produce a response for the query."""
+
+    def handle_many(self, queries: Sequence[AgentQuery]) -> List[AgentResult]:
+        """Produce responses for a batch of queries routed to this agent.
+
+        The default simply loops over :meth:`handle`; agents with a cheaper bulk
+        path (shared setup, batched model calls) should override it.
+        """
+
+        return [self.handle(query) for query in queries]
+
+    async def acan_handle(self, query: AgentQuery) -> bool:
+        """Async counterpart of :meth:`can_handle`."""
+
+        return self.can_handle(query)
+
+    async def ahandle(self, query: AgentQuery) -> AgentResult:
+        """Async counterpart of :meth:`handle`, run in a worker thread by default."""
+
+        import asyncio  # deferred: keeps ``import core`` cheap for short-lived routers
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.handle, query)
+
+
+class KeywordAgent(BaseAgent):
+    """Agent that matches a query when any of its ``KEYWORDS`` appear in it.
+
+    Keywords match whole tokens of the query (see
+    :class:`~core.analysis.QueryAnalysis`), so multi-word keywords need their
+    words adjacent and ``"key"`` does not match "monkey".
+
+    Registries compile the keywords of every ``KeywordAgent`` that keeps this
+    ``can_handle`` into a single matcher, so subclasses should only override it
+    when the keyword test is not enough.
+    """
+
+    KEYWORDS: AbstractSet[str] = frozenset()
+
+    def can_handle(self, query: AgentQuery) -> bool:
+        return query.analysis.contains_any(self.KEYWORDS)
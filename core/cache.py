@@ -0,0 +1,107 @@
+"""LRU cache of routing decisions keyed on normalised query text."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+from .contexts import AgentQuery
+
+
+@dataclass(frozen=True, slots=True)
+class RoutingDecision:
+    """Which agent a router picked for a query and how it got there.
+
+    ``via`` is None for a direct keyword match, otherwise the routing stage that
+    chose the agent (``"semantic"`` or ``"fallback"``).
+    """
+
+    agent: Optional[str]
+    via: Optional[str] = None
+
+    @property
+    def fallback(self) -> bool:
+        return self.via == "fallback"
+
+
+class RoutingCache:
+    """Bounded LRU map from query keys to :class:`RoutingDecision`.
+
+    Keys are the normalised query tokens plus the values of ``metadata_keys``,
+    so the cache is only correct for matchers that depend on nothing else. Every
+    lookup carries a ``stamp`` (the registry version and router settings); a
+    stamp change empties the cache, which is how registry mutations invalidate it.
+    """
+
+    def __init__(self, maxsize: int = 1024, metadata_keys: Iterable[str] = ()) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.metadata_keys: Tuple[str, ...] = tuple(metadata_keys)
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, RoutingDecision]" = OrderedDict()
+        self._stamp: Hashable = None
+        self._lock = threading.Lock()
+
+    def key(self, query: AgentQuery) -> Optional[Hashable]:
+        """Return the cache key for ``query``, or None if it cannot be cached."""
+
+        text = query.analysis.normalized
+        if not self.metadata_keys:
+            return text
+        values = tuple(query.metadata.get(name) for name in self.metadata_keys)
+        try:
+            hash(values)
+        except TypeError:
+            return None
+        return (text, values)
+
+    def get(
+        self, key: Optional[Hashable], stamp: Hashable
+    ) -> Optional[RoutingDecision]:
+        with self._lock:
+            if stamp != self._stamp:
+                self._entries.clear()
+                self._stamp = stamp
+            decision = self._entries.get(key) if key is not None else None
+            if decision is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return decision
+
+    def put(
+        self, key: Optional[Hashable], stamp: Hashable, decision: RoutingDecision
+    ) -> None:
+        if key is None:
+            return
+        with self._lock:
+            if stamp != self._stamp:
+                return
+            self._entries[key] = decision
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current occupancy."""
+
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
@@ -5,6 +5,8 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 
+from .analysis import QueryAnalysis
+
 
 @dataclass(slots=True)
 class AgentQuery:
@@ -12,6 +14,22 @@ class AgentQuery:
 
     text: str
     metadata: Dict[str, Any] = field(default_factory=dict)
+    _analysis: Optional[QueryAnalysis] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def analysis(self) -> QueryAnalysis:
+        """Shared normalised views of ``text`` (tokens, bigrams, phrase hits).
+
+        Computed on first access and reused by every agent that inspects the
+        query; rebuilt if ``text`` is reassigned.
+        """
+
+        analysis = self._analysis
+        if analysis is None or analysis.text is not self.text:
+            analysis = self._analysis = QueryAnalysis(self.text)
+        return analysis
 
 
 @dataclass(slots=True)
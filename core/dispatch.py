@@ -0,0 +1,163 @@
+"""Flattened dispatch tables for trees of nested routers."""
+
+from __future__ import annotations
+
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeGuard,
+)
+
+from .base import BaseAgent, KeywordAgent
+from .contexts import AgentQuery, AgentResult
+from .matcher import CompiledAgentMatcher, is_compilable
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .router import RoutingAgent
+
+
+class DispatchEntry(KeywordAgent):
+    """One leaf agent of a flattened router tree.
+
+    ``chain`` lists the nested routers between the top-level router and the
+    leaf. Results are annotated by each of them, innermost first, exactly as
+    nested dispatch would, and ``debug["path"]`` records the names walked.
+    """
+
+    def __init__(
+        self,
+        leaf: BaseAgent,
+        chain: Tuple[RoutingAgent, ...],
+        via: Optional[str] = None,
+    ) -> None:
+        self.path = tuple(router.name for router in chain) + (leaf.name,)
+        super().__init__(name="/".join(self.path))
+        self.leaf = leaf
+        self.chain = chain
+        self.via = via
+        self.KEYWORDS = leaf.KEYWORDS if is_compilable(leaf) else frozenset()  # type: ignore[attr-defined]
+
+    def handle(self, query: AgentQuery) -> AgentResult:
+        return self._annotate(self.leaf.handle(query))
+
+    def handle_many(self, queries: Sequence[AgentQuery]) -> List[AgentResult]:
+        return [self._annotate(result) for result in self.leaf.handle_many(queries)]
+
+    async def ahandle(self, query: AgentQuery) -> AgentResult:
+        return self._annotate(await self.leaf.ahandle(query))
+
+    def _annotate(self, result: AgentResult) -> AgentResult:
+        agents = self.chain[1:] + (self.leaf,)
+        via = self.via
+        for router, agent in zip(reversed(self.chain), reversed(agents)):
+            router._annotate(result, agent, via)
+            via = None
+        result.debug["path"] = list(self.path)
+        return result
+
+
+class _GuardedEntry(DispatchEntry):
+    """Entry for a leaf with its own ``can_handle``, evaluated in its slot."""
+
+    def can_handle(self, query: AgentQuery) -> bool:
+        return self.leaf.can_handle(query)
+
+    async def acan_handle(self, query: AgentQuery) -> bool:
+        return await self.leaf.acan_handle(query)
+
+
+class _TerminalEntry(DispatchEntry):
+    """A nested router's fallback: claims every query that reaches its slot."""
+
+    def can_handle(self, query: AgentQuery) -> bool:
+        return True
+
+
+# Router options that act inside ``RoutingAgent.handle``; flattening would skip them.
+_HANDLE_FEATURES = (
+    "semantic",
+    "speculation",
+    "admission",
+    "sessions",
+    "splitter",
+    "cache",
+    "metrics",
+)
+
+
+def is_flattenable(agent: BaseAgent) -> TypeGuard[RoutingAgent]:
+    """Return True for nested routers whose dispatch is fully table driven.
+
+    Routers using any of the options in ``_HANDLE_FEATURES`` keep their own
+    ``handle`` and stay in the table as opaque leaves.
+    """
+
+    from .router import RoutingAgent
+
+    return isinstance(agent, RoutingAgent) and not any(_features(agent))
+
+
+def _features(router: RoutingAgent) -> Tuple[bool, ...]:
+    return tuple(getattr(router, name) is not None for name in _HANDLE_FEATURES)
+
+
+def _flatten(
+    router: RoutingAgent,
+    chain: Tuple[RoutingAgent, ...],
+    entries: List[DispatchEntry],
+    routers: List[RoutingAgent],
+) -> bool:
+    """Append ``router``'s leaves to ``entries``; return True once a terminal is added."""
+
+    for child in router.registry.values():
+        if is_flattenable(child):
+            routers.append(child)
+            if _flatten(child, chain + (child,), entries, routers):
+                return True
+        elif is_compilable(child):
+            entries.append(DispatchEntry(child, chain))
+        else:
+            entries.append(_GuardedEntry(child, chain))
+
+    if chain and router.fallback is not None:
+        # Nothing after a nested router with a fallback is reachable.
+        entries.append(
+            _TerminalEntry(router.registry[router.fallback], chain, "fallback")
+        )
+        return True
+    return False
+
+
+def _stamp(routers: Sequence[RoutingAgent]) -> Hashable:
+    return tuple(
+        (router.registry.version, router.fallback, _features(router))
+        for router in routers
+    )
+
+
+class DispatchTable:
+    """Every leaf reachable through ``router``'s nested routers, in priority order.
+
+    Keyword leaves from all levels share one compiled matcher, so a query is
+    matched once however deep the tree is. The table is stale as soon as any
+    router it was built from changes its registry or dispatch options.
+    """
+
+    def __init__(self, router: RoutingAgent) -> None:
+        entries: List[DispatchEntry] = []
+        routers: List[RoutingAgent] = [router]
+        _flatten(router, (), entries, routers)
+        self.routers = tuple(routers)
+        self.stamp = _stamp(self.routers)
+        self.entries: Dict[str, DispatchEntry] = {
+            entry.name: entry for entry in entries
+        }
+        self.matcher = CompiledAgentMatcher(entries)
+
+    def is_current(self) -> bool:
+        return _stamp(self.routers) == self.stamp
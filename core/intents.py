@@ -0,0 +1,106 @@
+"""Splitting multi-intent queries into parts that can be routed separately."""
+
+from __future__ import annotations
+
+import re
+from typing import Callable, List, Optional, Pattern, Tuple
+
+from .base import BaseAgent
+from .contexts import AgentQuery
+
+_CONNECTIVE = r"(?:and then|and also|and|then|also|plus)\b\s+"
+_DEFAULT_BOUNDARY = rf"[.;!?]+\s+(?:{_CONNECTIVE})?|,?\s+\b{_CONNECTIVE}"
+
+
+class IntentSplitter:
+    """Splits a query at clause boundaries when the clauses want different agents.
+
+    The text is cut at sentence punctuation and coordinating words ("and",
+    "then", ...). Each clause is then matched on its own: a clause that some
+    agent claims starts a new part, and so does an unclaimed clause of at least
+    ``min_tokens`` words (it is left to the semantic stage or fallback). Shorter
+    unclaimed fragments are glued back onto their neighbour, and neighbouring
+    parts that go to the same agent are merged, so "compare apples and
+    oranges" stays in one piece. At most ``max_parts`` parts are produced.
+    """
+
+    def __init__(
+        self,
+        *,
+        boundary: str | Pattern[str] = _DEFAULT_BOUNDARY,
+        min_tokens: int = 3,
+        max_parts: int = 4,
+    ) -> None:
+        if max_parts < 1:
+            raise ValueError("max_parts must be at least 1")
+        self.boundary = (
+            re.compile(boundary, re.IGNORECASE)
+            if isinstance(boundary, str)
+            else boundary
+        )
+        self.min_tokens = min_tokens
+        self.max_parts = max_parts
+
+    def clauses(self, text: str) -> List[str]:
+        """Return the non-empty clauses of ``text`` with boundaries removed."""
+
+        return [text[start:end] for start, end in self._spans(text)]
+
+    def split(
+        self, query: AgentQuery, match: Callable[[AgentQuery], Optional[BaseAgent]]
+    ) -> List[AgentQuery]:
+        """Return the query's parts, or ``[query]`` if it carries a single intent.
+
+        A part spans its clauses in the original text, so the words that
+        joined merged clauses are kept.
+        """
+
+        text = query.text
+        spans = self._spans(text)
+        if len(spans) < 2:
+            return [query]
+
+        # (start, end, agent the part goes to; None = semantic/fallback)
+        parts: List[Tuple[int, int, Optional[BaseAgent]]] = []
+        pending: Optional[int] = None
+        for start, end in spans:
+            part = AgentQuery(text=text[start:end], metadata=query.metadata)
+            agent = match(part)
+            if agent is None and len(part.analysis.tokens) < self.min_tokens:
+                if parts:
+                    parts[-1] = (parts[-1][0], end, parts[-1][2])
+                elif pending is None:
+                    pending = start
+                continue
+            if parts and parts[-1][2] is agent:
+                parts[-1] = (parts[-1][0], end, agent)
+                continue
+            parts.append((start if pending is None else pending, end, agent))
+            pending = None
+
+        if len(parts) < 2:
+            return [query]
+        if len(parts) > self.max_parts:
+            # Keep the first parts separate and fold the tail into the last one.
+            last = parts[self.max_parts - 1]
+            parts = parts[: self.max_parts - 1] + [(last[0], parts[-1][1], last[2])]
+        return [
+            AgentQuery(text=text[start:end], metadata=dict(query.metadata))
+            for start, end, _ in parts
+        ]
+
+    def _spans(self, text: str) -> List[Tuple[int, int]]:
+        """Return ``(start, end)`` offsets of the stripped, non-empty clauses."""
+
+        cuts = [(found.start(), found.end()) for found in self.boundary.finditer(text)]
+        cuts.append((len(text), len(text)))
+        spans: List[Tuple[int, int]] = []
+        start = 0
+        for end, after in cuts:
+            clause = text[start:end]
+            stripped = clause.strip()
+            if stripped:
+                offset = start + len(clause) - len(clause.lstrip())
+                spans.append((offset, offset + len(stripped)))
+            start = after
+        return spans
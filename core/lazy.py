@@ -0,0 +1,99 @@
+"""Deferred agents that are imported and constructed on first use."""
+
+from __future__ import annotations
+
+import importlib
+import sys
+import threading
+from typing import Callable, Iterable, List, Optional, Sequence, Union
+
+from .base import BaseAgent, KeywordAgent
+from .contexts import AgentQuery, AgentResult
+
+AgentFactory = Callable[[], BaseAgent]
+
+
+def resolve_target(target: str) -> AgentFactory:
+    """Import ``"package.module:attribute"`` and return the attribute."""
+
+    module_name, _, attribute = target.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(
+            f"Lazy agent target must look like 'module:attribute', got {target!r}"
+        )
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class LazyAgent(KeywordAgent):
+    """Stand-in that matches on a keyword spec and loads the real agent lazily.
+
+    ``target`` is either an import path (``"agents.research.agent:ResearchAgent"``)
+    or a zero-argument factory. Matching always uses ``keywords`` so the
+    registry can compile it without importing anything; the real agent is only
+    imported and built the first time a query is dispatched to it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        target: Union[str, AgentFactory],
+        keywords: Iterable[str] = (),
+        *,
+        description: Optional[str] = None,
+    ) -> None:
+        super().__init__(name=name)
+        self.KEYWORDS = frozenset(keywords)
+        self.DESCRIPTION = description
+        self._target = target
+        self._agent: Optional[BaseAgent] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._agent is not None
+
+    @property
+    def agent(self) -> BaseAgent:
+        """Return the real agent, importing and constructing it if needed."""
+
+        agent = self._agent
+        if agent is None:
+            with self._lock:
+                agent = self._agent
+                if agent is None:
+                    factory = (
+                        resolve_target(self._target)
+                        if isinstance(self._target, str)
+                        else self._target
+                    )
+                    agent = factory()
+                    if agent.name != self.name:
+                        raise ValueError(
+                            f"Lazy agent {self.name!r} loaded an agent named {agent.name!r}."
+                        )
+                    self._agent = agent
+        return agent
+
+    def reloaded(self) -> LazyAgent:
+        """Return an unloaded copy whose target module is re-imported on first use.
+
+        String targets whose module is already imported are reloaded here, so
+        the copy builds the agent from the current source.
+        """
+
+        if isinstance(self._target, str):
+            module = sys.modules.get(self._target.partition(":")[0])
+            if module is not None:
+                importlib.reload(module)
+        return LazyAgent(
+            self.name, self._target, self.KEYWORDS, description=self.DESCRIPTION
+        )
+
+    def handle(self, query: AgentQuery) -> AgentResult:
+        return self.agent.handle(query)
+
+    def handle_many(self, queries: Sequence[AgentQuery]) -> List[AgentResult]:
+        return self.agent.handle_many(queries)
+
+    async def ahandle(self, query: AgentQuery) -> AgentResult:
+        return await self.agent.ahandle(query)
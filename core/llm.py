@@ -2,20 +2,74 @@
 
 from __future__ import annotations
 
+import atexit
 import os
-from dataclasses import dataclass
-from typing import Optional
+import threading
+import time
+import weakref
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 from dotenv import load_dotenv
 
+from .llm_cache import ResponseCache
+from .llm_resilience import (
+    CLOSED,
+    NO_RETRY,
+    CircuitBreaker,
+    HedgePolicy,
+    LatencyWindow,
+    RetryPolicy,
+    is_transient,
+    retry_after,
+)
+
 load_dotenv()
 
+if (
+    TYPE_CHECKING
+):  # pragma: no cover - asyncio is imported lazily to keep cold start cheap
+    import asyncio
+
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+    httpx: Any  # httpx, or the httpx2 fork on SDKs built on it
+else:
+    try:  # pragma: no cover - exercised indirectly
+        from openai import (
+            AsyncOpenAI,
+            DefaultAsyncHttpxClient,
+            DefaultHttpxClient,
+            OpenAI,
+        )
+
+        try:
+            import httpx
+        except ImportError:  # newer SDKs build on the httpx2 fork instead
+            import httpx2 as httpx
+    except ImportError:  # pragma: no cover - handled via availability flag
+        httpx = DefaultHttpxClient = DefaultAsyncHttpxClient = OpenAI = AsyncOpenAI = (
+            None
+        )
+
 try:  # pragma: no cover - exercised indirectly
-    from openai import OpenAI  # type: ignore
-    from openai import APIStatusError, InternalServerError  # type: ignore
+    from openai import APIConnectionError
+
+    _CONNECTION_ERRORS: Tuple[type, ...] = (APIConnectionError,)
 except ImportError:  # pragma: no cover - handled via availability flag
-    OpenAI = None
-    APIStatusError = InternalServerError = Exception
+    _CONNECTION_ERRORS = ()
 
 
 HARD_TOKEN_LIMIT = 200_000
@@ -25,34 +79,706 @@ class LanguageResponderError(RuntimeError):
     """Raised when the language model cannot produce a response."""
 
 
+class ResponseCacheMiss(LanguageResponderError):
+    """Raised in replay mode when a prompt has no recorded response."""
+
+
+class CircuitOpenError(LanguageResponderError):
+    """Raised without calling the API while the backend's circuit breaker is open."""
+
+
+# (api_key, base_url) identifying one pooled client.
+ClientKey = Tuple[str, Optional[str]]
+
+
+class ClientPool:
+    """Process-wide cache of OpenAI clients and responders.
+
+    One client is kept per API key and base URL. It owns an HTTP connection
+    pool of up to ``max_connections`` sockets, of which ``max_keepalive`` idle
+    ones are kept open for ``keepalive_expiry`` seconds, so games, agents and
+    routers reuse TLS connections instead of each building their own client.
+    Responders are cached per model and settings on top of those clients.
+    Async clients are pooled the same way, separately for each event loop,
+    since their connections belong to the loop that opened them. Pooled
+    clients do not retry on their own; responders retry through their
+    :class:`~core.llm_resilience.RetryPolicy`, and every responder of one
+    backend shares that backend's :class:`~core.llm_resilience.CircuitBreaker`.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 100,
+        max_keepalive: int = 20,
+        keepalive_expiry: float = 30.0,
+    ) -> None:
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.keepalive_expiry = keepalive_expiry
+        self._clients: Dict[ClientKey, Any] = {}
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[ClientKey, Any]]" = weakref.WeakKeyDictionary()
+        self._responders: Dict[Tuple[Any, ...], OpenAIResponder] = {}
+        self._breakers: Dict[Optional[ClientKey], CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        *,
+        max_connections: Optional[int] = None,
+        max_keepalive: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+    ) -> None:
+        """Change connection limits; clients already created keep their pools."""
+
+        with self._lock:
+            if max_connections is not None:
+                self.max_connections = max_connections
+            if max_keepalive is not None:
+                self.max_keepalive = max_keepalive
+            if keepalive_expiry is not None:
+                self.keepalive_expiry = keepalive_expiry
+
+    @staticmethod
+    def credentials(
+        api_key: Optional[str] = None, base_url: Optional[str] = None
+    ) -> Optional[ClientKey]:
+        """Resolve credentials from arguments or the environment; None if unset."""
+
+        key = api_key or os.getenv("OPENAI_API_KEY")
+        if not key:
+            return None
+        return key, base_url or os.getenv("OPENAI_BASE_URL") or None
+
+    def client(
+        self, api_key: Optional[str] = None, base_url: Optional[str] = None
+    ) -> Optional[Any]:
+        """Return the shared client for these credentials, or None if unavailable."""
+
+        credentials = self.credentials(api_key, base_url)
+        if OpenAI is None or credentials is None:
+            return None
+        client = self._clients.get(credentials)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(credentials)
+            if client is None:
+                client = self._clients[credentials] = self._build(
+                    OpenAI, DefaultHttpxClient, credentials
+                )
+        return client
+
+    def async_client(
+        self, api_key: Optional[str] = None, base_url: Optional[str] = None
+    ) -> Optional[Any]:
+        """Return the shared async client for the running event loop, or None."""
+
+        import asyncio
+
+        credentials = self.credentials(api_key, base_url)
+        if AsyncOpenAI is None or credentials is None:
+            return None
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async_clients.get(loop)
+            if clients is None:
+                clients = self._async_clients[loop] = {}
+            client = clients.get(credentials)
+            if client is None:
+                client = clients[credentials] = self._build(
+                    AsyncOpenAI, DefaultAsyncHttpxClient, credentials
+                )
+        return client
+
+    def _build(self, client_type: Any, http_type: Any, credentials: ClientKey) -> Any:
+        try:
+            return client_type(
+                api_key=credentials[0],
+                base_url=credentials[1],
+                max_retries=0,
+                http_client=http_type(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_keepalive,
+                        keepalive_expiry=self.keepalive_expiry,
+                    )
+                ),
+            )
+        except Exception as exc:  # pragma: no cover - defensive
+            raise LanguageResponderError(str(exc)) from exc
+
+    def breaker(
+        self, api_key: Optional[str] = None, base_url: Optional[str] = None
+    ) -> CircuitBreaker:
+        """Return the circuit breaker shared by every responder of this backend."""
+
+        credentials = self.credentials(api_key, base_url)
+        with self._lock:
+            breaker = self._breakers.get(credentials)
+            if breaker is None:
+                breaker = self._breakers[credentials] = CircuitBreaker()
+        return breaker
+
+    def responder(
+        self,
+        model: str,
+        *,
+        max_output_tokens: int = 2048,
+        temperature: Optional[float] = None,
+        max_concurrency: int = 16,
+        cache: Optional[ResponseCache] = None,
+        retry: Optional[RetryPolicy] = None,
+        hedge: Optional[HedgePolicy] = None,
+        coalesce: bool = True,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+    ) -> OpenAIResponder:
+        """Return the shared responder for ``model`` and these settings.
+
+        ``retry`` defaults to a plain :class:`RetryPolicy`; pass
+        :data:`~core.llm_resilience.NO_RETRY` to try each call only once.
+        """
+
+        if retry is None:
+            retry = RetryPolicy()
+        credentials = self.credentials(api_key, base_url)
+        key = (
+            model,
+            max_output_tokens,
+            temperature,
+            max_concurrency,
+            cache,
+            retry,
+            hedge,
+            coalesce,
+            credentials,
+        )
+        responder = self._responders.get(key)
+        if responder is None:
+            breaker = self.breaker(api_key, base_url)
+            with self._lock:
+                responder = self._responders.get(key)
+                if responder is None:
+                    responder = self._responders[key] = OpenAIResponder(
+                        model=model,
+                        max_output_tokens=max_output_tokens,
+                        temperature=temperature,
+                        max_concurrency=max_concurrency,
+                        cache=cache,
+                        retry=retry,
+                        hedge=hedge,
+                        coalesce=coalesce,
+                        breaker=breaker,
+                        api_key=api_key,
+                        base_url=base_url,
+                        _pool=self,
+                    )
+        return responder
+
+    def prewarm(
+        self,
+        models: Iterable[str] = (),
+        *,
+        connect: bool = False,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+    ) -> None:
+        """Build the client and responders ahead of traffic.
+
+        With ``connect=True`` a cheap ``models.list`` request also opens (and
+        keeps alive) the first TLS connection.
+        """
+
+        client = self.client(api_key, base_url)
+        for model in models:
+            self.responder(model, api_key=api_key, base_url=base_url)
+        if connect and client is not None:
+            try:
+                client.models.list()
+            except Exception as exc:
+                raise LanguageResponderError(str(exc)) from exc
+
+    def close(self) -> None:
+        """Close every pooled sync client and cached responder, then forget them.
+
+        Async clients are dropped too; use :meth:`aclose` from their loop to
+        close their connections cleanly. Responders already handed out stay
+        usable: they look their client up in the pool on every call, so the
+        next one builds a fresh client.
+        """
+
+        with self._lock:
+            clients = list(self._clients.values())
+            responders = list(self._responders.values())
+            self._clients.clear()
+            self._async_clients.clear()
+            self._responders.clear()
+            self._breakers.clear()
+        for responder in responders:
+            responder.close()
+        for client in clients:
+            client.close()
+
+    async def aclose(self) -> None:
+        """Close the async clients that belong to the running event loop."""
+
+        import asyncio
+
+        with self._lock:
+            clients: List[Any] = list(
+                self._async_clients.pop(asyncio.get_running_loop(), {}).values()
+            )
+        for client in clients:
+            await client.close()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+CLIENT_POOL = ClientPool()
+atexit.register(CLIENT_POOL.close)
+
+
 @dataclass(slots=True)
 class OpenAIResponder:
-    """Thin wrapper around OpenAI's Responses API."""
+    """Thin wrapper around OpenAI's Responses API.
+
+    Without an explicit ``_client`` the responder borrows the shared client
+    for ``api_key`` and ``base_url`` (or the environment's) from
+    :data:`CLIENT_POOL`, looking it up on each call; prefer ``CLIENT_POOL.responder(model)`` to also
+    share the responder itself. :meth:`agenerate` uses the pool's async client
+    for the running loop and lets at most ``max_concurrency`` requests per loop
+    be in flight. An optional :class:`~core.llm_cache.ResponseCache` serves
+    repeated prompts from disk; in replay mode the responder works without an
+    API key and raises :class:`ResponseCacheMiss` for unrecorded prompts.
+
+    Transient failures (connection errors, timeouts, 408/409/429 and 5xx) are
+    retried according to ``retry``. With ``hedge`` set, a call slower than the
+    observed latency quantile gets a duplicate and the first answer wins. A
+    ``breaker`` that has seen the backend fail repeatedly makes calls raise
+    :class:`CircuitOpenError` straight away; only transient failures count
+    against it, while any other answer, errors included, shows the backend is
+    up. Retries and hedges all count against ``max_concurrency``.
+
+    With ``coalesce`` (the default), concurrent identical requests, meaning
+    the same model, prompts, temperature and token limit, share one upstream
+    call. Every caller gets its text or its error. Sync callers are coalesced
+    across threads, async callers within their event loop.
+    """
 
     model: str
     max_output_tokens: int = 2048
     temperature: Optional[float] = None
+    max_concurrency: int = 16
+    cache: Optional[ResponseCache] = None
+    retry: Optional[RetryPolicy] = field(default_factory=RetryPolicy)
+    hedge: Optional[HedgePolicy] = None
+    breaker: Optional[CircuitBreaker] = None
+    coalesce: bool = True
+    api_key: Optional[str] = field(default=None, repr=False)
+    base_url: Optional[str] = None
     _client: Optional[OpenAI] = None  # type: ignore[assignment]
+    _async_client: Optional[Any] = None
+    _pool: Optional[ClientPool] = field(default=None, repr=False)
+    _semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = field(
+        default_factory=weakref.WeakKeyDictionary, init=False, repr=False
+    )
+    _latencies: LatencyWindow = field(init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+    _flights: "Dict[str, Future[str]]" = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _async_flights: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, _Flight]]" = field(
+        default_factory=weakref.WeakKeyDictionary, init=False, repr=False
+    )
+    retries: int = field(default=0, init=False)
+    hedges: int = field(default=0, init=False)
+    coalesced: int = field(default=0, init=False)
+    _executor: Optional[ThreadPoolExecutor] = field(
+        default=None, init=False, repr=False
+    )
 
     def __post_init__(self) -> None:
-        key = os.getenv("OPENAI_API_KEY")
-        if OpenAI is None or not key:
-            return
+        if self.max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self._latencies = LatencyWindow(self.hedge.window if self.hedge else 200)
 
-        try:
-            self._client = OpenAI(api_key=key)
-        except Exception as exc:  # pragma: no cover - defensive
-            raise LanguageResponderError(str(exc)) from exc
+    def close(self) -> None:
+        """Shut down the threads that run hedged sync calls.
+
+        They are started again on demand, so a closed responder still works.
+        Calls already running finish on their own.
+        """
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
 
     @property
     def available(self) -> bool:
-        return self._client is not None
+        return self._sync_client() is not None or (
+            self.cache is not None and self.cache.replay
+        )
 
     def generate(self, *, system_prompt: str, user_prompt: str) -> str:
-        if not self._client:
+        key, cached = self._cached(system_prompt, user_prompt)
+        if cached is not None:
+            return cached
+        client = self._sync_client()
+        if not client:
+            raise LanguageResponderError("OpenAI client is not available.")
+
+        request_kwargs = self._request_kwargs(system_prompt, user_prompt)
+
+        def request() -> str:
+            response = self._call(lambda: client.responses.create(**request_kwargs))
+            return self._store(key, _output_text(response))
+
+        if not self.coalesce:
+            return request()
+        with self._lock:
+            leading = self._flights.get(key)
+            if leading is None:
+                flight: Future[str] = Future()
+                self._flights[key] = flight
+            else:
+                self.coalesced += 1
+        if leading is not None:
+            return leading.result()
+        try:
+            text = request()
+        except BaseException as exc:
+            flight.set_exception(exc)
+            raise
+        else:
+            flight.set_result(text)
+            return text
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+    async def agenerate(
+        self, *, system_prompt: str, user_prompt: str, timeout: Optional[float] = None
+    ) -> str:
+        """Async :meth:`generate`; waits for a concurrency slot, then calls the API.
+
+        Cancelling the awaiting task cancels the HTTP request and frees the
+        slot. ``timeout`` bounds the whole call, retries and backoff included,
+        and is reported as a :class:`LanguageResponderError`, like every other
+        API failure.
+        """
+
+        import asyncio
+
+        key, cached = self._cached(system_prompt, user_prompt)
+        if cached is not None:
+            return cached
+        client = self._async_client or (self._pool or CLIENT_POOL).async_client(
+            self.api_key, self.base_url
+        )
+        if client is None:
             raise LanguageResponderError("OpenAI client is not available.")
 
-        request_kwargs = {
+        request_kwargs = self._request_kwargs(system_prompt, user_prompt)
+
+        async def request() -> str:
+            response = await self._acall(
+                lambda: client.responses.create(**request_kwargs)
+            )
+            return self._store(key, _output_text(response))
+
+        try:
+            return await asyncio.wait_for(
+                self._ajoin(key, request) if self.coalesce else request(), timeout
+            )
+        except asyncio.TimeoutError as exc:
+            raise LanguageResponderError("OpenAI request timed out.") from exc
+
+    async def _ajoin(
+        self, key: str, request: Callable[[], Coroutine[Any, Any, str]]
+    ) -> str:
+        """Await the loop's in-flight call for ``key``, starting it if there is none.
+
+        The upstream call runs in its own task, so one caller's cancellation
+        or timeout does not affect the others; it is cancelled only once every
+        caller has gone.
+        """
+
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            flights = self._async_flights.get(loop)
+            if flights is None:
+                flights = self._async_flights[loop] = {}
+            flight = flights.get(key)
+            if flight is None:
+                flight = flights[key] = _Flight(loop.create_task(request()))
+                flight.task.add_done_callback(lambda _: _land(flights, key, flight))
+            else:
+                self.coalesced += 1
+            flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                _land(flights, key, flight)
+                flight.task.cancel()
+
+    def generate_stream(
+        self, *, system_prompt: str, user_prompt: str
+    ) -> ResponseStream:
+        """Stream the response: iterate for text deltas, then read :attr:`ResponseStream.text`.
+
+        A cached response is replayed as a single delta. Opening the stream is
+        retried like :meth:`generate` but never hedged or coalesced, and a
+        stream that fails after its first delta is not retried. Errors surface as
+        :class:`LanguageResponderError` while iterating and count as failures
+        for the circuit breaker. An empty completion raises just as
+        :meth:`generate` does. Stream-open times are not hedge samples: they
+        measure time to first byte, not a whole response.
+        """
+
+        key, cached = self._cached(system_prompt, user_prompt)
+        if cached is not None:
+            return ResponseStream(iter((cached,)))
+        client = self._sync_client()
+        if not client:
+            raise LanguageResponderError("OpenAI client is not available.")
+        request_kwargs = self._request_kwargs(system_prompt, user_prompt)
+        events = self._call(
+            lambda: client.responses.create(**request_kwargs, stream=True), stream=True
+        )
+        return ResponseStream(
+            self._watch_stream(_stream_deltas(events)),
+            lambda text: self._store(key, text),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return retry, hedge and coalescing counters, the hedge threshold and breaker state."""
+
+        return {
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "coalesced": self.coalesced,
+            "hedge_delay": self._hedge_delay(),
+            "latency_samples": len(self._latencies),
+            "breaker": self.breaker.stats() if self.breaker else None,
+        }
+
+    # -------------------------------------------------------------- resilience
+    def _call(self, request: Callable[[], Any], *, stream: bool = False) -> Any:
+        """Run ``request`` with retries, hedging and the circuit breaker.
+
+        Requests that open a ``stream`` are neither hedged nor timed.
+        """
+
+        policy = self.retry or NO_RETRY
+        for attempt in range(policy.attempts):
+            self._check_breaker()
+            try:
+                if stream:
+                    return self._timed(request, sample=False)
+                if (delay := self._hedge_delay()) is not None:
+                    return self._hedged(request, delay)
+                return self._timed(request)
+            except Exception as exc:
+                if attempt + 1 >= policy.attempts or not _is_transient(exc):
+                    raise _as_responder_error(exc) from exc
+                self._count_retry()
+                time.sleep(policy.backoff(attempt, retry_after(exc)))
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def _timed(self, request: Callable[[], Any], *, sample: bool = True) -> Any:
+        started = time.monotonic()
+        try:
+            result = request()
+        except Exception as exc:
+            self._record_failure(exc)
+            raise
+        self._record_success(time.monotonic() - started if sample else None)
+        return result
+
+    def _hedged(self, request: Callable[[], Any], delay: float) -> Any:
+        # A blocking call cannot be abandoned, so the primary runs on the
+        # responder's own threads, at most ``max_concurrency`` of them, and the
+        # caller only waits; the shared pool bounds the extra load of hedges and
+        # never throttles ordinary calls. The loser's result is dropped.
+        first = self._calls().submit(self._timed, request)
+        done, _ = wait([first], timeout=delay)
+        if done or not self._may_hedge():
+            return first.result()
+        self._count_hedge()
+        pending = {first, _hedge_pool().submit(self._timed, request)}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        assert error is not None
+        raise error
+
+    def _sync_client(self) -> Optional[Any]:
+        if self._client is not None:
+            return self._client
+        return (self._pool or CLIENT_POOL).client(self.api_key, self.base_url)
+
+    def _calls(self) -> ThreadPoolExecutor:
+        executor = self._executor
+        if executor is None:
+            with self._lock:
+                executor = self._executor
+                if executor is None:
+                    executor = self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_concurrency, thread_name_prefix="llm-call"
+                    )
+        return executor
+
+    async def _acall(self, request: Callable[[], Any]) -> Any:
+        import asyncio
+
+        policy = self.retry or NO_RETRY
+        for attempt in range(policy.attempts):
+            self._check_breaker()
+            try:
+                delay = self._hedge_delay()
+                if delay is not None:
+                    return await self._ahedged(request, delay)
+                return await self._atimed(request)
+            except Exception as exc:
+                if attempt + 1 >= policy.attempts or not _is_transient(exc):
+                    raise _as_responder_error(exc) from exc
+                self._count_retry()
+                await asyncio.sleep(policy.backoff(attempt, retry_after(exc)))
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    async def _atimed(self, request: Callable[[], Any]) -> Any:
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        async with semaphore:
+            started = time.monotonic()
+            try:
+                result = await request()
+            except Exception as exc:
+                self._record_failure(exc)
+                raise
+        self._record_success(time.monotonic() - started)
+        return result
+
+    async def _ahedged(self, request: Callable[[], Any], delay: float) -> Any:
+        import asyncio
+
+        tasks = [asyncio.ensure_future(self._atimed(request))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not self._may_hedge():
+                return await tasks[0]
+            self._count_hedge()
+            tasks.append(asyncio.ensure_future(self._atimed(request)))
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            assert error is not None
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _hedge_delay(self) -> Optional[float]:
+        return self._latencies.hedge_delay(self.hedge) if self.hedge else None
+
+    def _may_hedge(self) -> bool:
+        # A half-open breaker admits a limited number of probes; don't double them.
+        return self.breaker is None or self.breaker.state == CLOSED
+
+    def _check_breaker(self) -> None:
+        breaker = self.breaker
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(
+                f"OpenAI backend is failing; retrying in {breaker.retry_in():.1f}s."
+            )
+
+    def _watch_stream(self, deltas: Iterator[str]) -> Iterator[str]:
+        # Opening the stream already counted as a success; a stream that breaks
+        # off or reports an error event afterwards is a backend failure too.
+        try:
+            yield from deltas
+        except Exception:
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            raise
+
+    def _record_success(self, seconds: Optional[float]) -> None:
+        if seconds is not None:
+            self._latencies.record(seconds)
+        if self.breaker is not None:
+            self.breaker.record_success()
+
+    def _record_failure(self, exc: BaseException) -> None:
+        if self.breaker is None:
+            return
+        if _is_transient(exc):
+            self.breaker.record_failure()
+        else:
+            # The backend answered and refused this one request; that is proof of
+            # life, and it settles a half-open probe that would otherwise hang.
+            self.breaker.record_success()
+
+    def _count_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def _count_hedge(self) -> None:
+        with self._lock:
+            self.hedges += 1
+
+    def _cached(
+        self, system_prompt: str, user_prompt: str
+    ) -> Tuple[str, Optional[str]]:
+        """Return ``(request key, cached text)``; raise on a replay miss."""
+
+        key = ResponseCache.key(
+            model=self.model,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            temperature=self.temperature,
+            max_output_tokens=self.max_output_tokens,
+        )
+        cache = self.cache
+        if cache is None:
+            return key, None
+        text = cache.get(key)
+        if text is None and cache.replay:
+            raise ResponseCacheMiss(
+                f"No recorded response for request {key[:12]} in replay mode."
+            )
+        return key, text
+
+    def _store(self, key: str, text: str) -> str:
+        if self.cache is not None:
+            self.cache.put(key, text)
+        return text
+
+    def _request_kwargs(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+        request_kwargs: Dict[str, Any] = {
             "model": self.model,
             "input": [
                 {"role": "system", "content": system_prompt},
@@ -63,56 +789,171 @@ class OpenAIResponder:
         }
         if self.temperature is not None:
             request_kwargs["temperature"] = self.temperature
+        return request_kwargs
+
+
+class ResponseStream:
+    """Iterator over generated text deltas that also aggregates them.
+
+    Iterating yields each delta as it arrives; once exhausted, :attr:`text`
+    holds the stripped full response. :meth:`result` drains whatever is left
+    and returns that text.
+    """
+
+    def __init__(
+        self,
+        deltas: Iterator[str],
+        on_complete: Optional[Callable[[str], object]] = None,
+    ) -> None:
+        self._deltas = deltas
+        self._on_complete = on_complete
+        self._pieces: List[str] = []
+        self._text: Optional[str] = None
 
+    def __iter__(self) -> ResponseStream:
+        return self
+
+    def __next__(self) -> str:
+        if self._text is not None:
+            raise StopIteration
         try:
-            response = self._client.responses.create(**request_kwargs)
-        except (APIStatusError, InternalServerError, TimeoutError) as exc:
-            raise LanguageResponderError(str(exc)) from exc
-        except Exception as exc:  # pragma: no cover - defensive
+            delta = next(self._deltas)
+        except StopIteration:
+            self._finish()
+            raise
+        except LanguageResponderError:
+            raise
+        except Exception as exc:
             raise LanguageResponderError(str(exc)) from exc
+        self._pieces.append(delta)
+        return delta
+
+    @property
+    def done(self) -> bool:
+        return self._text is not None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            raise LanguageResponderError("The response stream has not finished yet.")
+        return self._text
+
+    def result(self) -> str:
+        for _ in self:
+            pass
+        return self.text
+
+    def _finish(self) -> None:
+        text = "".join(self._pieces).strip()
+        if not text:
+            raise LanguageResponderError("No content returned from OpenAI stream.")
+        self._text = text
+        if self._on_complete is not None:
+            self._on_complete(text)
+
+
+class _Flight:
+    """One upstream async call and the number of callers awaiting it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task[str]) -> None:
+        self.task: asyncio.Task[str] = task
+        self.waiters: int = 0
+
 
-        output_text = getattr(response, "output_text", None)
-
-        if not output_text:
-            pieces: list[str] = []
-
-            output_chunks = getattr(response, "output", None)
-            if output_chunks:
-                for chunk in output_chunks:
-                    content_list = None
-                    if hasattr(chunk, "content"):
-                        content_list = chunk.content
-                    elif isinstance(chunk, dict):
-                        content_list = chunk.get("content")
-                    if not content_list:
-                        continue
-                    for content in content_list:
-                        content_type = getattr(content, "type", None)
-                        if content_type is None and isinstance(content, dict):
-                            content_type = content.get("type")
-                        if content_type == "output_text":
-                            text_value = getattr(content, "text", None)
-                            if text_value is None and isinstance(content, dict):
-                                text_value = content.get("text")
-                            if text_value:
-                                pieces.append(text_value)
-            if not pieces and hasattr(response, "model_dump"):
-                data = response.model_dump(mode="python")
-                for chunk in data.get("output", []):
-                    if not isinstance(chunk, dict):
-                        continue
-                    for content in chunk.get("content", []) or []:
-                        if content.get("type") == "output_text" and content.get("text"):
-                            pieces.append(content["text"])
-
-            output_text = "".join(pieces).strip()
-
-        if not output_text:
-            payload = None
-            if hasattr(response, "model_dump"):
-                payload = response.model_dump(mode="python")
-            raise LanguageResponderError(
-                f"No content returned from OpenAI. payload={payload}"
+def _land(flights: Dict[str, _Flight], key: str, flight: _Flight) -> None:
+    # Only drop the entry if a newer flight has not replaced it.
+    if flights.get(key) is flight:
+        del flights[key]
+
+
+_HEDGE_POOL: Optional[ThreadPoolExecutor] = None
+_HEDGE_POOL_LOCK = threading.Lock()
+
+
+def _hedge_pool() -> ThreadPoolExecutor:
+    global _HEDGE_POOL
+    with _HEDGE_POOL_LOCK:
+        if _HEDGE_POOL is None:
+            _HEDGE_POOL = ThreadPoolExecutor(thread_name_prefix="llm-hedge")
+        return _HEDGE_POOL
+
+
+def _is_transient(exc: BaseException) -> bool:
+    return isinstance(exc, _CONNECTION_ERRORS) or is_transient(exc)
+
+
+def _as_responder_error(exc: BaseException) -> LanguageResponderError:
+    return LanguageResponderError(str(exc) or type(exc).__name__)
+
+
+def _stream_deltas(events: Iterable[Any]) -> Iterator[str]:
+    """Yield output text deltas from Responses API stream events."""
+
+    streamed = False
+    for event in events:
+        kind = getattr(event, "type", None)
+        if kind == "response.output_text.delta":
+            delta = getattr(event, "delta", "")
+            if delta:
+                streamed = True
+                yield delta
+        elif kind == "response.completed" and not streamed:
+            # Some models only deliver the final response object.
+            yield _output_text(event.response)
+        elif kind in ("error", "response.failed"):
+            error = getattr(event, "error", None) or getattr(
+                getattr(event, "response", None), "error", None
             )
+            raise LanguageResponderError(str(getattr(error, "message", error) or kind))
+
+
+def _output_text(response: Any) -> str:
+    """Extract the generated text from a Responses API result."""
+
+    output_text = getattr(response, "output_text", None)
+
+    if not output_text:
+        pieces: list[str] = []
+
+        output_chunks = getattr(response, "output", None)
+        if output_chunks:
+            for chunk in output_chunks:
+                content_list = None
+                if hasattr(chunk, "content"):
+                    content_list = chunk.content
+                elif isinstance(chunk, dict):
+                    content_list = chunk.get("content")
+                if not content_list:
+                    continue
+                for content in content_list:
+                    content_type = getattr(content, "type", None)
+                    if content_type is None and isinstance(content, dict):
+                        content_type = content.get("type")
+                    if content_type == "output_text":
+                        text_value = getattr(content, "text", None)
+                        if text_value is None and isinstance(content, dict):
+                            text_value = content.get("text")
+                        if text_value:
+                            pieces.append(text_value)
+        if not pieces and hasattr(response, "model_dump"):
+            data = response.model_dump(mode="python")
+            for chunk in data.get("output", []):
+                if not isinstance(chunk, dict):
+                    continue
+                for content in chunk.get("content", []) or []:
+                    if content.get("type") == "output_text" and content.get("text"):
+                        pieces.append(content["text"])
+
+        output_text = "".join(pieces).strip()
+
+    if not output_text:
+        payload = None
+        if hasattr(response, "model_dump"):
+            payload = response.model_dump(mode="python")
+        raise LanguageResponderError(
+            f"No content returned from OpenAI. payload={payload}"
+        )
 
-        return output_text.strip()
+    return output_text.strip()
@@ -0,0 +1,175 @@
+"""Persistent, content-addressed cache of language model responses."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Bump when the key recipe or request shape changes so old entries stop matching.
+_KEY_VERSION = 1
+
+
+class ResponseCache:
+    """SQLite-backed cache from request hashes to generated text.
+
+    Entries are keyed by a SHA-256 of the model, prompts, temperature and
+    output token limit. The total size of stored responses is capped at
+    ``max_bytes`` by evicting the least recently used entries, and entries
+    older than ``ttl`` seconds are treated as misses and purged. With
+    ``replay=True`` the database is opened read-only: hits are served, nothing
+    is written, and callers are expected to fail on a miss instead of calling
+    the model.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        *,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: Optional[float] = None,
+        replay: bool = False,
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.replay = replay
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        if replay:
+            self._db = sqlite3.connect(
+                f"{self.path.resolve().as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+            )
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            with self._db:
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    " key TEXT PRIMARY KEY,"
+                    " value TEXT NOT NULL,"
+                    " size INTEGER NOT NULL,"
+                    " created REAL NOT NULL,"
+                    " accessed REAL NOT NULL)"
+                )
+                self._db.execute(
+                    "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+                )
+
+    @staticmethod
+    def key(
+        *,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: Optional[float],
+        max_output_tokens: int,
+    ) -> str:
+        """Return the content address of one request."""
+
+        payload = json.dumps(
+            [
+                _KEY_VERSION,
+                model,
+                system_prompt,
+                user_prompt,
+                temperature,
+                max_output_tokens,
+            ],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl is not None and row[1] + self.ttl <= now:
+                if not self.replay:
+                    with self._db:
+                        self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if not self.replay:
+                with self._db:
+                    self._db.execute(
+                        "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+                    )
+            return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        if self.replay:
+            return
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created, accessed)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        total = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Keep the most recently used entries that fit; drop everything older.
+        cursor = self._db.execute(
+            "DELETE FROM responses WHERE key IN ("
+            " SELECT key FROM ("
+            "  SELECT key, SUM(size) OVER (ORDER BY accessed DESC, key) AS kept FROM responses"
+            " ) WHERE kept > ?)",
+            (self.max_bytes,),
+        )
+        self.evictions += cursor.rowcount
+
+    def clear(self) -> None:
+        if self.replay:
+            raise PermissionError("replay caches are read-only")
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters, evictions and current occupancy."""
+
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "replay": self.replay,
+        }
@@ -0,0 +1,107 @@
+"""Prompt assembly that keeps stable text first and history within a token budget."""
+
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Sequence
+
+# Providers cache prompt prefixes of at least this many tokens, in fixed steps.
+PREFIX_CACHE_MIN_TOKENS = 1024
+PREFIX_CACHE_INCREMENT = 128
+
+_PIECE = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the BPE token count of ``text`` without a tokenizer.
+
+    English averages about four characters per token, but short words and
+    punctuation cost a token each, so the larger of the two counts is used.
+    The estimate errs on the high side, which is the safe side for budgets.
+    """
+
+    if not text:
+        return 0
+    return max(len(_PIECE.findall(text)), math.ceil(len(text) / 4))
+
+
+def cacheable_tokens(prefix_tokens: int) -> int:
+    """Return how much of a stable prefix a provider-side prompt cache can reuse."""
+
+    if prefix_tokens < PREFIX_CACHE_MIN_TOKENS:
+        return 0
+    return prefix_tokens - prefix_tokens % PREFIX_CACHE_INCREMENT
+
+
+@dataclass(frozen=True, slots=True)
+class Prompt:
+    """An assembled request plus token estimates for it."""
+
+    system_prompt: str
+    user_prompt: str
+    input_tokens: int
+    prefix_tokens: int
+    history_kept: int
+    history_dropped: int
+
+    @property
+    def cacheable_tokens(self) -> int:
+        return cacheable_tokens(self.prefix_tokens)
+
+
+@dataclass(frozen=True, slots=True)
+class PromptLayout:
+    """Orders prompt sections for prefix caching and fits them into a budget.
+
+    A prompt is built from four sections, most stable first: the system
+    prompt, fixed ``rules``, the conversation ``history`` and the per-call
+    ``task``. The system prompt and rules together form the prefix that
+    repeats across calls, so provider-side prompt caches can reuse it; the
+    task, which carries round numbers, targets and scores, goes last.
+    History entries are kept newest first for as long as the estimated input
+    stays within ``max_input_tokens``. Older entries are dropped whole, so the
+    same inputs always give the same prompt. Only history is trimmed; the
+    other sections are always sent.
+    """
+
+    max_input_tokens: int = 4000
+    history_header: str = "Recent transcript:"
+    empty_history: str = "No meaningful conversation yet."
+    estimate: Callable[[str], int] = estimate_tokens
+
+    def build(
+        self,
+        *,
+        system: str,
+        task: str,
+        rules: Sequence[str] = (),
+        history: Sequence[str] = (),
+    ) -> Prompt:
+        prefix = "\n\n".join(rules)
+        fixed = self.estimate(system) + self.estimate(prefix) + self.estimate(task)
+        fixed += self.estimate(self.history_header) + self.estimate(self.empty_history)
+        room = self.max_input_tokens - fixed
+
+        kept: List[str] = []
+        for entry in reversed(history):
+            cost = self.estimate(entry)
+            if cost > room:
+                break
+            kept.append(entry)
+            room -= cost
+        kept.reverse()
+
+        transcript = "\n".join(kept) if kept else self.empty_history
+        sections = [prefix] if prefix else []
+        sections += [f"{self.history_header}\n{transcript}", task]
+        user_prompt = "\n\n".join(sections)
+        return Prompt(
+            system_prompt=system,
+            user_prompt=user_prompt,
+            input_tokens=self.estimate(system) + self.estimate(user_prompt),
+            prefix_tokens=self.estimate(system) + self.estimate(prefix),
+            history_kept=len(kept),
+            history_dropped=len(history) - len(kept),
+        )
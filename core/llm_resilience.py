@@ -0,0 +1,230 @@
+"""Retries, hedged requests and circuit breaking for language model calls."""
+
+from __future__ import annotations
+
+import math
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional
+
+# HTTP statuses worth another attempt: timeouts, conflicts, rate limits, server errors.
+TRANSIENT_STATUS = frozenset({408, 409, 429})
+
+# Circuit breaker states, also reported by :meth:`CircuitBreaker.stats`.
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Return True if ``exc`` looks like a failure that a retry may fix."""
+
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(exc, "status_code", None)
+    return isinstance(status, int) and (status in TRANSIENT_STATUS or status >= 500)
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Return the server's ``Retry-After`` hint in seconds, if it sent one."""
+
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        value = float(headers.get("retry-after", ""))
+    except (TypeError, ValueError):
+        return None
+    return value if value >= 0 else None
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """Bounded retries with jittered exponential backoff.
+
+    A call is tried up to ``attempts`` times in total. Before retry ``n`` the
+    caller sleeps a random time between zero and
+    ``min(max_delay, base_delay * multiplier ** n)`` ("full jitter"), so many
+    clients that fail together do not come back together. A ``Retry-After``
+    hint from the server raises the delay, still capped at ``max_delay``.
+    """
+
+    attempts: int = 3
+    base_delay: float = 0.25
+    max_delay: float = 8.0
+    multiplier: float = 2.0
+
+    def __post_init__(self) -> None:
+        if self.attempts < 1:
+            raise ValueError("attempts must be at least 1")
+        if self.base_delay < 0 or self.max_delay < 0:
+            raise ValueError("delays must not be negative")
+
+    def backoff(self, retry: int, hint: Optional[float] = None) -> float:
+        """Return how long to wait before retry number ``retry`` (0-based)."""
+
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier**retry)
+        delay = random.uniform(0.0, ceiling)
+        if hint is not None:
+            delay = max(delay, min(hint, self.max_delay))
+        return delay
+
+
+# Policy for callers that want every call tried exactly once.
+NO_RETRY = RetryPolicy(attempts=1)
+
+
+@dataclass(frozen=True, slots=True)
+class HedgePolicy:
+    """When to fire a duplicate of a slow request.
+
+    Once ``min_samples`` latencies have been observed, a request that has not
+    answered within their ``quantile`` (p95 by default, never less than
+    ``min_delay``) gets one duplicate, and whichever returns first wins.
+    Before that, ``initial_delay`` is used, or no hedging if it is None. Only
+    the last ``window`` latencies count, so the threshold follows the backend.
+    """
+
+    quantile: float = 0.95
+    min_samples: int = 20
+    window: int = 200
+    initial_delay: Optional[float] = None
+    min_delay: float = 0.05
+
+    def __post_init__(self) -> None:
+        if not 0.0 < self.quantile <= 1.0:
+            raise ValueError("quantile must be in (0, 1]")
+        if self.window < self.min_samples or self.min_samples < 1:
+            raise ValueError("window must hold at least min_samples >= 1 samples")
+
+
+class LatencyWindow:
+    """Sliding window of recent call latencies, in seconds."""
+
+    def __init__(self, size: int = 200) -> None:
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, math.ceil(q * len(samples)) - 1)]
+
+    def hedge_delay(self, policy: HedgePolicy) -> Optional[float]:
+        """Return how long to wait before hedging, or None to not hedge."""
+
+        if len(self) < policy.min_samples:
+            return policy.initial_delay
+        threshold = self.quantile(policy.quantile)
+        return None if threshold is None else max(threshold, policy.min_delay)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class CircuitBreaker:
+    """Fails fast while a backend keeps failing.
+
+    After ``failure_threshold`` consecutive transient failures the breaker
+    opens and :meth:`allow` refuses calls for ``reset_timeout`` seconds. Then
+    it lets ``half_open_calls`` probe calls through: a success closes it again,
+    a failure reopens it for another ``reset_timeout``.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold < 1 or half_open_calls < 1:
+            raise ValueError("failure_threshold and half_open_calls must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current()
+
+    def _current(self) -> str:
+        if (
+            self._state == OPEN
+            and self._clock() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def allow(self) -> bool:
+        """Return True if a call may go ahead now."""
+
+        with self._lock:
+            state = self._current()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._probes < self.half_open_calls:
+                self._probes += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def retry_in(self) -> float:
+        """Return the seconds until an open breaker lets a probe through."""
+
+        with self._lock:
+            if self._current() != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_timeout - self._clock())
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            state = self._current()
+            self._failures += 1
+            if state == HALF_OPEN or (
+                state == CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self.opened += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the state, consecutive failures, times opened and rejected calls."""
+
+        with self._lock:
+            return {
+                "state": self._current(),
+                "failures": self._failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
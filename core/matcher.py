@@ -0,0 +1,206 @@
+"""Compiled keyword matching shared by the registry and routers."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set
+
+from .analysis import tokenize
+from .base import BaseAgent, KeywordAgent
+from .contexts import AgentQuery
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton mapping keyword phrases to the ids that declared them.
+
+    The automaton runs over word tokens rather than characters: a single pass
+    over a query's tokens reports every id with at least one keyword phrase
+    present as a run of whole tokens, which replaces testing each agent's
+    keywords one by one.
+    """
+
+    def __init__(self, keyword_sets: Iterable[tuple[int, Iterable[str]]]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[FrozenSet[int]] = [frozenset()]
+
+        pending: List[Set[int]] = [set()]
+        for ident, keywords in keyword_sets:
+            for keyword in keywords:
+                if not keyword:
+                    continue
+                words = tokenize(keyword)
+                if not words:
+                    continue
+                state = 0
+                for word in words:
+                    nxt = self._goto[state].get(word)
+                    if nxt is None:
+                        nxt = len(self._goto)
+                        self._goto[state][word] = nxt
+                        self._goto.append({})
+                        self._fail.append(0)
+                        pending.append(set())
+                    state = nxt
+                pending[state].add(ident)
+
+        queue: deque[int] = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(word, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                pending[nxt] |= pending[self._fail[nxt]]
+
+        self._output = [frozenset(ids) for ids in pending]
+
+    def scan(self, tokens: Sequence[str]) -> Set[int]:
+        """Return the ids with at least one keyword phrase occurring in ``tokens``."""
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        hits: Set[int] = set()
+        state = 0
+        for token in tokens:
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if output[state]:
+                hits |= output[state]
+        return hits
+
+
+def is_compilable(agent: BaseAgent) -> bool:
+    """Return True when the agent's matcher is fully described by its keywords."""
+
+    return (
+        isinstance(agent, KeywordAgent)
+        and type(agent).can_handle is KeywordAgent.can_handle
+    )
+
+
+class CompiledAgentMatcher:
+    """Priority-ordered matcher over a fixed sequence of agents.
+
+    Keyword agents are folded into one :class:`KeywordMatcher`; any other agent
+    keeps its own ``can_handle`` and is consulted in its registration slot.
+    """
+
+    def __init__(self, agents: Sequence[BaseAgent]) -> None:
+        self.agents = tuple(agents)
+        self._compiled = tuple(is_compilable(agent) for agent in self.agents)
+        self._matcher = KeywordMatcher(
+            (index, agent.KEYWORDS)  # type: ignore[attr-defined]
+            for index, agent in enumerate(self.agents)
+            if self._compiled[index]
+        )
+        self.pure = all(self._compiled)
+        # Slots that need their own ``can_handle``; every other slot is decided by one scan.
+        self._dynamic = tuple(
+            index for index, compiled in enumerate(self._compiled) if not compiled
+        )
+
+    def match(
+        self, query: AgentQuery, calls: Optional[List[int]] = None
+    ) -> BaseAgent | None:
+        """Return the first agent, in priority order, that accepts the query.
+
+        When ``calls`` is given, ``calls[0]`` is incremented for every
+        ``can_handle`` evaluated outside the compiled keyword matcher.
+        """
+
+        return self._match(query, calls)
+
+    def match_many(
+        self, queries: Sequence[AgentQuery], calls: Optional[List[int]] = None
+    ) -> List[Optional[BaseAgent]]:
+        """Match a batch of queries, scanning each distinct text only once.
+
+        Decisions are memoised per normalised text when every agent is keyword
+        compiled, since metadata cannot influence the outcome in that case.
+        """
+
+        if not self.pure:
+            return [self._match(query, calls) for query in queries]
+
+        seen: Dict[str, Optional[BaseAgent]] = {}
+        matches: List[Optional[BaseAgent]] = []
+        for query in queries:
+            normalized = query.analysis.normalized
+            if normalized in seen:
+                matches.append(seen[normalized])
+                continue
+            agent = seen[normalized] = self._match(query)
+            matches.append(agent)
+        return matches
+
+    def keyword_match(self, query: AgentQuery) -> BaseAgent | None:
+        """Return the highest-priority keyword agent hit, ignoring ``can_handle`` slots."""
+
+        hits = self._matcher.scan(query.analysis.tokens)
+        return self.agents[min(hits)] if hits else None
+
+    def candidates(self, query: AgentQuery, limit: int) -> List[BaseAgent]:
+        """Return up to ``limit`` accepting agents in priority order."""
+
+        hits = self._matcher.scan(query.analysis.tokens)
+        found: List[BaseAgent] = []
+        for index, agent in enumerate(self.agents):
+            if len(found) >= limit:
+                break
+            if (index in hits) if self._compiled[index] else agent.can_handle(query):
+                found.append(agent)
+        return found
+
+    async def acandidates(self, query: AgentQuery, limit: int) -> List[BaseAgent]:
+        """Async variant of :meth:`candidates`."""
+
+        hits = self._matcher.scan(query.analysis.tokens)
+        found: List[BaseAgent] = []
+        for index, agent in enumerate(self.agents):
+            if len(found) >= limit:
+                break
+            if (
+                (index in hits)
+                if self._compiled[index]
+                else await agent.acan_handle(query)
+            ):
+                found.append(agent)
+        return found
+
+    async def amatch(
+        self, query: AgentQuery, calls: Optional[List[int]] = None
+    ) -> BaseAgent | None:
+        """Async variant of :meth:`match` that awaits ``acan_handle`` hooks."""
+
+        hits = self._matcher.scan(query.analysis.tokens)
+        first = min(hits) if hits else len(self.agents)
+        for index in self._dynamic:
+            if index > first:
+                break
+            if calls is not None:
+                calls[0] += 1
+            agent = self.agents[index]
+            if await agent.acan_handle(query):
+                return agent
+        return self.agents[first] if hits else None
+
+    def _match(
+        self, query: AgentQuery, calls: Optional[List[int]] = None
+    ) -> BaseAgent | None:
+        hits = self._matcher.scan(query.analysis.tokens)
+        first = min(hits) if hits else len(self.agents)
+        for index in self._dynamic:
+            if index > first:
+                break
+            if calls is not None:
+                calls[0] += 1
+            agent = self.agents[index]
+            if agent.can_handle(query):
+                return agent
+        return self.agents[first] if hits else None
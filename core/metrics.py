@@ -0,0 +1,248 @@
+"""Lightweight routing instrumentation with a Prometheus text exporter."""
+
+from __future__ import annotations
+
+import os
+import threading
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (seconds)."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Return the upper bound of the bucket holding the ``q`` quantile."""
+
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(zip(map(str, self.buckets + (float("inf"),)), self.counts)),
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+
+class RoutingMetrics:
+    """Counters and histograms describing where routing time goes.
+
+    A router only touches this object when one is attached, so leaving
+    ``metrics`` unset costs a single ``None`` check per query. With
+    ``debug=True`` each result also gets a ``debug["metrics"]`` breakdown.
+    """
+
+    def __init__(
+        self, *, buckets: Sequence[float] = DEFAULT_BUCKETS, debug: bool = False
+    ) -> None:
+        self.buckets = tuple(buckets)
+        self.debug = debug
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.queries = 0
+            self.unrouted = 0
+            self.can_handle_calls = 0
+            self.routes: Dict[str, int] = {}
+            self.agent_hits: Dict[str, int] = {}
+            self.match_seconds = Histogram(self.buckets)
+            self.handle_seconds: Dict[str, Histogram] = {}
+
+    def record(
+        self,
+        agent: Optional[str],
+        via: Optional[str],
+        can_handle_calls: int,
+        match_seconds: float,
+        handle_seconds: float,
+    ) -> None:
+        """Record one routed query."""
+
+        with self._lock:
+            self.queries += 1
+            self.can_handle_calls += can_handle_calls
+            self.match_seconds.observe(match_seconds)
+            if agent is None:
+                self.unrouted += 1
+                return
+            route = via or "match"
+            self.routes[route] = self.routes.get(route, 0) + 1
+            self.agent_hits[agent] = self.agent_hits.get(agent, 0) + 1
+            histogram = self.handle_seconds.get(agent)
+            if histogram is None:
+                histogram = self.handle_seconds[agent] = Histogram(self.buckets)
+            histogram.observe(handle_seconds)
+
+    def count_can_handle_calls(self, calls: int) -> None:
+        """Add ``can_handle`` evaluations that were not attributed to one query."""
+
+        with self._lock:
+            self.can_handle_calls += calls
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-friendly copy of every metric."""
+
+        with self._lock:
+            queries = self.queries
+            fallbacks = self.routes.get("fallback", 0)
+            return {
+                "queries": queries,
+                "unrouted": self.unrouted,
+                "can_handle_calls": self.can_handle_calls,
+                "can_handle_calls_per_query": self.can_handle_calls / queries
+                if queries
+                else 0.0,
+                "routes": dict(self.routes),
+                "fallback_rate": fallbacks / queries if queries else 0.0,
+                "agent_hits": dict(self.agent_hits),
+                "match_seconds": self.match_seconds.snapshot(),
+                "handle_seconds": {
+                    agent: histogram.snapshot()
+                    for agent, histogram in self.handle_seconds.items()
+                },
+            }
+
+    # -------------------------------------------------------------- exporting
+    def to_prometheus(self, prefix: str = "routing") -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+
+        lines: List[str] = []
+        with self._lock:
+            _counter(
+                lines,
+                f"{prefix}_queries_total",
+                "Queries routed.",
+                [({}, self.queries)],
+            )
+            _counter(
+                lines,
+                f"{prefix}_unrouted_total",
+                "Queries no agent accepted.",
+                [({}, self.unrouted)],
+            )
+            _counter(
+                lines,
+                f"{prefix}_can_handle_calls_total",
+                "can_handle evaluations outside the compiled matcher.",
+                [({}, self.can_handle_calls)],
+            )
+            _counter(
+                lines,
+                f"{prefix}_routes_total",
+                "Queries by routing stage (match, semantic, fallback, ...).",
+                [({"via": via}, count) for via, count in sorted(self.routes.items())],
+            )
+            _counter(
+                lines,
+                f"{prefix}_agent_hits_total",
+                "Queries dispatched per agent.",
+                [
+                    ({"agent": agent}, count)
+                    for agent, count in sorted(self.agent_hits.items())
+                ],
+            )
+            _histogram(
+                lines,
+                f"{prefix}_match_seconds",
+                "Time spent choosing an agent.",
+                [({}, self.match_seconds)],
+            )
+            _histogram(
+                lines,
+                f"{prefix}_handle_seconds",
+                "Time spent inside the chosen agent.",
+                [
+                    ({"agent": agent}, histogram)
+                    for agent, histogram in sorted(self.handle_seconds.items())
+                ],
+            )
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Path | str, prefix: str = "routing") -> None:
+        """Atomically write :meth:`to_prometheus` output, e.g. for a textfile collector."""
+
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temporary = target.with_name(f".{target.name}.tmp")
+        temporary.write_text(self.to_prometheus(prefix), encoding="utf-8")
+        os.replace(temporary, target)
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    body = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return "{" + body + "}"
+
+
+def _escape(value: str) -> str:
+    # The exposition format escapes backslash, double quote and line feed.
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _counter(
+    lines: List[str],
+    name: str,
+    help_text: str,
+    samples: Iterable[Tuple[Dict[str, str], int]],
+) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} counter")
+    for labels, value in samples:
+        lines.append(f"{name}{_labels(labels)} {value}")
+
+
+def _histogram(
+    lines: List[str],
+    name: str,
+    help_text: str,
+    samples: Iterable[Tuple[Dict[str, str], Histogram]],
+) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, histogram in samples:
+        cumulative = 0
+        for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f"{name}_bucket{_labels({**labels, 'le': le})} {cumulative}")
+        lines.append(f"{name}_sum{_labels(labels)} {histogram.sum}")
+        lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
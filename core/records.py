@@ -0,0 +1,26 @@
+"""Conversions between queries/results and the JSON records the services exchange."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any, Dict
+
+from .contexts import AgentQuery, AgentResult
+
+
+def query_from_record(record: Dict[str, Any]) -> AgentQuery:
+    """Build an :class:`AgentQuery` from a ``{"text", "metadata"}`` mapping."""
+
+    text = record.get("text")
+    if not isinstance(text, str):
+        raise ValueError("record is missing a string 'text' field")
+    metadata = record.get("metadata") or {}
+    if not isinstance(metadata, dict):
+        raise ValueError("'metadata' must be an object")
+    return AgentQuery(text=text, metadata=metadata)
+
+
+def result_to_record(result: AgentResult) -> Dict[str, Any]:
+    """Return the JSON-friendly form of an :class:`AgentResult`."""
+
+    return asdict(result)
@@ -2,43 +2,216 @@
 
 from __future__ import annotations
 
-from typing import Dict, Iterable, Iterator, MutableMapping
+import threading
+from types import MappingProxyType
+from typing import (
+    Callable,
+    Dict,
+    ItemsView,
+    Iterable,
+    Iterator,
+    KeysView,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+    ValuesView,
+    overload,
+)
 
 from .base import BaseAgent
 from .contexts import AgentQuery
+from .lazy import AgentFactory, LazyAgent
+from .matcher import CompiledAgentMatcher
+
+_T = TypeVar("_T")
+
+
+class RegistrySnapshot:
+    """Immutable view of a registry's agents at one ``version``.
+
+    Snapshots are never mutated after publication, so readers can iterate and
+    match against one without locking. The compiled matcher is built on first
+    use and shared by every reader of the snapshot.
+    """
+
+    __slots__ = ("agents", "version", "_matcher")
+
+    def __init__(self, agents: Mapping[str, BaseAgent], version: int) -> None:
+        self.agents: Mapping[str, BaseAgent] = MappingProxyType(dict(agents))
+        self.version = version
+        self._matcher: CompiledAgentMatcher | None = None
+
+    @property
+    def matcher(self) -> CompiledAgentMatcher:
+        matcher = self._matcher
+        if matcher is None:
+            # Concurrent first readers may both compile; either result is equivalent.
+            matcher = self._matcher = CompiledAgentMatcher(list(self.agents.values()))
+        return matcher
 
 
 class AgentRegistry(MutableMapping[str, BaseAgent]):
-    """Simple dictionary-backed registry for agents."""
+    """Copy-on-write registry of agents, safe to read while it is being changed.
+
+    Reads go through the current :class:`RegistrySnapshot` without locking.
+    Writes are serialised, copy the agents into a new snapshot and publish it
+    with a single assignment, so a query being routed keeps the snapshot it
+    started with. ``version`` increases on every mutation so routers can tell
+    when cached routing state is stale.
+    """
 
     def __init__(self, agents: Iterable[BaseAgent] | None = None) -> None:
-        self._agents: Dict[str, BaseAgent] = {}
+        self._snapshot = RegistrySnapshot({}, 0)
+        self._write_lock = threading.Lock()
         if agents is not None:
-            for agent in agents:
-                self.register(agent)
+            self.register_many(agents)
+
+    def snapshot(self) -> RegistrySnapshot:
+        """Return the current immutable snapshot."""
+
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
 
     def __getitem__(self, key: str) -> BaseAgent:
-        return self._agents[key]
+        return self._snapshot.agents[key]
 
     def __setitem__(self, key: str, value: BaseAgent) -> None:
-        self._agents[key] = value
+        self._publish(lambda agents: agents.__setitem__(key, value))
 
     def __delitem__(self, key: str) -> None:
-        del self._agents[key]
+        self._publish(lambda agents: agents.__delitem__(key))
 
     def __iter__(self) -> Iterator[str]:
-        return iter(self._agents)
+        return iter(self._snapshot.agents)
 
     def __len__(self) -> int:
-        return len(self._agents)
+        return len(self._snapshot.agents)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._snapshot.agents
+
+    @overload
+    def get(self, key: str, /) -> Optional[BaseAgent]: ...
+
+    @overload
+    def get(
+        self, key: str, default: Union[BaseAgent, _T], /
+    ) -> Union[BaseAgent, _T]: ...
+
+    def get(self, key: str, default: object = None) -> object:
+        return self._snapshot.agents.get(key, default)
+
+    def keys(self) -> KeysView[str]:
+        return self._snapshot.agents.keys()
+
+    def values(self) -> ValuesView[BaseAgent]:
+        return self._snapshot.agents.values()
+
+    def items(self) -> ItemsView[str, BaseAgent]:
+        return self._snapshot.agents.items()
+
+    def _publish(self, change: Callable[[Dict[str, BaseAgent]], object]) -> None:
+        with self._write_lock:
+            current = self._snapshot
+            agents = dict(current.agents)
+            change(agents)
+            self._snapshot = RegistrySnapshot(agents, current.version + 1)
 
     def register(self, agent: BaseAgent) -> None:
-        self._agents[agent.name] = agent
+        self[agent.name] = agent
+
+    def register_many(self, agents: Iterable[BaseAgent]) -> None:
+        """Register several agents in one published snapshot."""
+
+        chosen = list(agents)
+        self._publish(
+            lambda current: current.update((agent.name, agent) for agent in chosen)
+        )
+
+    def swap(self, agent: BaseAgent) -> BaseAgent:
+        """Atomically replace the agent registered under ``agent.name``.
+
+        The replacement keeps the old agent's priority slot. Queries already
+        dispatched finish on the old agent; later ones see the new one.
+        Returns the agent that was replaced.
+        """
+
+        replaced: List[BaseAgent] = []
+
+        def change(agents: Dict[str, BaseAgent]) -> None:
+            replaced.append(agents[agent.name])
+            agents[agent.name] = agent
+
+        self._publish(change)
+        return replaced[0]
+
+    def reload(self, name: str) -> BaseAgent:
+        """Hot-reload a lazy agent: re-import its module and swap in a fresh stand-in."""
+
+        agent = self[name]
+        if not isinstance(agent, LazyAgent):
+            raise TypeError(f"Agent {name!r} is not lazy; use swap() to replace it.")
+        return self.swap(agent.reloaded())
+
+    def register_lazy(
+        self,
+        name: str,
+        target: Union[str, AgentFactory],
+        keywords: Iterable[str] = (),
+        *,
+        description: Optional[str] = None,
+    ) -> LazyAgent:
+        """Register an agent that is only imported when a query routes to it."""
+
+        agent = LazyAgent(name, target, keywords, description=description)
+        self.register(agent)
+        return agent
+
+    @property
+    def matcher(self) -> CompiledAgentMatcher:
+        """Matcher compiled from the current snapshot, rebuilt after any mutation."""
+
+        return self._snapshot.matcher
+
+    def match(
+        self, query: AgentQuery, calls: Optional[List[int]] = None
+    ) -> BaseAgent | None:
+        """Return the first agent, in registration order, that accepts the query."""
+
+        return self.matcher.match(query, calls)
+
+    async def amatch(
+        self, query: AgentQuery, calls: Optional[List[int]] = None
+    ) -> BaseAgent | None:
+        """Async variant of :meth:`match`."""
+
+        return await self.matcher.amatch(query, calls)
+
+    def candidates(self, query: AgentQuery, limit: int) -> List[BaseAgent]:
+        """Return up to ``limit`` agents that accept the query, best first."""
+
+        return self.matcher.candidates(query, limit)
+
+    async def acandidates(self, query: AgentQuery, limit: int) -> List[BaseAgent]:
+        """Async variant of :meth:`candidates`."""
+
+        return await self.matcher.acandidates(query, limit)
+
+    def match_many(
+        self, queries: Sequence[AgentQuery], calls: Optional[List[int]] = None
+    ) -> List[Optional[BaseAgent]]:
+        """Match a batch of queries against a single compiled matcher."""
+
+        return self.matcher.match_many(queries, calls)
 
     def find_best_agent(self, query_text: str) -> BaseAgent | None:
         """Return the first agent whose matcher accepts the query."""
 
-        for agent in self._agents.values():
-            if agent.can_handle(AgentQuery(text=query_text)):
-                return agent
-        return None
+        return self.match(AgentQuery(text=query_text))
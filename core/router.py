@@ -2,31 +2,824 @@
 
 from __future__ import annotations
 
-from typing import Iterable
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import monotonic, perf_counter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
+from .admission import DEADLINE, AdmissionControl, AdmissionPolicy
 from .base import BaseAgent
+from .cache import RoutingCache, RoutingDecision
 from .contexts import AgentQuery, AgentResult
+from .dispatch import DispatchEntry, DispatchTable
+from .intents import IntentSplitter
+from .lazy import LazyAgent
+from .matcher import CompiledAgentMatcher
+from .metrics import RoutingMetrics
 from .registry import AgentRegistry
+from .session import SessionAffinity
+from .speculative import SpeculationPolicy, SpeculativeDispatch
+
+if (
+    TYPE_CHECKING
+):  # pragma: no cover - NumPy is only imported when semantic routing is used
+    from .semantic import SemanticRouter
+
+# A routing outcome: the chosen agent and how it was reached. ``via`` is None
+# for a direct match, otherwise "semantic" or "fallback" (also the debug flag).
+Route = Tuple[Optional[BaseAgent], Optional[str]]
 
 
 class RoutingAgent(BaseAgent):
-    """Generic routing agent that delegates to the first matching sub-agent."""
+    """Generic routing agent that delegates to the first matching sub-agent.
+
+    When ``fallback`` names a registered agent, queries that no agent claims are
+    sent there instead of producing the "could not determine" response. An
+    optional :class:`~core.cache.RoutingCache` memoises routing decisions for
+    repeated query texts until the registry changes. With a
+    :class:`~core.speculative.SpeculationPolicy` the top matching agents race
+    each other and the first acceptable answer wins. A
+    :class:`~core.semantic.SemanticRouter` gets a chance to place queries that
+    no keyword claims before the fallback is used. Attaching
+    :class:`~core.metrics.RoutingMetrics` records hit counts, ``can_handle``
+    evaluations and the match/handle time split for every query. An
+    :class:`~core.admission.AdmissionPolicy` caps each agent's concurrency and
+    queue and enforces per-query deadlines, shedding excess load to a cheaper
+    agent with the reason in ``debug["shed"]``; speculative candidates need
+    slots too. :class:`~core.session.SessionAffinity`
+    keeps a conversation's follow-up queries on the agent that served it last.
+    With an :class:`~core.intents.IntentSplitter`, a query that asks for several
+    things is split into parts that are routed and run concurrently, and the
+    answers are merged into one result.
+
+    Routers can be nested: a child router claims a query only if it would
+    dispatch it somewhere. With ``flatten=True`` the whole tree is compiled into
+    one :class:`~core.dispatch.DispatchTable`, so nested keyword agents are
+    matched in a single scan; ``routed_to`` still names the top-level child and
+    ``debug["path"]`` lists the full route.
+    """
 
-    def __init__(self, name: str, agents: Iterable[BaseAgent]) -> None:
+    def __init__(
+        self,
+        name: str,
+        agents: Iterable[BaseAgent],
+        *,
+        fallback: str | None = None,
+        cache: RoutingCache | None = None,
+        speculation: SpeculationPolicy | None = None,
+        semantic: SemanticRouter | None = None,
+        metrics: RoutingMetrics | None = None,
+        flatten: bool = False,
+        admission: AdmissionPolicy | None = None,
+        sessions: SessionAffinity | None = None,
+        splitter: IntentSplitter | None = None,
+    ) -> None:
         super().__init__(name=name)
         self.registry = AgentRegistry(agents)
+        self.fallback = fallback
+        self.cache = cache
+        self.speculation = speculation
+        self.semantic = semantic
+        self.metrics = metrics
+        self.flatten = flatten
+        self._table: DispatchTable | None = None
+        self.admission = admission
+        self._admission = AdmissionControl(admission) if admission else None
+        self.sessions = sessions
+        self.splitter = splitter
+        self._speculative = SpeculativeDispatch(speculation) if speculation else None
+        self._speculative_pool: ThreadPoolExecutor | None = None
+        self._fan_out_pool: ThreadPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Shut down the worker threads this router has started.
+
+        Pools are created again on demand, so a closed router still routes.
+        """
+
+        with self._pool_lock:
+            pools = [self._speculative_pool, self._fan_out_pool]
+            self._speculative_pool = self._fan_out_pool = None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=True)
 
-    def can_handle(self, query: AgentQuery) -> bool:  # pragma: no cover - router always handles
-        return True
+    def _pool(self, attribute: str, purpose: str) -> ThreadPoolExecutor:
+        """Return the pool stored in ``attribute``, creating it on first use."""
+
+        pool: ThreadPoolExecutor | None = getattr(self, attribute)
+        if pool is None:
+            with self._pool_lock:
+                pool = getattr(self, attribute)
+                if pool is None:
+                    pool = ThreadPoolExecutor(
+                        thread_name_prefix=f"{self.name}-{purpose}"
+                    )
+                    setattr(self, attribute, pool)
+        return pool
+
+    def can_handle(self, query: AgentQuery) -> bool:
+        """Claim the query only if this router would dispatch it to an agent."""
+
+        if self.fallback is not None:
+            return True
+        return self._resolve(self._matcher().match(query), query)[0] is not None
+
+    def dispatch_table(self) -> DispatchTable:
+        """Return the flattened table, rebuilding it if any nested registry changed."""
+
+        table = self._table
+        if table is None or not table.is_current():
+            table = self._table = DispatchTable(self)
+        return table
 
     def handle(self, query: AgentQuery) -> AgentResult:
-        for agent in self.registry.values():
-            if agent.can_handle(query):
-                result = agent.handle(query)
-                result.routed_to = agent.name
-                result.debug.setdefault("router", self.name)
+        if self.splitter is not None:
+            parts = self.splitter.split(query, self._matcher().match)
+            if len(parts) > 1:
+                pool = self._pool("_fan_out_pool", "fan-out")
+                results = list(pool.map(self._handle_one, parts))
+                return self._merge(parts, results)
+        return self._handle_one(query)
+
+    def _handle_one(self, query: AgentQuery) -> AgentResult:
+        metrics = self.metrics
+        started = perf_counter() if metrics is not None else 0.0
+        calls = [0] if metrics is not None else None
+
+        sticky = self._sticky(query) if self.sessions is not None else None
+        if sticky is not None:
+            agent, via = sticky
+        elif self._speculative is not None:
+            route = self._decide(query, calls)
+            candidates = self._candidates(query, route[0])
+            if len(candidates) > 1:
+                matched = perf_counter() if metrics is not None else 0.0
+                result, winner, via = self._speculate(candidates, query)
+                self._remember(query, (winner if via else candidates[0], None))
+                if metrics is not None:
+                    self._observe(metrics, result, winner, via, calls, started, matched)
                 return result
+            agent, via = self._remember(query, route)
+        else:
+            agent, via = self._remember(query, self._decide(query, calls))
+
+        matched = perf_counter() if metrics is not None else 0.0
+        if agent is None:
+            result = self._unrouted()
+        elif self._admission is not None:
+            result, agent, via = self._admit(self._admission, agent, via, query)
+        else:
+            result = self._annotate(agent.handle(query), agent, via)
+        if metrics is not None:
+            self._observe(metrics, result, agent, via, calls, started, matched)
+        return result
+
+    async def ahandle(self, query: AgentQuery) -> AgentResult:
+        """Route the query without blocking the running event loop.
+
+        Matching happens inline; the chosen agent runs through its ``ahandle``,
+        so many queries can be awaited concurrently on a single loop.
+        """
+
+        if self.splitter is not None:
+            parts = self.splitter.split(query, self._matcher().match)
+            if len(parts) > 1:
+                import asyncio
+
+                results = await asyncio.gather(
+                    *(self._ahandle_one(part) for part in parts)
+                )
+                return self._merge(parts, list(results))
+        return await self._ahandle_one(query)
+
+    async def _ahandle_one(self, query: AgentQuery) -> AgentResult:
+        metrics = self.metrics
+        started = perf_counter() if metrics is not None else 0.0
+        calls = [0] if metrics is not None else None
+
+        sticky = self._sticky(query) if self.sessions is not None else None
+        if sticky is not None:
+            agent, via = sticky
+        elif self._speculative is not None:
+            route = await self._adecide(query, calls)
+            candidates = await self._acandidates(query, route[0])
+            if len(candidates) > 1:
+                matched = perf_counter() if metrics is not None else 0.0
+                result, winner, via = await self._aspeculate(candidates, query)
+                self._remember(query, (winner if via else candidates[0], None))
+                if metrics is not None:
+                    self._observe(metrics, result, winner, via, calls, started, matched)
+                return result
+            agent, via = self._remember(query, route)
+        else:
+            agent, via = self._remember(query, await self._adecide(query, calls))
+
+        matched = perf_counter() if metrics is not None else 0.0
+        if agent is None:
+            result = self._unrouted()
+        elif self._admission is not None:
+            result, agent, via = await self._aadmit(self._admission, agent, via, query)
+        else:
+            result = self._annotate(await agent.ahandle(query), agent, via)
+        if metrics is not None:
+            self._observe(metrics, result, agent, via, calls, started, matched)
+        return result
+
+    def handle_many(self, queries: Iterable[AgentQuery]) -> List[AgentResult]:
+        """Route a batch of queries, dispatching each agent's share in bulk.
+
+        Results are returned in input order and carry the same ``routed_to`` and
+        ``debug`` annotations as :meth:`handle`. Speculation, admission
+        control and intent splitting are not applied to batches.
+        """
+
+        batch = list(queries)
+        results: List[Optional[AgentResult]] = [None] * len(batch)
+        groups: Dict[
+            Tuple[str, Optional[str]], Tuple[BaseAgent, Optional[str], List[int]]
+        ] = {}
+        metrics = self.metrics
+        started = perf_counter() if metrics is not None else 0.0
+        calls = [0] if metrics is not None else None
+
+        for index, (agent, via) in enumerate(self._route_many(batch, calls)):
+            if agent is None:
+                results[index] = self._unrouted()
+                continue
+            group = groups.get((agent.name, via))
+            if group is None:
+                group = groups[agent.name, via] = (agent, via, [])
+            group[2].append(index)
+
+        match_each = 0.0
+        if metrics is not None and batch:
+            # Batch timings are amortised evenly over the queries that shared them.
+            match_each = (perf_counter() - started) / len(batch)
+            metrics.count_can_handle_calls(calls[0] if calls else 0)
+            for result in results:
+                if result is not None:  # only unrouted queries have results yet
+                    metrics.record(None, None, 0, match_each, 0.0)
+
+        for agent, via, indices in groups.values():
+            group_started = perf_counter() if metrics is not None else 0.0
+            handled = agent.handle_many([batch[index] for index in indices])
+            for index, result in zip(indices, handled):
+                results[index] = self._annotate(result, agent, via)
+            if metrics is not None:
+                handle_each = (perf_counter() - group_started) / len(indices)
+                for _ in indices:
+                    metrics.record(agent.name, via, 0, match_each, handle_each)
+
+        return results  # type: ignore[return-value]
+
+    def _decide(self, query: AgentQuery, calls: Optional[List[int]] = None) -> Route:
+        """Pick the agent for ``query``, consulting the decision cache if enabled."""
+
+        cache = self.cache
+        if cache is None:
+            return self._resolve(self._matcher().match(query, calls), query)
+
+        stamp = self._cache_stamp()
+        key = cache.key(query)
+        decision = cache.get(key, stamp)
+        cached = self._from_decision(decision) if decision is not None else None
+        if cached is not None:
+            return cached
+
+        route = self._resolve(self._matcher().match(query, calls), query)
+        cache.put(key, stamp, self._to_decision(route))
+        return route
+
+    async def _adecide(
+        self, query: AgentQuery, calls: Optional[List[int]] = None
+    ) -> Route:
+        cache = self.cache
+        if cache is None:
+            return self._resolve(await self._matcher().amatch(query, calls), query)
+
+        stamp = self._cache_stamp()
+        key = cache.key(query)
+        decision = cache.get(key, stamp)
+        cached = self._from_decision(decision) if decision is not None else None
+        if cached is not None:
+            return cached
+
+        route = self._resolve(await self._matcher().amatch(query, calls), query)
+        cache.put(key, stamp, self._to_decision(route))
+        return route
+
+    def _decide_many(
+        self, batch: List[AgentQuery], calls: Optional[List[int]] = None
+    ) -> List[Route]:
+        cache = self.cache
+        if cache is None:
+            return self._resolve_many(batch, self._matcher().match_many(batch, calls))
+
+        stamp = self._cache_stamp()
+        keys = [cache.key(query) for query in batch]
+        routes: List[Optional[Route]] = []
+        misses: List[int] = []
+        for index, key in enumerate(keys):
+            decision = cache.get(key, stamp)
+            cached = self._from_decision(decision) if decision is not None else None
+            if cached is None:
+                misses.append(index)
+            routes.append(cached)
+
+        pending = [batch[index] for index in misses]
+        resolved = self._resolve_many(
+            pending, self._matcher().match_many(pending, calls)
+        )
+        for index, route in zip(misses, resolved):
+            routes[index] = route
+            cache.put(keys[index], stamp, self._to_decision(route))
+        return routes  # type: ignore[return-value]
+
+    def _route_many(
+        self, batch: List[AgentQuery], calls: Optional[List[int]] = None
+    ) -> List[Route]:
+        """Route a batch, serving sticky sessions before matching the rest."""
+
+        if self.sessions is None:
+            return self._decide_many(batch, calls)
+
+        routes = [self._sticky(query) for query in batch]
+        misses = [index for index, route in enumerate(routes) if route is None]
+        decided = self._decide_many([batch[index] for index in misses], calls)
+        for index, route in zip(misses, decided):
+            routes[index] = self._remember(batch[index], route)
+        return routes  # type: ignore[return-value]
+
+    def _sticky(self, query: AgentQuery) -> Optional[Route]:
+        """Return the session's pinned route, or None to route the query normally."""
+
+        sessions = self.sessions
+        assert sessions is not None
+        session = sessions.session(query)
+        if session is None or query.metadata.get(sessions.override_key):
+            return None
+        name = sessions.get(session)
+        agent = self._agent_named(name) if name is not None else None
+        if agent is None:
+            return None
+        if sessions.switch_on_keyword:
+            matched = self._matcher().keyword_match(query)
+            if matched is not None and matched.name != name:
+                sessions.put(session, matched.name, switch=True)
+                return matched, None
+        return agent, "session"
+
+    def _remember(self, query: AgentQuery, route: Route) -> Route:
+        sessions = self.sessions
+        if sessions is not None and route[0] is not None:
+            session = sessions.session(query)
+            if session is not None:
+                sessions.put(session, route[0].name)
+        return route
+
+    def _agent_named(self, name: str) -> Optional[BaseAgent]:
+        if self.flatten:
+            entry = self.dispatch_table().entries.get(name)
+            if entry is not None:
+                return entry
+        return self.registry.get(name)
+
+    def _matcher(self) -> CompiledAgentMatcher:
+        if self.flatten:
+            return self.dispatch_table().matcher
+        return self.registry.matcher
+
+    def _cache_stamp(self) -> Hashable:
+        table = self.dispatch_table().stamp if self.flatten else None
+        return (self.registry.version, self.fallback, self.semantic is not None, table)
+
+    def _from_decision(self, decision: RoutingDecision) -> Optional[Route]:
+        """Rebuild a cached route, or None if its agent was removed meanwhile."""
+
+        if decision.agent is None:
+            return None, None
+        agent = self._agent_named(decision.agent)
+        return (agent, decision.via) if agent is not None else None
+
+    @staticmethod
+    def _to_decision(route: Route) -> RoutingDecision:
+        agent, via = route
+        return RoutingDecision(agent.name if agent is not None else None, via)
+
+    def _resolve(self, agent: BaseAgent | None, query: AgentQuery) -> Route:
+        """Apply the semantic stage and fallback policy to a matcher decision."""
 
+        return self._resolve_many([query], [agent])[0]
+
+    def _resolve_many(
+        self, batch: List[AgentQuery], matched: List[Optional[BaseAgent]]
+    ) -> List[Route]:
+        routes: List[Route] = [(agent, None) for agent in matched]
+        unmatched = [index for index, agent in enumerate(matched) if agent is None]
+        if not unmatched:
+            return routes
+
+        if self.semantic is not None:
+            picks = self.semantic.route_many(
+                [batch[index].text for index in unmatched], self.registry
+            )
+            still_unmatched = []
+            for index, (name, _score) in zip(unmatched, picks):
+                if name is None:
+                    still_unmatched.append(index)
+                else:
+                    routes[index] = (self.registry[name], "semantic")
+            unmatched = still_unmatched
+
+        if self.fallback is not None:
+            fallback = self.registry[self.fallback]
+            for index in unmatched:
+                routes[index] = (fallback, "fallback")
+        return routes
+
+    def _annotate(
+        self, result: AgentResult, agent: BaseAgent, via: Optional[str]
+    ) -> AgentResult:
+        result.routed_to = (
+            agent.path[0] if isinstance(agent, DispatchEntry) else agent.name
+        )
+        result.debug.setdefault("router", self.name)
+        if via is not None:
+            result.debug[via] = True
+        return result
+
+    def _admit(
+        self,
+        control: AdmissionControl,
+        agent: BaseAgent,
+        via: Optional[str],
+        query: AgentQuery,
+    ) -> Tuple[AgentResult, Optional[BaseAgent], Optional[str]]:
+        """Run ``agent`` once admitted, or shed the query; return the result and route."""
+
+        reason = control.acquire(agent.name, control.deadline(query))
+        if reason is not None:
+            return self._shed(control, agent, reason, query)
+        return self._run_admitted(control, agent, via, query)
+
+    def _run_admitted(
+        self,
+        control: AdmissionControl,
+        agent: BaseAgent,
+        via: Optional[str],
+        query: AgentQuery,
+    ) -> Tuple[AgentResult, Optional[BaseAgent], Optional[str]]:
+        try:
+            result = agent.handle(query)
+        finally:
+            control.release(agent.name)
+        return self._annotate(result, agent, via), agent, via
+
+    async def _aadmit(
+        self,
+        control: AdmissionControl,
+        agent: BaseAgent,
+        via: Optional[str],
+        query: AgentQuery,
+    ) -> Tuple[AgentResult, Optional[BaseAgent], Optional[str]]:
+        """Async variant of :meth:`_admit`; the deadline also bounds the agent's run."""
+
+        deadline = control.deadline(query)
+        reason = await control.aacquire(agent.name, deadline)
+        if reason is not None:
+            return await self._ashed(control, agent, reason, query)
+        return await self._arun_admitted(control, agent, via, deadline, query)
+
+    async def _arun_admitted(
+        self,
+        control: AdmissionControl,
+        agent: BaseAgent,
+        via: Optional[str],
+        deadline: Optional[float],
+        query: AgentQuery,
+    ) -> Tuple[AgentResult, Optional[BaseAgent], Optional[str]]:
+        import asyncio
+
+        target = _sync_target(agent)
+        if target is not None:
+            result = await self._aadmit_sync(control, agent, target, deadline, query)
+        else:
+            try:
+                if deadline is None:
+                    result = await agent.ahandle(query)
+                else:
+                    result = await asyncio.wait_for(
+                        agent.ahandle(query), max(deadline - monotonic(), 0.0)
+                    )
+            except asyncio.TimeoutError:
+                control.record_shed(agent.name)
+                result = None
+            finally:
+                control.release(agent.name)
+        if result is None:
+            return await self._ashed(control, agent, DEADLINE, query)
+        return self._annotate(result, agent, via), agent, via
+
+    async def _aadmit_sync(
+        self,
+        control: AdmissionControl,
+        agent: BaseAgent,
+        target: BaseAgent,
+        deadline: Optional[float],
+        query: AgentQuery,
+    ) -> Optional[AgentResult]:
+        """Run a sync-only agent on its executor, holding the slot until the thread is done.
+
+        A timed-out ``await`` cannot stop a running thread, so the slot is
+        released by the worker itself rather than when the caller gives up;
+        work still queued when the deadline passes is skipped. Returns None
+        once the deadline has passed.
+        """
+
+        import asyncio
+
+        def run() -> Optional[AgentResult]:
+            try:
+                if deadline is not None and deadline <= monotonic():
+                    return None
+                return agent.handle(query)
+            finally:
+                control.release(agent.name)
+
+        try:
+            work = asyncio.get_running_loop().run_in_executor(target.executor, run)
+        except BaseException:
+            control.release(agent.name)
+            raise
+        try:
+            if deadline is None:
+                result = await asyncio.shield(work)
+            else:
+                result = await asyncio.wait_for(
+                    asyncio.shield(work), max(deadline - monotonic(), 0.0)
+                )
+        except asyncio.TimeoutError:
+            result = None
+        if result is None:
+            control.record_shed(agent.name)
+        return result
+
+    def _candidates(
+        self, query: AgentQuery, agent: Optional[BaseAgent]
+    ) -> List[BaseAgent]:
+        """Return the agents to race: ``agent``, as routing chose it, then runners-up.
+
+        Runners-up come from the same matcher routing uses, so a flattened
+        router races the leaves of its dispatch table.
+        """
+
+        speculative = self._speculative
+        if agent is None or speculative is None:
+            return []
+        limit = speculative.policy.candidates
+        others = [
+            other
+            for other in self._matcher().candidates(query, limit)
+            if other.name != agent.name
+        ]
+        return [agent, *others[: limit - 1]]
+
+    async def _acandidates(
+        self, query: AgentQuery, agent: Optional[BaseAgent]
+    ) -> List[BaseAgent]:
+        speculative = self._speculative
+        if agent is None or speculative is None:
+            return []
+        limit = speculative.policy.candidates
+        others = [
+            other
+            for other in await self._matcher().acandidates(query, limit)
+            if other.name != agent.name
+        ]
+        return [agent, *others[: limit - 1]]
+
+    def _speculate(
+        self, candidates: List[BaseAgent], query: AgentQuery
+    ) -> Tuple[AgentResult, Optional[BaseAgent], Optional[str]]:
+        """Race ``candidates``, letting each in through admission control first.
+
+        The top candidate waits for a slot like any routed query and is shed
+        if it gets none; the others join the race only if a slot is free right
+        away. A slot stays taken until its candidate's run ends, even after
+        that candidate has lost. Returns the result and route, like :meth:`_admit`.
+        """
+
+        speculative = self._speculative
+        assert speculative is not None
+        control = self._admission
+        release = None
+        if control is not None:
+            primary = candidates[0]
+            reason = control.acquire(primary.name, control.deadline(query))
+            if reason is not None:
+                return self._shed(control, primary, reason, query)
+            candidates = [primary] + [
+                agent for agent in candidates[1:] if control.try_acquire(agent.name)
+            ]
+            if len(candidates) == 1:
+                return self._run_admitted(control, primary, None, query)
+            release = control.release
+        pool = self._pool("_speculative_pool", "speculative")
+        winner, result, report = speculative.run(
+            candidates, query, pool, release=release
+        )
+        return self._annotate_speculative(result, winner, report), winner, "speculative"
+
+    async def _aspeculate(
+        self, candidates: List[BaseAgent], query: AgentQuery
+    ) -> Tuple[AgentResult, Optional[BaseAgent], Optional[str]]:
+        """Async variant of :meth:`_speculate`."""
+
+        speculative = self._speculative
+        assert speculative is not None
+        control = self._admission
+        if control is None:
+            winner, result, report = await speculative.arun(candidates, query)
+        else:
+            primary = candidates[0]
+            deadline = control.deadline(query)
+            reason = await control.aacquire(primary.name, deadline)
+            if reason is not None:
+                return await self._ashed(control, primary, reason, query)
+            candidates = [primary] + [
+                agent for agent in candidates[1:] if control.try_acquire(agent.name)
+            ]
+            if len(candidates) == 1:
+                return await self._arun_admitted(
+                    control, primary, None, deadline, query
+                )
+            winner, result, report = await speculative.arun(
+                candidates, query, start=lambda agent: self._held(control, agent, query)
+            )
+        return self._annotate_speculative(result, winner, report), winner, "speculative"
+
+    def _held(
+        self, control: AdmissionControl, agent: BaseAgent, query: AgentQuery
+    ) -> Awaitable[AgentResult]:
+        """Start ``agent`` on a slot it already holds; the slot is freed once the work ends.
+
+        A sync-only agent's thread cannot be cancelled, so its slot follows the
+        thread rather than the awaiting task. Without an executor of its own
+        it runs on the speculative pool.
+        """
+
+        import asyncio
+
+        target = _sync_target(agent)
+        work: Union[Future[AgentResult], asyncio.Future[AgentResult]]
+        if target is not None:
+            executor = target.executor or self._pool("_speculative_pool", "speculative")
+            work = executor.submit(agent.handle, query)
+            future = asyncio.wrap_future(work)
+        else:
+            work = future = asyncio.ensure_future(agent.ahandle(query))
+        work.add_done_callback(lambda _: control.release(agent.name))
+        return future
+
+    def _substitute(self, agent: BaseAgent) -> Optional[BaseAgent]:
+        name = self.admission.shed_to if self.admission else None
+        name = name or self.fallback
+        if name is None or name == agent.name:
+            return None
+        return self.registry.get(name)
+
+    def _shed(
+        self,
+        control: AdmissionControl,
+        agent: BaseAgent,
+        reason: str,
+        query: AgentQuery,
+    ) -> Tuple[AgentResult, Optional[BaseAgent], Optional[str]]:
+        substitute = self._substitute(agent)
+        if substitute is None or not control.try_acquire(substitute.name):
+            return self._overloaded(agent, reason), None, None
+        try:
+            result = substitute.handle(query)
+        finally:
+            control.release(substitute.name)
+        return (
+            self._annotate_shed(result, substitute, agent, reason),
+            substitute,
+            "shed",
+        )
+
+    async def _ashed(
+        self,
+        control: AdmissionControl,
+        agent: BaseAgent,
+        reason: str,
+        query: AgentQuery,
+    ) -> Tuple[AgentResult, Optional[BaseAgent], Optional[str]]:
+        substitute = self._substitute(agent)
+        if substitute is None or not control.try_acquire(substitute.name):
+            return self._overloaded(agent, reason), None, None
+        try:
+            result = await substitute.ahandle(query)
+        finally:
+            control.release(substitute.name)
+        return (
+            self._annotate_shed(result, substitute, agent, reason),
+            substitute,
+            "shed",
+        )
+
+    def _annotate_shed(
+        self, result: AgentResult, substitute: BaseAgent, agent: BaseAgent, reason: str
+    ) -> AgentResult:
+        result = self._annotate(result, substitute, None)
+        result.debug["shed"] = {"agent": agent.name, "reason": reason}
+        return result
+
+    def _annotate_speculative(
+        self, result: AgentResult, agent: BaseAgent, report: Dict[str, Any]
+    ) -> AgentResult:
+        result = self._annotate(result, agent, None)
+        result.debug["speculative"] = report
+        return result
+
+    def _observe(
+        self,
+        metrics: RoutingMetrics,
+        result: AgentResult,
+        agent: BaseAgent | None,
+        via: Optional[str],
+        calls: Optional[List[int]],
+        started: float,
+        matched: float,
+    ) -> None:
+        finished = perf_counter()
+        evaluated = calls[0] if calls else 0
+        metrics.record(
+            agent.name if agent is not None else None,
+            via,
+            evaluated,
+            matched - started,
+            finished - matched,
+        )
+        if metrics.debug:
+            result.debug["metrics"] = {
+                "match_seconds": matched - started,
+                "handle_seconds": finished - matched,
+                "can_handle_calls": evaluated,
+            }
+
+    def _merge(
+        self, parts: List[AgentQuery], results: List[AgentResult]
+    ) -> AgentResult:
+        """Combine per-part answers; ``routed_to`` is the first part's agent."""
+
+        return AgentResult(
+            text="\n\n".join(result.text for result in results),
+            routed_to=results[0].routed_to,
+            debug={
+                "router": self.name,
+                "split": True,
+                "parts": [
+                    {
+                        "text": part.text,
+                        "routed_to": result.routed_to,
+                        "debug": result.debug,
+                    }
+                    for part, result in zip(parts, results)
+                ],
+            },
+        )
+
+    def _overloaded(self, agent: BaseAgent, reason: str) -> AgentResult:
+        return AgentResult(
+            text=(
+                "The assistant for your request is busy right now. "
+                "Please try again shortly."
+            ),
+            routed_to=None,
+            debug={
+                "router": self.name,
+                "reason": "deadline exceeded"
+                if reason == DEADLINE
+                else "agent overloaded",
+                "shed": {"agent": agent.name, "reason": reason},
+            },
+        )
+
+    def _unrouted(self) -> AgentResult:
         return AgentResult(
             text=(
                 "I could not determine the best assistant for your request. "
@@ -35,3 +828,16 @@ class RoutingAgent(BaseAgent):
             routed_to=None,
             debug={"router": self.name, "reason": "no matching agent"},
         )
+
+
+def _sync_target(agent: BaseAgent) -> Optional[BaseAgent]:
+    """Return the agent doing ``agent``'s work if it runs on an executor thread, else None."""
+
+    while True:
+        if isinstance(agent, DispatchEntry):
+            agent = agent.leaf
+        elif isinstance(agent, LazyAgent):
+            agent = agent.agent
+        else:
+            break
+    return agent if type(agent).ahandle is BaseAgent.ahandle else None
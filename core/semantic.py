@@ -0,0 +1,194 @@
+"""Offline semantic routing stage built on hashed TF-IDF vectors.
+
+Each agent is described by its name, docstring (or ``DESCRIPTION``) and
+keywords. Descriptions and queries are hashed into a fixed number of word and
+character n-gram buckets, weighted with TF-IDF and compared by cosine
+similarity, so no vocabulary or model download is needed.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import zlib
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .base import BaseAgent
+from .lazy import LazyAgent
+
+try:  # pragma: no cover - optional import
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - executed only when NumPy missing
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .registry import AgentRegistry
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+class SemanticRouterNotAvailableError(RuntimeError):
+    """Raised when the semantic router is used without NumPy installed."""
+
+
+def describe_agent(agent: BaseAgent) -> str:
+    """Return the text used to represent ``agent`` in the semantic index."""
+
+    description = getattr(agent, "DESCRIPTION", None)
+    if description is None and isinstance(agent, LazyAgent):
+        # The stand-in's docstring says nothing about the agent behind it, and
+        # importing the target just to read its docstring would defeat laziness.
+        description = (type(agent.agent).__doc__ or "") if agent.loaded else ""
+    elif description is None:
+        description = type(agent).__doc__ or ""
+    phrases = sorted(getattr(agent, "KEYWORDS", ()) or ())
+    # Inflected forms ("schedules" after "schedule") add little beyond their stem's
+    # n-grams and would only dilute the description, so stems stand in for them.
+    stems = [
+        k
+        for k in phrases
+        if not any(k != other and k.startswith(other) for other in phrases)
+    ]
+    keywords = " ".join(stems)
+    name = agent.name.replace("_", " ")
+    # Keywords are the strongest signal available, so they are counted twice.
+    return " ".join((name, description, keywords, keywords))
+
+
+class SemanticRouter:
+    """Scores queries against agent descriptions with one matrix product.
+
+    ``threshold`` is the minimum cosine similarity for a query to be routed;
+    below it :meth:`route_many` returns ``None`` so the caller can fall back.
+    The default is calibrated on ``benchmarks.corpus.PARAPHRASES`` (see
+    ``python -m benchmarks.routing --calibrate-semantic``): unrelated text
+    scores about 0.05 against every agent, keyword-free paraphrases 0.06 and up.
+    The index is rebuilt whenever the registry version changes.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold: float = 0.06,
+        dimensions: int = 1 << 12,
+        char_ngrams: Tuple[int, int] = (3, 5),
+        exclude: Iterable[str] = (),
+        batch_size: int = 1024,
+    ) -> None:
+        if np is None:
+            raise SemanticRouterNotAvailableError(
+                "numpy is not installed. Install the 'semantic' extra to use the semantic router."
+            )
+        self.threshold = threshold
+        self.dimensions = dimensions
+        self.char_ngrams = char_ngrams
+        self.exclude = frozenset(exclude)
+        self.batch_size = batch_size
+        # (agent names, agent matrix, idf weights), swapped in as one unit.
+        self._index: Tuple[List[str], "np.ndarray", "np.ndarray"] = (
+            [],
+            np.zeros((0, dimensions), dtype=np.float32),
+            np.ones(dimensions, dtype=np.float32),
+        )
+        self._indexed: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    # ---------------------------------------------------------------- features
+    def _features(self, text: str) -> Dict[int, int]:
+        tokens = _TOKEN_RE.findall(text.lower())
+        grams: List[str] = list(tokens)
+        grams.extend(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+        low, high = self.char_ngrams
+        for token in tokens:
+            padded = f"<{token}>"
+            for size in range(low, high + 1):
+                grams.extend(
+                    "#" + padded[start : start + size]
+                    for start in range(max(1, len(padded) - size + 1))
+                )
+
+        counts: Dict[int, int] = {}
+        for gram in grams:
+            bucket = zlib.crc32(gram.encode("utf-8")) % self.dimensions
+            counts[bucket] = counts.get(bucket, 0) + 1
+        return counts
+
+    def _vectorize(self, texts: Sequence[str], idf: "np.ndarray") -> "np.ndarray":
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts = self._features(text)
+            if counts:
+                columns = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+                values = np.fromiter(
+                    counts.values(), dtype=np.float32, count=len(counts)
+                )
+                matrix[row, columns] = 1.0 + np.log(values)
+        matrix *= idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    # ------------------------------------------------------------------- index
+    def fit(self, agents: Iterable[BaseAgent]) -> None:
+        """Build the agent matrix from ``agents``."""
+
+        chosen = [agent for agent in agents if agent.name not in self.exclude]
+        documents = [self._features(describe_agent(agent)) for agent in chosen]
+        frequency = np.zeros(self.dimensions, dtype=np.float32)
+        for counts in documents:
+            frequency[list(counts)] += 1.0
+        total = len(documents)
+        idf = (np.log((1.0 + total) / (1.0 + frequency)) + 1.0).astype(np.float32)
+        matrix = self._vectorize([describe_agent(agent) for agent in chosen], idf)
+        self._index = ([agent.name for agent in chosen], matrix, idf)
+
+    def _ensure_index(self, registry: "AgentRegistry") -> None:
+        snapshot = registry.snapshot()
+        stamp = (id(registry), snapshot.version)
+        if self._indexed == stamp:
+            return
+        with self._lock:
+            if self._indexed != stamp:
+                self.fit(snapshot.agents.values())
+                self._indexed = stamp
+
+    # ----------------------------------------------------------------- routing
+    def scores(self, texts: Sequence[str], registry: "AgentRegistry") -> "np.ndarray":
+        """Return a ``(len(texts), agents)`` matrix of cosine similarities."""
+
+        return self._scores(texts, registry)[1]
+
+    def _scores(
+        self, texts: Sequence[str], registry: "AgentRegistry"
+    ) -> Tuple[List[str], "np.ndarray"]:
+        self._ensure_index(registry)
+        names, agents, idf = self._index
+        if not texts or not names:
+            return names, np.zeros((len(texts), len(names)), dtype=np.float32)
+        blocks = [
+            self._vectorize(texts[start : start + self.batch_size], idf) @ agents.T
+            for start in range(0, len(texts), self.batch_size)
+        ]
+        return names, np.vstack(blocks)
+
+    def route_many(
+        self, texts: Sequence[str], registry: "AgentRegistry"
+    ) -> List[Tuple[Optional[str], float]]:
+        """Return ``(agent name or None, score)`` for each text, in order."""
+
+        names, matrix = self._scores(texts, registry)
+        if not names:
+            return [(None, 0.0)] * len(texts)
+        best = matrix.argmax(axis=1)
+        best_scores = matrix[np.arange(len(texts)), best]
+        return [
+            (names[index] if score >= self.threshold else None, float(score))
+            for index, score in zip(best.tolist(), best_scores.tolist())
+        ]
+
+    def route(
+        self, text: str, registry: "AgentRegistry"
+    ) -> Tuple[Optional[str], float]:
+        """Single-query convenience wrapper around :meth:`route_many`."""
+
+        return self.route_many([text], registry)[0]
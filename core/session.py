@@ -0,0 +1,108 @@
+"""Session affinity: keep follow-up queries on the agent a session last used."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .contexts import AgentQuery
+
+
+class SessionAffinity:
+    """Bounded LRU table from session ids to the agent that last served them.
+
+    A query whose ``metadata[session_key]`` names a known session is sent
+    straight back to that session's agent, skipping the semantic stage and
+    fallback. Entries expire ``ttl`` seconds after the session was last seen.
+    Two overrides let a session move on: a truthy ``metadata[override_key]``
+    routes the query from scratch, and with ``switch_on_keyword`` a direct
+    keyword match for a different agent takes over the session.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 10_000,
+        ttl: float = 1800.0,
+        session_key: str = "session_id",
+        override_key: str = "reroute",
+        switch_on_keyword: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.session_key = session_key
+        self.override_key = override_key
+        self.switch_on_keyword = switch_on_keyword
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.switches = 0
+        self.expired = 0
+
+    def session(self, query: AgentQuery) -> Optional[Hashable]:
+        """Return the query's session id, or None if it has no usable one."""
+
+        session = query.metadata.get(self.session_key)
+        if session is None:
+            return None
+        try:
+            hash(session)
+        except TypeError:
+            return None
+        return session
+
+    def get(self, session: Hashable) -> Optional[str]:
+        """Return the agent name pinned to ``session`` and refresh its expiry."""
+
+        with self._lock:
+            entry = self._entries.get(session)
+            if entry is None:
+                return None
+            now = self._clock()
+            if entry[1] <= now:
+                del self._entries[session]
+                self.expired += 1
+                return None
+            self._entries[session] = (entry[0], now + self.ttl)
+            self._entries.move_to_end(session)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, session: Hashable, agent: str, *, switch: bool = False) -> None:
+        """Pin ``session`` to ``agent``; ``switch`` marks a keyword override."""
+
+        with self._lock:
+            if switch:
+                self.switches += 1
+            self._entries[session] = (agent, self._clock() + self.ttl)
+            self._entries.move_to_end(session)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def forget(self, session: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(session, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pinned lookups, keyword switches, expiries and occupancy."""
+
+        return {
+            "hits": self.hits,
+            "switches": self.switches,
+            "expired": self.expired,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
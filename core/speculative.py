@@ -0,0 +1,224 @@
+"""Speculative (hedged) dispatch of one query to several candidate agents."""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .base import BaseAgent
+from .contexts import AgentQuery, AgentResult
+
+if (
+    TYPE_CHECKING
+):  # pragma: no cover - asyncio is imported lazily to keep cold start cheap
+    import asyncio
+
+
+def _non_empty(result: AgentResult) -> bool:
+    return bool(result.text.strip())
+
+
+@dataclass(slots=True)
+class SpeculationPolicy:
+    """Opt-in settings for racing the top matching agents against each other.
+
+    ``candidates`` agents run concurrently; the first result that satisfies
+    ``accept`` within ``deadline`` seconds wins and the rest are cancelled. If
+    nothing acceptable arrives in time, the router waits for the highest
+    priority candidate, which is what non-speculative routing would return.
+    """
+
+    candidates: int = 2
+    deadline: Optional[float] = None
+    accept: Callable[[AgentResult], bool] = _non_empty
+
+    def __post_init__(self) -> None:
+        if self.candidates < 2:
+            raise ValueError("speculation needs at least two candidates")
+
+
+class SpeculativeDispatch:
+    """Runs a speculative race for a router and reports the outcome."""
+
+    def __init__(self, policy: SpeculationPolicy) -> None:
+        self.policy = policy
+
+    def run(
+        self,
+        agents: Sequence[BaseAgent],
+        query: AgentQuery,
+        executor: Executor,
+        *,
+        release: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[BaseAgent, AgentResult, Dict[str, Any]]:
+        """Race ``agents`` on ``executor``; return the winner, its result and a report.
+
+        Threads that already started cannot be interrupted, so "cancelled" sync
+        candidates are only dropped from the race, not stopped. ``release`` is
+        called with each agent's name once its run has really ended or was
+        cancelled before it started.
+        """
+
+        futures: Dict[Future[AgentResult], BaseAgent] = {
+            executor.submit(agent.handle, query): agent for agent in agents
+        }
+        if release is not None:
+            for future, agent in futures.items():
+                _release_when_done(future, release, agent.name)
+        primary = next(iter(futures))
+        report = self._report(agents)
+        stop = self._stop_time()
+
+        pending = set(futures)
+        winner: Optional[Future[AgentResult]] = None
+        while pending and winner is None:
+            done, pending = wait(
+                pending, timeout=self._remaining(stop), return_when=FIRST_COMPLETED
+            )
+            if not done:
+                report["timed_out"] = True
+                break
+            winner = self._first_acceptable(done, futures, report, _future_outcome)
+
+        if winner is None:
+            winner = primary
+
+        for future in pending:
+            if future is not winner:
+                future.cancel()
+                report["cancelled"].append(futures[future].name)
+
+        agent = futures[winner]
+        result = winner.result()
+        report["winner"] = agent.name
+        return agent, result, report
+
+    async def arun(
+        self,
+        agents: Sequence[BaseAgent],
+        query: AgentQuery,
+        *,
+        start: Optional[Callable[[BaseAgent], Awaitable[AgentResult]]] = None,
+    ) -> Tuple[BaseAgent, AgentResult, Dict[str, Any]]:
+        """Async variant of :meth:`run`; losing tasks are truly cancelled.
+
+        ``start`` begins one agent's run; by default it awaits ``agent.ahandle``.
+        """
+
+        import asyncio
+
+        if start is None:
+            start = lambda agent: agent.ahandle(query)  # noqa: E731
+        tasks: Dict[asyncio.Future[AgentResult], BaseAgent] = {
+            asyncio.ensure_future(start(agent)): agent for agent in agents
+        }
+        primary = next(iter(tasks))
+        report = self._report(agents)
+        stop = self._stop_time()
+
+        pending = set(tasks)
+        winner: Optional[asyncio.Future[AgentResult]] = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=self._remaining(stop),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    report["timed_out"] = True
+                    break
+                winner = self._first_acceptable(done, tasks, report, _task_outcome)
+
+            if winner is None:
+                winner = primary
+
+            for task in pending:
+                if task is not winner:
+                    task.cancel()
+                    report["cancelled"].append(tasks[task].name)
+
+            agent = tasks[winner]
+            result = await winner
+        finally:
+            for task in tasks:
+                task.cancel()
+        report["winner"] = agent.name
+        return agent, result, report
+
+    # ------------------------------------------------------------------ helpers
+    def _first_acceptable(
+        self,
+        done: Any,
+        owners: Dict[Any, BaseAgent],
+        report: Dict[str, Any],
+        outcome: Callable[[Any], Tuple[Optional[AgentResult], Optional[BaseException]]],
+    ) -> Any:
+        # Resolve finishers in priority order so simultaneous arrivals favour
+        # the better-ranked agent.
+        for handle in (item for item in owners if item in done):
+            name = owners[handle].name
+            result, error = outcome(handle)
+            if error is not None:
+                report["failed"][name] = repr(error)
+            elif result is not None and self.policy.accept(result):
+                return handle
+            else:
+                report["rejected"].append(name)
+        return None
+
+    def _report(self, agents: Sequence[BaseAgent]) -> Dict[str, Any]:
+        return {
+            "candidates": [agent.name for agent in agents],
+            "winner": None,
+            "rejected": [],
+            "cancelled": [],
+            "failed": {},
+            "timed_out": False,
+        }
+
+    def _stop_time(self) -> Optional[float]:
+        if self.policy.deadline is None:
+            return None
+        return time.monotonic() + self.policy.deadline
+
+    @staticmethod
+    def _remaining(stop: Optional[float]) -> Optional[float]:
+        if stop is None:
+            return None
+        return max(0.0, stop - time.monotonic())
+
+
+def _release_when_done(
+    future: Future[AgentResult], release: Callable[[str], None], name: str
+) -> None:
+    future.add_done_callback(lambda _: release(name))
+
+
+def _future_outcome(
+    future: Future[AgentResult],
+) -> Tuple[Optional[AgentResult], Optional[BaseException]]:
+    error = future.exception()
+    return (None, error) if error is not None else (future.result(), None)
+
+
+def _task_outcome(
+    task: asyncio.Future[AgentResult],
+) -> Tuple[Optional[AgentResult], Optional[BaseException]]:
+    if task.cancelled():
+        import asyncio
+
+        return None, asyncio.CancelledError()
+    error = task.exception()
+    return (None, error) if error is not None else (task.result(), None)
@@ -0,0 +1,187 @@
+"""Stream JSONL queries through the coordinator and write JSONL results."""
+
+from __future__ import annotations
+
+import argparse
+import io
+import itertools
+import json
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Deque, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from agents.routing import RoutingCoordinator
+from core.records import query_from_record, result_to_record
+
+_COORDINATOR: Optional[RoutingCoordinator] = None
+
+# (zero-based input line number, raw line) pairs routed together.
+Chunk = List[Tuple[int, str]]
+
+
+def _init_worker() -> None:
+    global _COORDINATOR
+    _COORDINATOR = RoutingCoordinator(lazy=False)
+
+
+def route_chunk(chunk: Chunk) -> str:
+    """Route one chunk of raw JSONL lines and return the serialized output.
+
+    Each output record carries the zero-based input ``line`` so runs can be
+    resumed with ``--skip``. Malformed lines produce an ``error`` record
+    instead of aborting the batch.
+    """
+
+    if _COORDINATOR is None:
+        _init_worker()
+    assert _COORDINATOR is not None
+
+    records: List[dict] = []
+    queries = []
+    positions = []
+    for number, line in chunk:
+        record: dict = {"line": number}
+        try:
+            payload = json.loads(line)
+            if not isinstance(payload, dict):
+                raise ValueError("each line must be a JSON object")
+            if "id" in payload:
+                record["id"] = payload["id"]
+            queries.append(query_from_record(payload))
+            positions.append(len(records))
+        except ValueError as exc:
+            record["error"] = str(exc)
+        records.append(record)
+
+    for position, result in zip(positions, _COORDINATOR.handle_many(queries)):
+        records[position].update(result_to_record(result))
+
+    return "".join(json.dumps(record, default=str) + "\n" for record in records)
+
+
+def iter_chunks(
+    lines: Iterable[str], chunk_size: int, skip: int = 0
+) -> Iterator[Chunk]:
+    """Yield chunks of numbered non-blank lines, skipping the first ``skip`` lines."""
+
+    numbered = itertools.islice(enumerate(lines), skip, None)
+    while True:
+        batch = list(itertools.islice(numbered, chunk_size))
+        if not batch:
+            return
+        yield [(number, line) for number, line in batch if line.strip()]
+
+
+def route_stream(
+    source: TextIO,
+    sink: TextIO,
+    *,
+    chunk_size: int = 1000,
+    workers: int = 1,
+    skip: int = 0,
+) -> int:
+    """Route every record from ``source`` to ``sink`` and return the count.
+
+    At most ``2 * workers`` chunks are in flight at once and results are
+    written in input order, so memory stays bounded however large the input.
+    """
+
+    written = 0
+    chunks = iter_chunks(source, chunk_size, skip)
+    if workers <= 1:
+        for chunk in chunks:
+            sink.write(route_chunk(chunk))
+            written += len(chunk)
+        return written
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending: Deque[Tuple[int, Future[str]]] = deque()
+        for chunk in chunks:
+            pending.append((len(chunk), pool.submit(route_chunk, chunk)))
+            if len(pending) >= workers * 2:
+                size, future = pending.popleft()
+                sink.write(future.result())
+                written += size
+        while pending:
+            size, future = pending.popleft()
+            sink.write(future.result())
+            written += size
+    return written
+
+
+def _open_output(path: Optional[Path], *, append: bool = False) -> TextIO:
+    if path is None or str(path) == "-":
+        return io.TextIOWrapper(
+            sys.stdout.buffer, encoding="utf-8", write_through=False
+        )
+    # A resumed run adds to the results already written instead of replacing them.
+    return path.open("a" if append else "w", encoding="utf-8", buffering=1 << 20)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Route JSONL queries in bulk and emit JSONL results."
+    )
+    parser.add_argument(
+        "input",
+        type=Path,
+        nargs="?",
+        default=None,
+        help='JSONL file with one {"text", "metadata"} object per line (default: stdin).',
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Where to write JSONL results (default: stdout).",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1000,
+        help="Number of lines routed per chunk.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes routing chunks in parallel (default: 1, in-process).",
+    )
+    parser.add_argument(
+        "--skip",
+        type=int,
+        default=0,
+        help=(
+            "Resume from this zero-based input line, skipping the lines before it; "
+            "results are appended to --output."
+        ),
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    source = (
+        args.input.open("r", encoding="utf-8", buffering=1 << 20)
+        if args.input and str(args.input) != "-"
+        else sys.stdin
+    )
+    sink = _open_output(args.output, append=args.skip > 0)
+    try:
+        count = route_stream(
+            source,
+            sink,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            skip=args.skip,
+        )
+    finally:
+        if args.output and str(args.output) != "-":
+            sink.close()
+        else:
+            sink.flush()
+        if source is not sys.stdin:
+            source.close()
+    print(f"Routed {count} queries.", file=sys.stderr)
@@ -6,6 +6,7 @@ import argparse
 from pathlib import Path
 
 from agents.croaked import CroakedGame, CroakedOutcome
+from core.llm_cache import ResponseCache
 
 
 def run_croaked(
@@ -14,19 +15,49 @@ def run_croaked(
     markdown_path: Path | None = None,
     model: str = "gpt-5-mini",
     offline: bool = False,
+    cache_path: Path | None = None,
+    replay: bool = False,
+    fake: bool = False,
+    stream: bool = False,
 ) -> CroakedOutcome:
-    """Run a Croaked session, print the transcript, and optionally emit Markdown."""
-
-    game = CroakedGame(seed=seed, model=model, force_offline=offline)
-    outcome = game.play(max_rounds=rounds)
+    """Run a Croaked session, print the transcript as it is produced, and optionally emit Markdown."""
 
     print("Croaked: murder-mystery deduction")
+    print()
+    cache = ResponseCache(cache_path, replay=replay) if cache_path else None
+    server = None
+    if fake:
+        from benchmarks.fake_llm import FakeLLMBackend, FakeLLMServer
+
+        server = FakeLLMServer(FakeLLMBackend(seed=seed)).start()
+    try:
+        game = CroakedGame(
+            seed=seed,
+            model=model,
+            force_offline=offline,
+            cache=cache,
+            echo=lambda text: print(text, end="", flush=True),
+            stream=stream,
+            api_key="fake" if server else None,
+            base_url=server.base_url if server else None,
+        )
+        outcome = game.play(max_rounds=rounds)
+    finally:
+        if cache is not None:
+            cache.close()
+        if server is not None:
+            server.close()
+
+    print()
     print(f"Murderer: {outcome.murderer}")
     print(f"Winner: {outcome.winner}")
     print(f"Accusations: {outcome.accusations}")
-    print()
-    for line in outcome.transcript:
-        print(line)
+    usage = game.prompt_usage()
+    if usage["calls"]:
+        print(
+            f"Prompt tokens (estimated): {usage['input_tokens']} in {usage['calls']} calls, "
+            f"{usage['cacheable_tokens']} eligible for prefix caching"
+        )
 
     if markdown_path:
         markdown_path.parent.mkdir(parents=True, exist_ok=True)
@@ -111,7 +142,33 @@ def _parse_args() -> argparse.Namespace:
         action="store_true",
         help="Force the game to use built-in scripted dialogue instead of calling OpenAI.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=None,
+        help="SQLite file caching model responses across runs.",
+    )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="Serve responses only from --cache and fail on prompts it has not seen.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print model lines token by token; streamed calls are never hedged or coalesced.",
+    )
+    parser.add_argument(
+        "--fake",
+        action="store_true",
+        help="Run the LLM code path against a local fake Responses API instead of OpenAI.",
+    )
+    args = parser.parse_args()
+    if args.replay and args.cache is None:
+        parser.error("--replay requires --cache")
+    if args.fake and args.offline:
+        parser.error("--fake and --offline are mutually exclusive")
+    return args
 
 
 if __name__ == "__main__":
@@ -122,4 +179,8 @@ if __name__ == "__main__":
         markdown_path=args.markdown,
         model=args.model,
         offline=args.offline,
+        cache_path=args.cache,
+        replay=args.replay,
+        fake=args.fake,
+        stream=args.stream,
     )
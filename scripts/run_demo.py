@@ -3,21 +3,25 @@
 from __future__ import annotations
 
 from agents.routing import RoutingCoordinator
-from core import AgentQuery
+from core import AgentQuery, IntentSplitter
 
 
 def run_demo(query_text: str) -> None:
     """Run the coordinator against a single query and print the response."""
 
-    coordinator = RoutingCoordinator()
+    coordinator = RoutingCoordinator(splitter=IntentSplitter())
     result = coordinator.handle(AgentQuery(text=query_text))
     routed = result.routed_to or "none"
 
     print(f"Router: {coordinator.name}")
     print(f"Delegated to: {routed}")
+    for part in result.debug.get("parts", []):
+        print(f"  - {part['routed_to'] or 'none'}: {part['text']}")
     print("Response:")
     print(result.text)
 
 
 if __name__ == "__main__":
-    run_demo("I want you to summarize my emails and create a brief overview in my calendar at 8 am tomorrow")
+    run_demo(
+        "I want you to summarize my emails and create a brief overview in my calendar at 8 am tomorrow"
+    )
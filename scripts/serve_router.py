@@ -0,0 +1,292 @@
+"""Long-running router service that keeps warm coordinators in worker processes."""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import signal
+import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, TextIO
+
+from agents.routing import RoutingCoordinator
+from core.records import query_from_record, result_to_record
+
+_COORDINATOR: Optional[RoutingCoordinator] = None
+
+
+# ------------------------------------------------------------------- worker
+def _init_worker() -> None:
+    """Build and warm one coordinator per worker process."""
+
+    global _COORDINATOR
+    # Workers leave signal handling to the parent so shutdown can drain cleanly.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _COORDINATOR = RoutingCoordinator(lazy=False)
+
+
+def _route_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    if _COORDINATOR is None:  # pragma: no cover - initializer always runs first
+        _init_worker()
+    assert _COORDINATOR is not None
+    return result_to_record(_COORDINATOR.handle(query_from_record(record)))
+
+
+# ------------------------------------------------------------------ service
+class ServiceOverloadedError(RuntimeError):
+    """Raised when the service cannot accept more in-flight requests."""
+
+
+class _ShutdownRequested(Exception):
+    """Raised from the signal handler to stop reading new stdio requests."""
+
+
+class RouterService:
+    """Dispatches routing requests to a pool of warm worker processes.
+
+    At most ``max_pending`` requests are in flight; :meth:`submit` blocks (or
+    raises :class:`ServiceOverloadedError` after ``timeout``) once that bound is
+    reached, which pushes back on producers instead of queueing without limit.
+    """
+
+    def __init__(
+        self, workers: int = os.cpu_count() or 1, max_pending: int = 256
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._ids = itertools.count(1)
+        self._closed = threading.Event()
+
+    def submit(
+        self,
+        record: Dict[str, Any],
+        callback: Callable[[Dict[str, Any]], None],
+        *,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """Route ``record`` asynchronously and pass the response to ``callback``.
+
+        The response always carries the request ``id`` (taken from the record
+        or generated) and either the result fields or an ``error`` message.
+        """
+
+        if not self.accepting:
+            raise ServiceOverloadedError("service is shutting down")
+        given = record.get("id")
+        request_id = str(next(self._ids) if given is None else given)
+        if not self._slots.acquire(timeout=timeout):
+            raise ServiceOverloadedError("too many requests in flight")
+
+        def _done(future: Future[Dict[str, Any]]) -> None:
+            self._slots.release()
+            try:
+                response = {"id": request_id, **future.result()}
+            except Exception as exc:  # noqa: BLE001 - reported back to the caller
+                response = {"id": request_id, "error": str(exc)}
+            callback(response)
+
+        try:
+            future = self._pool.submit(_route_record, record)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(_done)
+        return request_id
+
+    def route(
+        self, record: Dict[str, Any], *, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Route one record and wait for its response."""
+
+        finished = threading.Event()
+        box: Dict[str, Dict[str, Any]] = {}
+
+        def _store(response: Dict[str, Any]) -> None:
+            box["response"] = response
+            finished.set()
+
+        self.submit(record, _store, timeout=timeout)
+        finished.wait()
+        return box["response"]
+
+    @property
+    def accepting(self) -> bool:
+        return not self._closed.is_set()
+
+    def stop_accepting(self) -> None:
+        """Reject new requests while letting in-flight ones finish."""
+
+        self._closed.set()
+
+    def close(self) -> None:
+        """Stop accepting work, finish in-flight requests and stop the workers."""
+
+        self.stop_accepting()
+        self._pool.shutdown(wait=True)
+
+
+# ------------------------------------------------------------------ frontends
+def serve_stdio(
+    service: RouterService,
+    stdin: TextIO,
+    stdout: TextIO,
+    *,
+    timeout: Optional[float] = None,
+) -> None:
+    """Serve JSON-lines requests from ``stdin`` until EOF or shutdown.
+
+    Responses are written as they complete, so they may arrive out of order;
+    match them to requests by ``id``. A request the service cannot take
+    (overloaded for ``timeout`` seconds, shutting down, or with its workers
+    gone) gets an ``error`` response instead of stopping the server.
+    """
+
+    write_lock = threading.Lock()
+
+    def _write(response: Dict[str, Any]) -> None:
+        line = json.dumps(response, default=str)
+        with write_lock:
+            stdout.write(line + "\n")
+            stdout.flush()
+
+    for line in stdin:
+        if not service.accepting:
+            break
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("each line must be a JSON object")
+        except ValueError as exc:
+            _write({"id": None, "error": f"invalid request: {exc}"})
+            continue
+        try:
+            service.submit(record, _write, timeout=timeout)
+        except (ServiceOverloadedError, BrokenProcessPool) as exc:
+            _write({"id": record.get("id"), "error": str(exc) or type(exc).__name__})
+
+
+def make_http_server(
+    service: RouterService, host: str, port: int
+) -> ThreadingHTTPServer:
+    """Build an HTTP server exposing ``POST /route`` and ``GET /healthz``."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            if self.path != "/healthz":
+                self._send(404, {"error": "not found"})
+                return
+            self._send(200, {"status": "ok"})
+
+        def do_POST(self) -> None:  # noqa: N802 - http.server naming
+            if self.path != "/route":
+                self._send(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                record = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(record, dict):
+                    raise ValueError("body must be a JSON object")
+            except ValueError as exc:
+                self._send(400, {"error": f"invalid request: {exc}"})
+                return
+            try:
+                response = service.route(record, timeout=0)
+            except (ServiceOverloadedError, BrokenProcessPool) as exc:
+                self._send(503, {"error": str(exc) or type(exc).__name__})
+                return
+            self._send(200 if "error" not in response else 422, response)
+
+        def _send(self, status: int, payload: Dict[str, Any]) -> None:
+            body = json.dumps(payload, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            return
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def run_service(
+    *,
+    workers: int,
+    max_pending: int,
+    http: Optional[str] = None,
+) -> None:
+    """Run the service until EOF (stdio) or SIGTERM/SIGINT, then drain and exit."""
+
+    service = RouterService(workers=workers, max_pending=max_pending)
+    server: Optional[ThreadingHTTPServer] = None
+
+    def _shutdown(signum: int, frame: Any) -> None:
+        service.stop_accepting()
+        if server is not None:
+            threading.Thread(target=server.shutdown, daemon=True).start()
+        else:
+            raise _ShutdownRequested()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    try:
+        if http:
+            host, _, port = http.rpartition(":")
+            server = make_http_server(service, host or "127.0.0.1", int(port))
+            print(
+                f"Routing service listening on http://{host or '127.0.0.1'}:{port}",
+                file=sys.stderr,
+            )
+            server.serve_forever()
+            server.server_close()
+        else:
+            serve_stdio(service, sys.stdin, sys.stdout)
+    except _ShutdownRequested:
+        pass
+    finally:
+        service.close()
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Serve routing requests from warm worker processes."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes, each holding its own coordinator (default: CPU count).",
+    )
+    parser.add_argument(
+        "--max-pending",
+        type=int,
+        default=256,
+        help="Maximum in-flight requests before the service applies backpressure.",
+    )
+    parser.add_argument(
+        "--http",
+        type=str,
+        default=None,
+        metavar="HOST:PORT",
+        help="Serve HTTP on HOST:PORT instead of JSON lines over stdin/stdout.",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    run_service(workers=args.workers, max_pending=args.max_pending, http=args.http)
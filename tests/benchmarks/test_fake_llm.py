@@ -0,0 +1,165 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from benchmarks.fake_llm import FakeLLMBackend, FakeLLMServer, Latency
+from core.llm_prompt import estimate_tokens
+
+
+def _post(server: FakeLLMServer, payload: dict) -> urllib.request.addinfourl:
+    request = urllib.request.Request(
+        f"{server.base_url}/responses",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    return urllib.request.urlopen(request, timeout=5)
+
+
+def test_fake_server_scripts_replies_errors_and_streams() -> None:
+    backend = FakeLLMBackend(
+        script=["Who was it?", 503, "I saw Bram. Truly."], retry_after=0.5
+    )
+    request = {
+        "model": "fake-model",
+        "input": [{"role": "user", "content": "Hello there"}],
+    }
+    with FakeLLMServer(backend) as server:
+        body = json.load(_post(server, request))
+        assert body["output"][0]["content"][0] == {
+            "type": "output_text",
+            "text": "Who was it?",
+            "annotations": [],
+        }
+        assert body["usage"]["input_tokens"] == estimate_tokens("Hello there")
+
+        with pytest.raises(urllib.error.HTTPError) as failure:
+            _post(server, request)
+        assert (
+            failure.value.code == 503 and failure.value.headers["Retry-After"] == "0.5"
+        )
+
+        with _post(server, dict(request, stream=True)) as response:
+            frames = response.read().decode("utf-8").strip().split("\n\n")
+    events = [json.loads(frame.split("data: ", 1)[1]) for frame in frames]
+    deltas = [
+        event["delta"]
+        for event in events
+        if event["type"] == "response.output_text.delta"
+    ]
+    assert deltas == ["I ", "saw ", "Bram. ", "Truly."]
+    assert events[-1]["type"] == "response.completed"
+    assert backend.stats()["requests"] == 3 and backend.stats()["errors"] == 1
+
+
+def test_latency_specs_parse_and_sample() -> None:
+    import random
+
+    rng = random.Random(0)
+    assert Latency.parse("constant:0.25").sample(rng) == 0.25
+    assert 0.1 <= Latency.parse("uniform:0.1:0.2").sample(rng) <= 0.2
+    assert Latency.parse("lognormal:0.2:0.5").sample(rng) > 0
+    with pytest.raises(ValueError):
+        Latency.parse("gamma:1")
+
+    backend = FakeLLMBackend(latency=Latency.parse("uniform:0.1:0.2"), delay_window=2)
+    for _ in range(3):
+        backend.decide({})
+    assert len(backend.delays) == 2 and backend.stats()["requests"] == 3
+
+
+def test_responder_runs_against_the_fake_server() -> None:
+    pytest.importorskip("openai")
+    pytest.importorskip("dotenv")
+    from core.llm import OpenAIResponder
+    from core.llm_resilience import RetryPolicy
+
+    backend = FakeLLMBackend(script=[500, "First reply.", "Streamed reply here."])
+    with FakeLLMServer(backend) as server:
+        from openai import OpenAI
+
+        client = OpenAI(api_key="fake", base_url=server.base_url, max_retries=0)
+        responder = OpenAIResponder(
+            model="fake-model", retry=RetryPolicy(base_delay=0), _client=client
+        )
+        assert responder.generate(system_prompt="s", user_prompt="u") == "First reply."
+        assert responder.retries == 1
+        stream = responder.generate_stream(system_prompt="s", user_prompt="v")
+        assert "".join(stream) == "Streamed reply here."
+        assert stream.text == "Streamed reply here."
+        client.close()
+
+
+def test_pooled_responder_agenerate_uses_its_own_base_url() -> None:
+    pytest.importorskip("openai")
+    pytest.importorskip("dotenv")
+    import asyncio
+
+    from core.llm import CLIENT_POOL
+
+    backend = FakeLLMBackend(script=["Async reply."])
+    with FakeLLMServer(backend) as server:
+        responder = CLIENT_POOL.responder(
+            "fake-model", api_key="fake", base_url=server.base_url
+        )
+
+        async def run() -> str:
+            try:
+                return await responder.agenerate(system_prompt="s", user_prompt="u")
+            finally:
+                await CLIENT_POOL.aclose()
+
+        assert asyncio.run(run()) == "Async reply."
+    assert backend.stats()["requests"] == 1
+
+
+def test_responders_outlive_a_closed_pool() -> None:
+    pytest.importorskip("openai")
+    pytest.importorskip("dotenv")
+    from core.llm import ClientPool
+
+    pool = ClientPool()
+    backend = FakeLLMBackend(script=["Before.", "After."])
+    with FakeLLMServer(backend) as server:
+        responder = pool.responder(
+            "fake-model", api_key="fake", base_url=server.base_url
+        )
+        assert responder.generate(system_prompt="s", user_prompt="u") == "Before."
+        pool.close()
+        assert responder.generate(system_prompt="s", user_prompt="v") == "After."
+        pool.close()
+
+
+def test_croaked_falls_back_to_scripted_lines_and_echoes_whole_lines() -> None:
+    pytest.importorskip("openai")
+    pytest.importorskip("dotenv")
+    from agents.croaked import CroakedGame
+
+    backend = FakeLLMBackend(error_rate=1.0, error_status=400)
+    echoed: list = []
+    with FakeLLMServer(backend) as server:
+        game = CroakedGame(
+            seed=1,
+            model="fake-model",
+            api_key="fake",
+            base_url=server.base_url,
+            echo=echoed.append,
+        )
+        outcome = game.play(max_rounds=1)
+    assert backend.stats()["errors"] > 0 and backend.stats()["streams"] == 0
+    assert "".join(echoed).splitlines() == list(outcome.transcript)
+
+
+def test_croaked_games_run_through_the_llm_path() -> None:
+    pytest.importorskip("openai")
+    pytest.importorskip("dotenv")
+    from benchmarks.fake_llm import run_games
+
+    report = run_games(FakeLLMBackend(script=[503], retry_after=0), games=2, rounds=1)
+    assert report["failed_games"] == 0 and report["llm_calls"] > 0
+    assert (
+        report["backend"]["requests"]
+        == report["llm_calls"] - report["responder"]["coalesced"] + 1
+    )
+    assert report["responder"]["retries"] == 1
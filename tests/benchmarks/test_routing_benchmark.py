@@ -0,0 +1,39 @@
+from dataclasses import replace
+
+import pytest
+
+from benchmarks.corpus import generate_queries
+from benchmarks.routing import calibrate_semantic, compare, run_case
+
+
+def test_corpus_respects_hit_rate() -> None:
+    queries = list(generate_queries(200, agents=5, hit_rate=0.0))
+
+    assert len(queries) == 200
+    assert not any("zq" in query.text for query in queries)
+
+
+def test_run_case_and_compare_flag_regressions() -> None:
+    result = run_case(queries=300, agents=20, hit_rate=1.0, mode="handle_many")
+
+    assert result.throughput_qps > 0
+    assert result.p99_us >= result.p50_us > 0
+
+    slower = replace(result, throughput_qps=result.throughput_qps / 2)
+    baseline = {
+        result.name: {"throughput_qps": result.throughput_qps, "p99_us": result.p99_us}
+    }
+
+    assert compare([result], baseline, tolerance=0.1) == []
+    assert len(compare([slower], baseline, tolerance=0.1)) == 1
+
+
+def test_default_semantic_threshold_is_calibrated_on_paraphrases() -> None:
+    pytest.importorskip("numpy")
+    from core.semantic import SemanticRouter
+
+    default = SemanticRouter().threshold
+    accuracy = calibrate_semantic([0.03, default, 0.1, 0.15])
+
+    assert accuracy[default] == max(accuracy.values())
+    assert accuracy[default] >= 0.8
@@ -0,0 +1,227 @@
+import asyncio
+import threading
+
+from core import (
+    AdmissionPolicy,
+    AgentLimit,
+    AgentQuery,
+    AgentResult,
+    KeywordAgent,
+    RoutingAgent,
+    SpeculationPolicy,
+)
+
+
+class _Slow(KeywordAgent):
+    KEYWORDS = frozenset({"slow"})
+
+    def __init__(self) -> None:
+        super().__init__(name="slow")
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def handle(self, query: AgentQuery) -> AgentResult:
+        self.started.set()
+        self.release.wait(5)
+        return AgentResult(text="slow")
+
+    async def ahandle(self, query: AgentQuery) -> AgentResult:
+        await asyncio.sleep(5)
+        return AgentResult(text="slow")
+
+
+class _Cheap(KeywordAgent):
+    def __init__(self) -> None:
+        super().__init__(name="cheap")
+
+    def handle(self, query: AgentQuery) -> AgentResult:
+        return AgentResult(text="cheap")
+
+
+def test_full_queue_sheds_to_the_fallback_agent() -> None:
+    slow = _Slow()
+    router = RoutingAgent(
+        "router",
+        [slow, _Cheap()],
+        fallback="cheap",
+        admission=AdmissionPolicy(limits={"slow": AgentLimit(concurrency=1, queue=0)}),
+    )
+
+    first: list[AgentResult] = []
+    worker = threading.Thread(
+        target=lambda: first.append(router.handle(AgentQuery(text="slow")))
+    )
+    worker.start()
+    assert slow.started.wait(5)
+
+    shed = router.handle(AgentQuery(text="slow please"))
+    slow.release.set()
+    worker.join(5)
+
+    assert shed.text == "cheap"
+    assert shed.routed_to == "cheap"
+    assert shed.debug["shed"] == {"agent": "slow", "reason": "queue_full"}
+    assert first[0].text == "slow"
+
+
+def test_deadline_from_metadata_bounds_async_handling() -> None:
+    router = RoutingAgent(
+        "router",
+        [_Slow()],
+        admission=AdmissionPolicy(default=AgentLimit(concurrency=4)),
+    )
+
+    result = asyncio.run(
+        router.ahandle(AgentQuery(text="slow", metadata={"timeout": 0.01}))
+    )
+
+    assert result.routed_to is None
+    assert result.debug["reason"] == "deadline exceeded"
+    assert result.debug["shed"] == {"agent": "slow", "reason": "deadline"}
+
+
+class _Blocking(KeywordAgent):
+    KEYWORDS = frozenset({"blocking"})
+
+    def __init__(self) -> None:
+        super().__init__(name="blocking")
+        self.release = threading.Event()
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def handle(self, query: AgentQuery) -> AgentResult:
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        self.release.wait(5)
+        with self._lock:
+            self.running -= 1
+        return AgentResult(text="blocking")
+
+
+def test_deadline_on_sync_agent_keeps_the_slot_until_its_thread_finishes() -> None:
+    blocking = _Blocking()
+    router = RoutingAgent(
+        "router",
+        [blocking],
+        admission=AdmissionPolicy(
+            limits={"blocking": AgentLimit(concurrency=1, queue=100)}
+        ),
+    )
+    control = router._admission
+    assert control is not None
+
+    async def run() -> None:
+        query = AgentQuery(text="blocking", metadata={"timeout": 0.05})
+        results = await asyncio.gather(*(router.ahandle(query) for _ in range(5)))
+        assert all(result.debug["shed"]["reason"] == "deadline" for result in results)
+        # The handler thread is still running, so its slot stays taken.
+        assert control.stats()["blocking"]["active"] == 1
+        blocking.release.set()
+        for _ in range(100):
+            if control.stats()["blocking"]["active"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert control.stats()["blocking"]["active"] == 0
+
+    asyncio.run(run())
+
+    assert blocking.peak == 1
+
+
+def test_malformed_deadline_metadata_is_ignored() -> None:
+    router = RoutingAgent(
+        "router",
+        [_Cheap()],
+        fallback="cheap",
+        admission=AdmissionPolicy(default=AgentLimit(concurrency=1)),
+    )
+
+    result = router.handle(
+        AgentQuery(text="anything", metadata={"timeout": "soon", "deadline": [1]})
+    )
+
+    assert result.text == "cheap"
+
+
+class _Gated(KeywordAgent):
+    KEYWORDS = frozenset({"study"})
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name=name)
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def handle(self, query: AgentQuery) -> AgentResult:
+        self.started.set()
+        self.release.wait(5)
+        return AgentResult(text=self.name)
+
+
+def test_speculative_candidates_hold_admission_slots_until_they_finish() -> None:
+    primary, runner_up = _Gated("primary"), _Gated("runner_up")
+    router = RoutingAgent(
+        "router",
+        [primary, runner_up, _Cheap()],
+        fallback="cheap",
+        speculation=SpeculationPolicy(candidates=2),
+        admission=AdmissionPolicy(default=AgentLimit(concurrency=1)),
+    )
+
+    raced: list[AgentResult] = []
+    worker = threading.Thread(
+        target=lambda: raced.append(router.handle(AgentQuery(text="study")))
+    )
+    worker.start()
+    assert primary.started.wait(5) and runner_up.started.wait(5)
+
+    shed = router.handle(AgentQuery(text="study more"))
+    runner_up.release.set()
+    worker.join(5)
+    # The runner-up won, but the primary's thread still runs and keeps its slot.
+    still_busy = router.handle(AgentQuery(text="study again"))
+    primary.release.set()
+    router.close()
+
+    assert shed.routed_to == "cheap"
+    assert shed.debug["shed"] == {"agent": "primary", "reason": "queue_full"}
+    assert raced[0].routed_to == "runner_up"
+    assert raced[0].debug["speculative"]["candidates"] == ["primary", "runner_up"]
+    assert still_busy.debug["shed"] == {"agent": "primary", "reason": "queue_full"}
+
+
+class _Napping(KeywordAgent):
+    KEYWORDS = frozenset({"nap"})
+
+    def __init__(self, name: str, delay: float) -> None:
+        super().__init__(name=name)
+        self.delay = delay
+
+    def handle(self, query: AgentQuery) -> AgentResult:
+        raise AssertionError("routed asynchronously only")
+
+    async def ahandle(self, query: AgentQuery) -> AgentResult:
+        await asyncio.sleep(self.delay)
+        return AgentResult(text=self.name)
+
+
+def test_async_speculation_races_only_candidates_with_a_free_slot() -> None:
+    router = RoutingAgent(
+        "router",
+        [_Napping("slow", 0.2), _Napping("fast", 0.01)],
+        speculation=SpeculationPolicy(candidates=2),
+        admission=AdmissionPolicy(
+            limits={"slow": AgentLimit(concurrency=2)},
+            default=AgentLimit(concurrency=1),
+        ),
+    )
+    query = AgentQuery(text="nap")
+
+    async def run() -> list[AgentResult]:
+        return list(await asyncio.gather(router.ahandle(query), router.ahandle(query)))
+
+    raced, alone = asyncio.run(run())
+
+    assert raced.routed_to == "fast" and raced.debug["speculative"]["winner"] == "fast"
+    assert alone.routed_to == "slow" and "speculative" not in alone.debug
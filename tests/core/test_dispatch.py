@@ -0,0 +1,104 @@
+from core import AgentQuery, AgentResult, BaseAgent, KeywordAgent, RoutingAgent
+
+
+class _Keywords(KeywordAgent):
+    def __init__(self, name: str, keywords: set[str]) -> None:
+        super().__init__(name=name)
+        self.KEYWORDS = frozenset(keywords)
+
+    def handle(self, query: AgentQuery) -> AgentResult:
+        return AgentResult(text=self.name)
+
+
+class _Prefix(BaseAgent):
+    def can_handle(self, query: AgentQuery) -> bool:
+        return query.text.startswith("!")
+
+    def handle(self, query: AgentQuery) -> AgentResult:
+        return AgentResult(text=self.name)
+
+
+def _tree(flatten: bool) -> RoutingAgent:
+    billing = RoutingAgent(
+        "billing",
+        [_Keywords("invoices", {"invoice"}), _Keywords("refunds", {"refund"})],
+    )
+    support = RoutingAgent(
+        "support",
+        [
+            _Prefix("commands"),
+            RoutingAgent("hardware", [_Keywords("printers", {"printer"})]),
+            _Keywords("general", {"help"}),
+        ],
+        fallback="general",
+    )
+    return RoutingAgent(
+        "root",
+        [
+            billing,
+            _Keywords("refund_policy", {"refund", "policy"}),
+            support,
+            _Keywords("never", {"invoice"}),
+        ],
+        flatten=flatten,
+    )
+
+
+def test_flattened_tree_routes_like_nested_dispatch() -> None:
+    nested, flat = _tree(flatten=False), _tree(flatten=True)
+    texts = [
+        "Refund my invoice",
+        "refund policy",
+        "!reboot",
+        "printer jam",
+        "hello",
+        "help",
+    ]
+
+    for text in texts:
+        expected = nested.handle(AgentQuery(text=text))
+        actual = flat.handle(AgentQuery(text=text))
+        assert (actual.text, actual.routed_to) == (expected.text, expected.routed_to)
+        assert actual.debug.get("router") == expected.debug.get("router")
+        assert actual.debug.get("fallback") == expected.debug.get("fallback")
+
+    result = flat.handle(AgentQuery(text="printer jam"))
+    assert result.routed_to == "support"
+    assert result.debug["path"] == ["support", "hardware", "printers"]
+    assert [r.text for r in flat.handle_many(AgentQuery(text=t) for t in texts)] == [
+        nested.handle(AgentQuery(text=t)).text for t in texts
+    ]
+
+
+def test_dispatch_table_is_rebuilt_when_a_nested_registry_changes() -> None:
+    router = _tree(flatten=True)
+    table = router.dispatch_table()
+    assert router.handle(AgentQuery(text="wire transfer")).text == "general"
+
+    billing = router.registry["billing"]
+    billing.registry.register(_Keywords("transfers", {"transfer"}))
+
+    assert router.dispatch_table() is not table
+    assert router.handle(AgentQuery(text="wire transfer")).text == "transfers"
+
+
+def test_nested_router_with_admission_stays_an_opaque_leaf() -> None:
+    from core import AdmissionPolicy, AgentLimit
+
+    billing = RoutingAgent(
+        "billing",
+        [_Keywords("invoices", {"invoice"})],
+        admission=AdmissionPolicy(
+            limits={"invoices": AgentLimit(concurrency=1, queue=0)}
+        ),
+    )
+    router = RoutingAgent("root", [billing], flatten=True)
+
+    assert [entry.leaf for entry in router.dispatch_table().entries.values()] == [
+        billing
+    ]
+
+    assert billing._admission is not None
+    billing._admission.acquire("invoices", None)  # occupy the only slot
+    result = router.handle(AgentQuery(text="invoice"))
+    assert result.debug["shed"] == {"agent": "invoices", "reason": "queue_full"}
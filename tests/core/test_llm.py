@@ -0,0 +1,364 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+from core.llm import LanguageResponderError, OpenAIResponder  # noqa: E402
+
+
+class _FakeResponses:
+    def __init__(self, delay: float = 0.0, error: Exception | None = None) -> None:
+        self.delay = delay
+        self.error = error
+        self.active = 0
+        self.peak = 0
+        self.cancelled = 0
+
+    async def create(self, **kwargs: object) -> SimpleNamespace:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.active -= 1
+        if self.error is not None:
+            raise self.error
+        return SimpleNamespace(output_text=f"  reply to {kwargs['model']}  ")
+
+
+def _responder(responses: _FakeResponses, **options: object) -> OpenAIResponder:
+    return OpenAIResponder(
+        model="test-model",
+        _async_client=SimpleNamespace(responses=responses),
+        **options,
+    )
+
+
+def test_agenerate_bounds_concurrency_and_extracts_text() -> None:
+    responses = _FakeResponses(delay=0.01)
+    responder = _responder(responses, max_concurrency=2)
+
+    async def run() -> list[str]:
+        return await asyncio.gather(
+            *(
+                responder.agenerate(system_prompt="s", user_prompt=str(i))
+                for i in range(6)
+            )
+        )
+
+    assert asyncio.run(run()) == ["reply to test-model"] * 6
+    assert responses.peak == 2
+
+
+def test_agenerate_maps_errors_and_propagates_cancellation() -> None:
+    failing = _responder(_FakeResponses(error=RuntimeError("boom")))
+    with pytest.raises(LanguageResponderError, match="boom"):
+        asyncio.run(failing.agenerate(system_prompt="s", user_prompt="u"))
+
+    slow = _FakeResponses(delay=5)
+    responder = _responder(slow)
+    with pytest.raises(LanguageResponderError):
+        asyncio.run(
+            responder.agenerate(system_prompt="s", user_prompt="u", timeout=0.01)
+        )
+
+    async def cancel() -> None:
+        task = asyncio.create_task(
+            responder.agenerate(system_prompt="s", user_prompt="u")
+        )
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel())
+    assert slow.cancelled == 2
+
+
+def test_cached_responder_replays_without_a_client(tmp_path) -> None:
+    from core.llm import ResponseCacheMiss
+    from core.llm_cache import ResponseCache
+
+    path = tmp_path / "responses.sqlite"
+    recorder = _responder(_FakeResponses(), cache=ResponseCache(path))
+    assert (
+        asyncio.run(recorder.agenerate(system_prompt="s", user_prompt="u"))
+        == "reply to test-model"
+    )
+    recorder.cache.close()
+
+    replayer = OpenAIResponder(
+        model="test-model", cache=ResponseCache(path, replay=True)
+    )
+    assert replayer.available
+    assert (
+        replayer.generate(system_prompt="s", user_prompt="u") == "reply to test-model"
+    )
+    with pytest.raises(ResponseCacheMiss):
+        replayer.generate(system_prompt="s", user_prompt="other")
+
+
+def test_generate_stream_yields_deltas_and_maps_failures() -> None:
+    def events(*items: SimpleNamespace):
+        return SimpleNamespace(
+            responses=SimpleNamespace(create=lambda **kwargs: iter(items))
+        )
+
+    delta = lambda text: SimpleNamespace(type="response.output_text.delta", delta=text)  # noqa: E731
+    responder = OpenAIResponder(
+        model="test-model", _client=events(delta(" Who "), delta("was it? "))
+    )
+    stream = responder.generate_stream(system_prompt="s", user_prompt="u")
+    assert list(stream) == [" Who ", "was it? "]
+    assert stream.text == "Who was it?"
+
+    failed = SimpleNamespace(type="error", error=SimpleNamespace(message="overloaded"))
+    responder._client = events(delta("Who"), failed)
+    stream = responder.generate_stream(system_prompt="s", user_prompt="u")
+    assert next(stream) == "Who"
+    with pytest.raises(LanguageResponderError, match="overloaded"):
+        stream.result()
+
+    responder._client = events()
+    with pytest.raises(LanguageResponderError):
+        responder.generate_stream(system_prompt="s", user_prompt="u").result()
+
+
+def test_stream_failures_trip_the_breaker_without_sampling_latency() -> None:
+    from core.llm_resilience import CircuitBreaker, HedgePolicy
+
+    failed = SimpleNamespace(type="error", error=SimpleNamespace(message="overloaded"))
+    client = SimpleNamespace(
+        responses=SimpleNamespace(create=lambda **kwargs: iter([failed]))
+    )
+    responder = OpenAIResponder(
+        model="test-model",
+        hedge=HedgePolicy(min_samples=1, window=1),
+        breaker=CircuitBreaker(failure_threshold=1),
+        _client=client,
+    )
+
+    with pytest.raises(LanguageResponderError, match="overloaded"):
+        responder.generate_stream(system_prompt="s", user_prompt="u").result()
+
+    assert responder.stats()["latency_samples"] == 0
+    assert responder.breaker is not None and responder.breaker.state == "open"
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+def test_generate_retries_transient_errors_and_trips_the_breaker() -> None:
+    from core.llm import CircuitOpenError
+    from core.llm_resilience import CircuitBreaker, RetryPolicy
+
+    outcomes: list = [_StatusError(503), _StatusError(429), "ok"]
+
+    def create(**kwargs: object) -> SimpleNamespace:
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return SimpleNamespace(output_text=outcome)
+
+    client = SimpleNamespace(responses=SimpleNamespace(create=create))
+    responder = OpenAIResponder(
+        model="test-model", retry=RetryPolicy(base_delay=0), _client=client
+    )
+    assert responder.generate(system_prompt="s", user_prompt="u") == "ok"
+    assert responder.retries == 2
+
+    outcomes[:] = [_StatusError(400)]
+    with pytest.raises(LanguageResponderError, match="status 400"):
+        responder.generate(system_prompt="s", user_prompt="u")
+    assert responder.retries == 2
+
+    responder.breaker = CircuitBreaker(failure_threshold=2)
+    outcomes[:] = [_StatusError(500)] * 3
+    with pytest.raises(LanguageResponderError):
+        responder.generate(system_prompt="s", user_prompt="u")
+    with pytest.raises(CircuitOpenError):
+        responder.generate(system_prompt="s", user_prompt="u")
+    assert len(outcomes) == 1
+
+
+def test_a_probe_refused_with_a_client_error_closes_the_breaker() -> None:
+    from core.llm_resilience import CircuitBreaker
+
+    now = [0.0]
+    outcomes: list = [_StatusError(500), _StatusError(400), "ok"]
+
+    def create(**kwargs: object) -> SimpleNamespace:
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return SimpleNamespace(output_text=outcome)
+
+    responder = OpenAIResponder(
+        model="test-model",
+        retry=None,
+        breaker=CircuitBreaker(
+            failure_threshold=1, reset_timeout=2, clock=lambda: now[0]
+        ),
+        _client=SimpleNamespace(responses=SimpleNamespace(create=create)),
+    )
+    with pytest.raises(LanguageResponderError, match="status 500"):
+        responder.generate(system_prompt="s", user_prompt="u")
+    now[0] = 3.0
+    with pytest.raises(LanguageResponderError, match="status 400"):
+        responder.generate(system_prompt="s", user_prompt="u")
+    assert responder.breaker is not None and responder.breaker.state == "closed"
+    now[0] = 100.0
+    assert responder.generate(system_prompt="s", user_prompt="u") == "ok"
+
+
+def test_agenerate_hedges_slow_requests() -> None:
+    from core.llm_resilience import HedgePolicy
+
+    class _Responses(_FakeResponses):
+        calls = 0
+
+        async def create(self, **kwargs: object) -> SimpleNamespace:
+            self.calls += 1
+            self.delay = 5 if self.calls == 1 else 0
+            return await super().create(**kwargs)
+
+    responses = _Responses()
+    responder = _responder(responses, hedge=HedgePolicy(initial_delay=0.01))
+    result = asyncio.run(
+        responder.agenerate(system_prompt="s", user_prompt="u", timeout=1)
+    )
+    assert result == "reply to test-model"
+    assert responder.hedges == 1 and responses.cancelled == 1
+
+
+def test_identical_concurrent_prompts_share_one_upstream_call() -> None:
+    import threading
+
+    release = threading.Event()
+    calls = []
+
+    def create(**kwargs: object) -> SimpleNamespace:
+        calls.append(kwargs)
+        release.wait(1)
+        return SimpleNamespace(output_text="shared")
+
+    responder = OpenAIResponder(
+        model="test-model",
+        _client=SimpleNamespace(responses=SimpleNamespace(create=create)),
+    )
+    results: list[str] = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                responder.generate(system_prompt="s", user_prompt="u")
+            )
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    while responder.coalesced < 3:
+        release.wait(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == ["shared"] * 4 and len(calls) == 1
+
+    responses = _FakeResponses(delay=0.05, error=RuntimeError("boom"))
+    responder = _responder(responses)
+
+    async def run() -> list:
+        first = asyncio.ensure_future(
+            responder.agenerate(system_prompt="s", user_prompt="u")
+        )
+        await asyncio.sleep(0)
+        # A follower giving up must not cancel the call the others are waiting on.
+        with pytest.raises(LanguageResponderError):
+            await responder.agenerate(system_prompt="s", user_prompt="u", timeout=0.01)
+        rest = [
+            responder.agenerate(system_prompt="s", user_prompt="u") for _ in range(2)
+        ]
+        return await asyncio.gather(first, *rest, return_exceptions=True)
+
+    errors = asyncio.run(run())
+    assert [str(error) for error in errors] == ["boom"] * 3
+    assert responses.peak == 1 and responses.cancelled == 0 and responder.coalesced == 3
+
+
+def test_generate_hedges_slow_requests_outside_the_shared_pool() -> None:
+    import threading
+
+    from core.llm_resilience import HedgePolicy
+
+    calls: list[str] = []
+    release = threading.Event()
+
+    def create(**kwargs: object) -> SimpleNamespace:
+        calls.append(threading.current_thread().name)
+        if len(calls) == 1:
+            release.wait(5)
+        return SimpleNamespace(output_text=f"reply {len(calls)}")
+
+    responder = OpenAIResponder(
+        model="test-model",
+        hedge=HedgePolicy(initial_delay=0.01),
+        _client=SimpleNamespace(responses=SimpleNamespace(create=create)),
+    )
+    try:
+        assert responder.generate(system_prompt="s", user_prompt="u") == "reply 2"
+    finally:
+        release.set()
+    assert responder.hedges == 1
+    assert calls[0].startswith("llm-call") and calls[1].startswith("llm-hedge")
+
+    responder.close()
+    assert responder.generate(system_prompt="s", user_prompt="v") == "reply 3"
+    assert calls[2].startswith("llm-call")
+
+
+def test_client_pool_keys_clients_by_credentials_and_event_loop() -> None:
+    pytest.importorskip("openai")
+    from core.llm import ClientPool
+    from core.llm_resilience import NO_RETRY, RetryPolicy
+
+    pool = ClientPool()
+    local = "http://127.0.0.1:9/v1"
+    client = pool.client("a", local)
+    assert pool.client("a", local) is client
+    assert pool.client("b", local) is not client
+    assert pool.client("a", "http://127.0.0.1:8/v1") is not client
+
+    async def async_clients() -> tuple:
+        return pool.async_client("a", local), pool.async_client("a", local)
+
+    first, again = asyncio.run(async_clients())
+    other, _ = asyncio.run(async_clients())
+    assert first is again and other is not first
+
+    async def aclose() -> None:
+        current = pool.async_client("a", local)
+        await pool.aclose()
+        assert current.is_closed() and pool.async_client("a", local) is not current
+
+    asyncio.run(aclose())
+
+    pool.prewarm(["m1", "m2"], api_key="a", base_url=local)
+    responder = pool.responder("m1", api_key="a", base_url=local)
+    assert pool.responder("m1", api_key="a", base_url=local) is responder
+    assert pool.responder("m1", api_key="b", base_url=local) is not responder
+    assert len(pool) == 3
+    assert responder.retry == RetryPolicy()
+    single = pool.responder("m1", api_key="a", base_url=local, retry=NO_RETRY)
+    assert single is not responder and single.retry is NO_RETRY
+
+    pool.close()
+    assert len(pool) == 0 and client.is_closed()
+    assert pool.responder("m1", api_key="a", base_url=local) is not responder
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import pytest
+
+from core.llm_cache import ResponseCache
+
+
+def _key(prompt: str) -> str:
+    return ResponseCache.key(
+        model="m",
+        system_prompt="s",
+        user_prompt=prompt,
+        temperature=None,
+        max_output_tokens=64,
+    )
+
+
+def test_response_cache_evicts_least_recently_used_by_size(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path / "responses.sqlite", max_bytes=10)
+    cache.put(_key("a"), "aaaa")
+    cache.put(_key("b"), "bbbb")
+    assert cache.get(_key("a")) == "aaaa"
+
+    cache.put(_key("c"), "cccc")
+
+    assert cache.get(_key("b")) is None
+    assert cache.get(_key("a")) == "aaaa"
+    assert cache.get(_key("c")) == "cccc"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["bytes"]) == (
+        3,
+        1,
+        1,
+        8,
+    )
+    assert _key("a") != ResponseCache.key(
+        model="m",
+        system_prompt="s",
+        user_prompt="a",
+        temperature=0.2,
+        max_output_tokens=64,
+    )
+
+
+def test_response_cache_ttl_and_read_only_replay(tmp_path: Path) -> None:
+    path = tmp_path / "responses.sqlite"
+    cache = ResponseCache(path, ttl=0.0)
+    cache.put(_key("old"), "stale")
+    assert cache.get(_key("old")) is None
+    cache.close()
+
+    writer = ResponseCache(path)
+    writer.put(_key("kept"), "hello")
+    writer.close()
+
+    replay = ResponseCache(path, replay=True)
+    assert replay.get(_key("kept")) == "hello"
+    replay.put(_key("new"), "ignored")
+    assert replay.get(_key("new")) is None
+    with pytest.raises(PermissionError):
+        replay.clear()
+    assert replay.stats()["entries"] == 1
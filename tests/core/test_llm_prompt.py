@@ -0,0 +1,31 @@
+from core.llm_prompt import PromptLayout, cacheable_tokens, estimate_tokens
+
+
+def test_layout_orders_stable_sections_first_and_trims_oldest_history() -> None:
+    layout = PromptLayout(max_input_tokens=60, estimate=lambda text: len(text.split()))
+    history = [f"line {i} " + "word " * 8 for i in range(6)]
+    sections = dict(
+        system="You are Ava.", rules=["Rule one.", "Rule two."], task="Round 3."
+    )
+    prompt = layout.build(history=history, **sections)
+
+    assert prompt.user_prompt.startswith(
+        "Rule one.\n\nRule two.\n\nRecent transcript:\n"
+    )
+    assert prompt.user_prompt.endswith("\n\nRound 3.")
+    assert prompt.history_kept == 4 and prompt.history_dropped == 2
+    assert "line 1 " not in prompt.user_prompt and "line 5 " in prompt.user_prompt
+    assert prompt.input_tokens <= 60
+    assert prompt.prefix_tokens == 7
+    assert layout.build(history=history, **sections) == prompt
+
+    empty = layout.build(system="s", task="t")
+    assert "No meaningful conversation yet." in empty.user_prompt
+
+
+def test_token_estimate_and_prefix_cache_eligibility() -> None:
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("Who was it?") == 4
+    assert estimate_tokens("x" * 400) == 100
+    assert cacheable_tokens(1000) == 0
+    assert cacheable_tokens(1300) == 1280
@@ -0,0 +1,60 @@
+from core.llm_resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    HedgePolicy,
+    LatencyWindow,
+    RetryPolicy,
+    is_transient,
+)
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+def test_circuit_breaker_opens_probes_and_recovers() -> None:
+    now = [0.0]
+    breaker = CircuitBreaker(
+        failure_threshold=2, reset_timeout=10.0, clock=lambda: now[0]
+    )
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+
+    now[0] = 10.0
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() and not breaker.allow()  # one probe at a time
+    breaker.record_failure()
+    assert breaker.state == OPEN and breaker.retry_in() == 10.0
+
+    now[0] = 20.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.stats() == {
+        "state": CLOSED,
+        "failures": 0,
+        "opened": 2,
+        "rejected": 2,
+    }
+
+
+def test_backoff_jitter_and_hedge_threshold() -> None:
+    policy = RetryPolicy(base_delay=1.0, max_delay=3.0)
+    assert all(0.0 <= policy.backoff(retry) <= 3.0 for retry in range(6))
+    assert policy.backoff(0, hint=2.0) == 2.0
+    assert is_transient(_StatusError(503)) and is_transient(_StatusError(429))
+    assert not is_transient(_StatusError(400))
+
+    window = LatencyWindow(size=100)
+    hedge = HedgePolicy(min_samples=10, initial_delay=None)
+    assert window.hedge_delay(hedge) is None
+    for ms in range(1, 101):
+        window.record(ms / 1000)
+    assert window.hedge_delay(hedge) == 0.095
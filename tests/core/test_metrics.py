@@ -0,0 +1,42 @@
+from agents.routing import RoutingCoordinator
+from core import AgentQuery, RoutingMetrics
+
+
+def test_metrics_record_hits_fallbacks_and_timings(tmp_path) -> None:
+    metrics = RoutingMetrics(debug=True)
+    coordinator = RoutingCoordinator(metrics=metrics)
+
+    result = coordinator.handle(AgentQuery(text="Help me find my keys"))
+    coordinator.handle(AgentQuery(text="Explain chess clocks"))
+    coordinator.handle_many([AgentQuery(text="Schedule a meeting")])
+
+    snapshot = metrics.snapshot()
+    assert snapshot["queries"] == 3
+    assert snapshot["agent_hits"] == {
+        "personal_inventory": 1,
+        "research": 1,
+        "administration": 1,
+    }
+    assert snapshot["fallback_rate"] == 1 / 3
+    assert snapshot["handle_seconds"]["research"]["count"] == 1
+    assert set(result.debug["metrics"]) == {
+        "match_seconds",
+        "handle_seconds",
+        "can_handle_calls",
+    }
+
+    path = tmp_path / "routing.prom"
+    metrics.write_prometheus(path)
+    text = path.read_text()
+    assert 'routing_agent_hits_total{agent="research"} 1' in text
+    assert 'routing_handle_seconds_count{agent="administration"} 1' in text
+    assert 'routing_routes_total{via="fallback"} 1' in text
+
+
+def test_prometheus_label_values_are_escaped() -> None:
+    metrics = RoutingMetrics()
+    metrics.record('odd\\"name"\nagent', None, 0, 0.0, 0.0)
+
+    text = metrics.to_prometheus()
+
+    assert 'routing_agent_hits_total{agent="odd\\\\\\"name\\"\\nagent"} 1' in text
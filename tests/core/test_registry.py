@@ -0,0 +1,119 @@
+from core import AgentQuery, AgentRegistry, AgentResult, BaseAgent, KeywordAgent
+from core.matcher import KeywordMatcher
+
+
+class _Keywords(KeywordAgent):
+    def __init__(self, name: str, keywords: set[str]) -> None:
+        super().__init__(name=name)
+        self.KEYWORDS = frozenset(keywords)
+
+    def handle(self, query: AgentQuery) -> AgentResult:
+        return AgentResult(text=self.name)
+
+
+class _Always(BaseAgent):
+    def can_handle(self, query: AgentQuery) -> bool:
+        return True
+
+    def handle(self, query: AgentQuery) -> AgentResult:
+        return AgentResult(text=self.name)
+
+
+def test_keyword_matcher_reports_overlapping_keywords() -> None:
+    matcher = KeywordMatcher(
+        [(0, {"due", "due date"}), (1, {"date night"}), (2, {"key"}), (3, {"xyz"})]
+    )
+
+    assert matcher.scan(("due", "date", "night")) == {0, 1}
+    assert matcher.scan(("monkey", "key")) == {2}
+    assert matcher.scan(("monkey", "keys")) == set()
+
+
+def test_keyword_agents_match_whole_tokens_only() -> None:
+    registry = AgentRegistry(
+        [_Keywords("inventory", {"key"}), _Keywords("admin", {"due date"})]
+    )
+
+    assert registry.find_best_agent("Feed the monkey") is None
+    assert registry.find_best_agent("Where is my key?").name == "inventory"
+    assert registry.find_best_agent("What's the DUE  date, again").name == "admin"
+    assert registry.find_best_agent("due on this date") is None
+
+
+def test_registry_match_respects_registration_order() -> None:
+    registry = AgentRegistry(
+        [
+            _Keywords("first", {"alpha"}),
+            _Always("catch_all"),
+            _Keywords("last", {"beta"}),
+        ]
+    )
+
+    assert registry.find_best_agent("ALPHA and beta").name == "first"
+    assert registry.find_best_agent("beta only").name == "catch_all"
+
+
+def test_registry_rebuilds_matcher_after_mutation() -> None:
+    registry = AgentRegistry([_Keywords("one", {"alpha"})])
+    assert registry.find_best_agent("gamma") is None
+
+    registry.register(_Keywords("two", {"gamma"}))
+    assert registry.find_best_agent("gamma").name == "two"
+
+    del registry["two"]
+    assert registry.find_best_agent("gamma") is None
+
+
+def test_lazy_agent_is_built_on_first_dispatch() -> None:
+    built: list[str] = []
+
+    def factory() -> BaseAgent:
+        built.append("lazy")
+        return _Keywords("lazy", {"unused"})
+
+    registry = AgentRegistry([_Keywords("eager", {"alpha"})])
+    lazy = registry.register_lazy("lazy", factory, {"gamma"})
+
+    assert registry.find_best_agent("gamma ray") is lazy
+    assert built == [] and not lazy.loaded
+
+    assert lazy.handle(AgentQuery(text="gamma ray")).text == "lazy"
+    lazy.handle(AgentQuery(text="gamma ray"))
+    assert built == ["lazy"]
+
+
+def test_registry_swap_publishes_a_new_snapshot_in_place() -> None:
+    registry = AgentRegistry([_Keywords("one", {"alpha"}), _Keywords("two", {"beta"})])
+    before = registry.snapshot()
+
+    old = registry.swap(_Keywords("one", {"gamma"}))
+
+    assert old is before.agents["one"]
+    assert list(registry) == ["one", "two"]
+    assert registry.find_best_agent("gamma").name == "one"
+    assert before.matcher.match(AgentQuery(text="alpha")) is old
+    assert registry.version == before.version + 1
+
+
+def test_registry_can_be_mutated_while_routing_concurrently() -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    registry = AgentRegistry([_Keywords("stable", {"alpha"})])
+
+    def route(_: int) -> str:
+        for name in registry:
+            registry.get(name)
+        return registry.find_best_agent("alpha").name
+
+    def churn() -> None:
+        for index in range(500):
+            registry.register(_Keywords(f"temp{index}", {"beta"}))
+            del registry[f"temp{index}"]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        writer = pool.submit(churn)
+        names = list(pool.map(route, range(2000)))
+        writer.result()
+
+    assert set(names) == {"stable"}
+    assert list(registry) == ["stable"]
@@ -0,0 +1,63 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from agents.routing import RoutingCoordinator  # noqa: E402
+from core import AgentQuery  # noqa: E402
+from core.semantic import SemanticRouter  # noqa: E402
+
+
+def test_semantic_stage_routes_near_miss_before_fallback() -> None:
+    coordinator = RoutingCoordinator(semantic=SemanticRouter(threshold=0.15))
+
+    result = coordinator.handle(AgentQuery(text="Book an appointmnt with the dentist"))
+
+    assert result.routed_to == "administration"
+    assert result.debug.get("semantic") is True
+    assert "fallback" not in result.debug
+
+
+def test_semantic_stage_batches_and_respects_threshold() -> None:
+    router = SemanticRouter(threshold=0.9)
+    coordinator = RoutingCoordinator(semantic=router)
+
+    results = coordinator.handle_many(
+        [AgentQuery(text="Explain chess clocks"), AgentQuery(text="Find my wallet")]
+    )
+
+    assert [result.routed_to for result in results] == [
+        "research",
+        "personal_inventory",
+    ]
+    assert results[0].debug.get("fallback") is True
+    assert len(router.route_many(["a", "b", "c"], coordinator.registry)) == 3
+
+
+def test_semantic_stage_describes_lazy_specialists_without_loading_them() -> None:
+    queries = [
+        AgentQuery(text="help me locate misplaced things"),
+        AgentQuery(text="I need some admin logistics sorted"),
+    ]
+    lazy = RoutingCoordinator(semantic=SemanticRouter(threshold=0.15))
+    eager = RoutingCoordinator(lazy=False, semantic=SemanticRouter(threshold=0.15))
+
+    lazy_results = lazy.handle_many(queries)
+
+    assert [result.routed_to for result in lazy_results] == [
+        "personal_inventory",
+        "administration",
+    ]
+    assert all(result.debug.get("semantic") is True for result in lazy_results)
+    assert [r.routed_to for r in eager.handle_many(queries)] == [
+        r.routed_to for r in lazy_results
+    ]
+    assert not lazy.registry["research"].loaded
+
+
+def test_default_threshold_routes_a_paraphrase_without_keywords() -> None:
+    coordinator = RoutingCoordinator(semantic=SemanticRouter())
+
+    result = coordinator.handle(AgentQuery(text="Where did I leave my purse?"))
+
+    assert result.routed_to == "personal_inventory"
+    assert result.debug.get("semantic") is True
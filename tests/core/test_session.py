@@ -0,0 +1,68 @@
+from core import AgentQuery, AgentResult, KeywordAgent, RoutingAgent, SessionAffinity
+
+
+class _Keywords(KeywordAgent):
+    def __init__(self, name: str, keywords: set[str]) -> None:
+        super().__init__(name=name)
+        self.KEYWORDS = frozenset(keywords)
+
+    def handle(self, query: AgentQuery) -> AgentResult:
+        return AgentResult(text=self.name)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _router(sessions: SessionAffinity) -> RoutingAgent:
+    return RoutingAgent(
+        "router",
+        [
+            _Keywords("calendar", {"meeting"}),
+            _Keywords("notes", {"note"}),
+            _Keywords("general", set()),
+        ],
+        fallback="general",
+        sessions=sessions,
+    )
+
+
+def _ask(router: RoutingAgent, text: str, **metadata: object) -> AgentResult:
+    return router.handle(
+        AgentQuery(text=text, metadata={"session_id": "s1", **metadata})
+    )
+
+
+def test_follow_ups_stick_to_the_session_agent_until_a_keyword_switches() -> None:
+    router = _router(SessionAffinity())
+
+    assert _ask(router, "book a meeting").routed_to == "calendar"
+    follow_up = _ask(router, "make it 3pm instead")
+    assert follow_up.routed_to == "calendar"
+    assert follow_up.debug["session"] is True
+
+    assert _ask(router, "take a note").routed_to == "notes"
+    assert _ask(router, "and another thing").routed_to == "notes"
+    assert _ask(router, "anything", reroute=True).routed_to == "general"
+    assert router.handle(AgentQuery(text="make it 3pm")).routed_to == "general"
+    assert router.sessions.stats()["switches"] == 1
+
+
+def test_sessions_expire_after_ttl_and_respect_maxsize() -> None:
+    clock = _Clock()
+    sessions = SessionAffinity(ttl=10.0, maxsize=1, clock=clock)
+    router = _router(sessions)
+
+    _ask(router, "book a meeting")
+    clock.now = 9.0
+    assert _ask(router, "later").routed_to == "calendar"
+    clock.now = 25.0
+    assert _ask(router, "much later").routed_to == "general"
+
+    router.handle(AgentQuery(text="take a note", metadata={"session_id": "s2"}))
+    assert len(sessions) == 1
+    assert sessions.get("s1") is None
@@ -0,0 +1,105 @@
+import asyncio
+import time
+
+from core import AgentQuery, AgentResult, KeywordAgent, RoutingAgent, SpeculationPolicy
+
+
+class _Timed(KeywordAgent):
+    KEYWORDS = frozenset({"study"})
+
+    def __init__(self, name: str, delay: float, text: str) -> None:
+        super().__init__(name=name)
+        self.delay = delay
+        self.text = text
+
+    def handle(self, query: AgentQuery) -> AgentResult:
+        time.sleep(self.delay)
+        return AgentResult(text=self.text)
+
+    async def ahandle(self, query: AgentQuery) -> AgentResult:
+        await asyncio.sleep(self.delay)
+        return AgentResult(text=self.text)
+
+
+def _router(slow_text: str = "slow", fast_text: str = "fast") -> RoutingAgent:
+    return RoutingAgent(
+        name="router",
+        agents=[_Timed("slow", 0.3, slow_text), _Timed("fast", 0.01, fast_text)],
+        speculation=SpeculationPolicy(candidates=2, deadline=1.0),
+    )
+
+
+def test_speculation_returns_fastest_acceptable_candidate() -> None:
+    result = _router().handle(AgentQuery(text="plan a study session"))
+
+    assert result.routed_to == "fast"
+    report = result.debug["speculative"]
+    assert report["candidates"] == ["slow", "fast"]
+    assert report["cancelled"] == ["slow"]
+
+
+def test_speculation_waits_for_primary_when_others_are_rejected() -> None:
+    result = _router(fast_text=" ").handle(AgentQuery(text="plan a study session"))
+
+    assert result.routed_to == "slow"
+    assert result.debug["speculative"]["rejected"] == ["fast"]
+
+
+def test_async_speculation_cancels_losers() -> None:
+    result = asyncio.run(_router().ahandle(AgentQuery(text="plan a study session")))
+
+    assert result.routed_to == "fast"
+    assert result.debug["speculative"]["cancelled"] == ["slow"]
+
+
+def test_concurrent_first_calls_share_one_pool_until_close() -> None:
+    import threading
+
+    router = _router()
+    created = []
+    original = router._pool
+
+    def counting_pool(attribute: str, purpose: str):
+        pool = original(attribute, purpose)
+        created.append(pool)
+        return pool
+
+    router._pool = counting_pool  # type: ignore[method-assign]
+    barrier = threading.Barrier(4)
+
+    def route() -> None:
+        barrier.wait()
+        router.handle(AgentQuery(text="plan a study session"))
+
+    threads = [threading.Thread(target=route) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 4 and len(set(map(id, created))) == 1
+    router.close()
+    assert router._speculative_pool is None
+    assert router.handle(AgentQuery(text="plan a study session")).routed_to == "fast"
+    router.close()
+
+
+def test_flattened_router_races_its_dispatch_table_leaves() -> None:
+    from core import RoutingCache
+
+    router = RoutingAgent(
+        name="root",
+        agents=[
+            RoutingAgent("library", [_Timed("slow", 0.3, "slow")]),
+            _Timed("fast", 0.01, "fast"),
+        ],
+        flatten=True,
+        cache=RoutingCache(),
+        speculation=SpeculationPolicy(candidates=2, deadline=1.0),
+    )
+
+    for _ in range(2):  # the second query is served from the routing cache
+        result = router.handle(AgentQuery(text="plan a study session"))
+        assert result.routed_to == "fast"
+        assert result.debug["speculative"]["candidates"] == ["library/slow", "fast"]
+    router.close()
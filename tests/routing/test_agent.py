@@ -1,5 +1,7 @@
+import asyncio
+
 from agents.routing import RoutingCoordinator
-from core import AgentQuery
+from core import AgentQuery, IntentSplitter, RoutingCache
 
 
 def test_router_sends_key_query_to_personal_inventory() -> None:
@@ -17,3 +19,131 @@ def test_router_falls_back_to_research() -> None:
 
     assert result.routed_to == "research"
     assert result.debug.get("fallback") is True
+
+
+def test_specialist_keywords_cover_inflected_forms() -> None:
+    coordinator = RoutingCoordinator()
+    expected = {
+        "I lost both phones": "personal_inventory",
+        "Where are the wallets": "personal_inventory",
+        "My keychain is gone": "personal_inventory",
+        "Check my schedules": "administration",
+        "Keep reminding me about rent": "administration",
+        "Researching solar panels": "research",
+        "I compared two laptops": "research",
+    }
+
+    results = coordinator.handle_many([AgentQuery(text=text) for text in expected])
+
+    assert [result.routed_to for result in results] == list(expected.values())
+    assert not any(result.debug.get("fallback") for result in results)
+    assert coordinator.handle(AgentQuery(text="Feed the monkey")).debug.get("fallback")
+
+
+def test_handle_many_matches_handle_in_order() -> None:
+    coordinator = RoutingCoordinator()
+    queries = [
+        AgentQuery(text="Help me find my keys"),
+        AgentQuery(text="Explain the history of chess clocks"),
+        AgentQuery(text="Schedule a meeting"),
+        AgentQuery(text="Help me find my keys"),
+    ]
+
+    batch = coordinator.handle_many(queries)
+    single = [coordinator.handle(query) for query in queries]
+
+    assert [result.routed_to for result in batch] == [
+        "personal_inventory",
+        "research",
+        "administration",
+        "personal_inventory",
+    ]
+    assert batch == single
+    assert batch[1].debug.get("fallback") is True
+
+
+def test_ahandle_routes_concurrently() -> None:
+    coordinator = RoutingCoordinator()
+
+    async def route_all() -> list:
+        texts = ["Help me find my keys", "Set a deadline reminder", "What is a quasar"]
+        return await asyncio.gather(
+            *(coordinator.ahandle(AgentQuery(text=text)) for text in texts)
+        )
+
+    results = asyncio.run(route_all())
+
+    assert [result.routed_to for result in results] == [
+        "personal_inventory",
+        "administration",
+        "research",
+    ]
+    assert results[2].debug.get("fallback") is True
+
+
+def test_routing_cache_hits_and_invalidates_on_registry_change() -> None:
+    cache = RoutingCache(maxsize=8)
+    coordinator = RoutingCoordinator(cache=cache)
+
+    coordinator.handle(AgentQuery(text="Help me find my keys"))
+    coordinator.handle(AgentQuery(text="help me find my KEYS"))
+    fallback = coordinator.handle(AgentQuery(text="Explain chess clocks"))
+    fallback_again = coordinator.handle(AgentQuery(text="Explain chess clocks"))
+
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert fallback_again.routed_to == "research"
+    assert (
+        fallback_again.debug.get("fallback") is fallback.debug.get("fallback") is True
+    )
+
+    del coordinator.registry["personal_inventory"]
+    result = coordinator.handle(AgentQuery(text="Help me find my keys"))
+
+    assert result.routed_to == "research"
+    assert cache.misses == 3
+
+
+def test_multi_intent_query_is_split_and_merged() -> None:
+    coordinator = RoutingCoordinator(splitter=IntentSplitter())
+    query = AgentQuery(
+        text="Summarize my emails and create a brief overview in my calendar at 8 am tomorrow"
+    )
+
+    result = coordinator.handle(query)
+    async_result = asyncio.run(coordinator.ahandle(query))
+
+    parts = [(part["text"], part["routed_to"]) for part in result.debug["parts"]]
+    assert parts == [
+        ("Summarize my emails", "research"),
+        ("create a brief overview in my calendar at 8 am tomorrow", "administration"),
+    ]
+    assert result.text == async_result.text
+    assert "administrative task" in result.text
+    assert (
+        "parts"
+        not in coordinator.handle(AgentQuery(text="Compare apples and oranges")).debug
+    )
+
+    pool = coordinator._fan_out_pool
+    assert pool is not None
+    coordinator.close()
+    assert coordinator._fan_out_pool is None and pool._shutdown
+    assert coordinator.handle(query).debug["parts"] == result.debug["parts"]
+    coordinator.close()
+
+
+def test_merged_clauses_keep_the_words_that_joined_them() -> None:
+    def match(query: AgentQuery):
+        if "keys" in query.text or "wallet" in query.text:
+            return "inventory"
+        return "calendar" if "meeting" in query.text else None
+
+    parts = IntentSplitter().split(
+        AgentQuery(text="Find my keys and also my wallet. Then book a meeting"),
+        match,  # type: ignore[arg-type]
+    )
+
+    assert [part.text for part in parts] == [
+        "Find my keys and also my wallet",
+        "book a meeting",
+    ]
@@ -0,0 +1,70 @@
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from scripts.route_batch import route_stream
+
+_LINES = [
+    '{"id": 1, "text": "Help me find my keys"}',
+    "not json",
+    "",
+    '{"id": 3, "text": "Schedule a meeting"}',
+    '["not", "an", "object"]',
+    '{"id": 5, "metadata": {}}',
+    '{"id": 6, "text": "Explain chess clocks"}',
+]
+
+
+def _route(**options: int) -> list[dict]:
+    sink = io.StringIO()
+    count = route_stream(
+        io.StringIO("\n".join(_LINES) + "\n"), sink, chunk_size=2, **options
+    )
+    records = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert count == len(records)
+    return records
+
+
+def test_route_stream_keeps_input_order_and_reports_malformed_lines() -> None:
+    records = _route()
+
+    assert [record["line"] for record in records] == [0, 1, 3, 4, 5, 6]
+    assert [record.get("routed_to") for record in records] == [
+        "personal_inventory",
+        None,
+        "administration",
+        None,
+        None,
+        "research",
+    ]
+    assert [record.get("id") for record in records] == [1, None, 3, None, 5, 6]
+    assert all("error" in records[index] for index in (1, 3, 4))
+    assert _route(workers=2) == records
+    assert [record["line"] for record in _route(skip=4)] == [4, 5, 6]
+
+
+def test_resumed_run_appends_to_the_existing_output(tmp_path: Path) -> None:
+    source = tmp_path / "queries.jsonl"
+    source.write_text("\n".join(_LINES) + "\n", encoding="utf-8")
+    output = tmp_path / "results.jsonl"
+
+    def run(*args: str) -> None:
+        command = [
+            sys.executable,
+            "-m",
+            "scripts.route_batch",
+            str(source),
+            "--output",
+            str(output),
+        ]
+        subprocess.run([*command, *args], check=True, capture_output=True)
+
+    run()
+    complete = output.read_text(encoding="utf-8").splitlines()
+    # Simulate a run interrupted after the record for input line 3.
+    output.write_text("\n".join(complete[:3]) + "\n", encoding="utf-8")
+    run("--skip", "4")
+
+    assert output.read_text(encoding="utf-8").splitlines() == complete
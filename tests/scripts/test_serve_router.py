@@ -0,0 +1,54 @@
+import pytest
+
+from scripts.serve_router import RouterService, ServiceOverloadedError
+
+# Large enough that the worker is still busy when the next request arrives.
+_SLOW = {"id": "slow", "text": "keys " * 200_000}
+
+
+def test_pooled_service_routes_and_pushes_back_when_full() -> None:
+    service = RouterService(workers=1, max_pending=1)
+    responses: list[dict] = []
+    try:
+        response = service.route({"id": "keys", "text": "Help me find my keys"})
+        assert response["id"] == "keys"
+        assert response["routed_to"] == "personal_inventory"
+        # Falsy ids are the caller's own, not missing ones.
+        assert service.route({"id": 0, "text": "keys"})["id"] == "0"
+        assert service.route({"id": "", "text": "keys"})["id"] == ""
+        assert service.route({"text": "keys"})["id"] == "1"
+
+        service.submit(_SLOW, responses.append)
+        with pytest.raises(ServiceOverloadedError):
+            service.submit(
+                {"id": "next", "text": "Schedule a meeting"},
+                responses.append,
+                timeout=0,
+            )
+    finally:
+        service.close()
+
+    assert [response["id"] for response in responses] == ["slow"]
+
+
+def test_stdio_answers_lines_it_cannot_take_with_an_error() -> None:
+    import io
+    import json
+
+    from scripts.serve_router import serve_stdio
+
+    service = RouterService(workers=1, max_pending=1)
+    stdout = io.StringIO()
+    lines = [json.dumps(_SLOW), '{"id": "a", "text": "Schedule a meeting"}', "not json"]
+    try:
+        serve_stdio(service, io.StringIO("\n".join(lines) + "\n"), stdout, timeout=0)
+    finally:
+        service.close()
+
+    responses = {
+        response["id"]: response
+        for response in map(json.loads, stdout.getvalue().splitlines())
+    }
+    assert responses["a"] == {"id": "a", "error": "too many requests in flight"}
+    assert "invalid request" in responses[None]["error"]
+    assert responses["slow"]["routed_to"] == "personal_inventory"